@@ -1,604 +1,470 @@
+import hmac
+import os
 import re
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import altair as alt
 import streamlit as st
-import unicodedata
+
+from grader import (FORMS, TENSE_NAMES, TENSES, TaggedSentence, classify_tense, content, grade_items, group_key,
+                    metrics, tag_text, text)
+from grader.analytics import AttemptLog
+from grader.assets import load_assets
+from grader.essay import MAX_CHARS as ESSAY_MAX_CHARS
+from grader.practice import Card, Schedule, Schedules, card_bank
+from grader.progress import ProgressStore
+
 st.set_page_config(page_title="Luyện 12 thì Tiếng Anh", page_icon="📘", layout="centered")
 
-def usage_ok(user_input: str, correct_usages: list[str]) -> bool:
-    """
-    Kiểm tra cách dùng dựa trên từ khóa thay vì so khớp toàn bộ câu.
-    - user_input: người dùng nhập
-    - correct_usages: danh sách đáp án mẫu (chuẩn)
-    """
-    text = norm(user_input)
 
-    for usage in correct_usages:
-        usage_norm = norm(usage)
+@st.cache_resource
+def get_store():
+    """Kho tiến độ SQLite dùng chung: mọi phiên đẩy vào một hàng đợi, một luồng nền ghi theo lô."""
+    return ProgressStore()
 
-        # lấy từ khóa quan trọng trong đáp án mẫu
-        keywords = [w for w in usage_norm.split() if len(w) > 2]
 
-        # chỉ cần user_input chứa >= 1 từ khóa quan trọng
-        if any(k in text for k in keywords):
-            return True
+@st.cache_resource
+def get_log():
+    """Nhật ký lần chấm dạng cột cho thống kê lớp (mọi lần chấm, kể cả chưa nhập tên)."""
+    return AttemptLog()
 
-    return False
 
-def norm(s: str) -> str:
-    """Chuẩn hoá thân thiện cho công thức: giữ / và -, coi + là khoảng trắng."""
-    if s is None:
-        return ""
-    s = unicodedata.normalize("NFC", s).lower().strip()
-    s = s.replace("+", " ")              # "+" -> khoảng trắng
-    s = re.sub(r"[()]", " ", s)          # bỏ ngoặc
-    s = re.sub(r"\s*/\s*", " / ", s)     # chèn khoảng trắng quanh "/": am / is / are
-    s = re.sub(r"[^\w\s/\-]", " ", s)    # chỉ giữ chữ, số, khoảng trắng, "/", "-"
-    s = re.sub(r"\s+", " ", s).strip()   # gọn khoảng trắng
-    return s
-
-def has_word(text: str, word: str) -> bool:
-    return re.search(rf"\b{re.escape(word)}\b", text) is not None
-
-def formula_ok(user_input: str, correct: str) -> bool:
-    """
-    So khớp công thức linh hoạt theo từ khoá:
-    - Nhận am/is/are, do/does, was/were, have/has (chỉ cần 1 cái xuất hiện)
-    - Nhận V(s/es), V-ing, V2/V-ed, V3
-    - Không phân biệt hoa/thường, dấu, khoảng trắng
-    """
-    u = norm(user_input)
-    c = norm(correct)
-    c_raw = correct.lower()
-
-    # 1) Nhóm lựa chọn (chỉ cần có 1)
-    choice_groups = []
-    if "do/does" in c_raw:
-        choice_groups.append(["do", "does"])
-    if "am/is/are" in c_raw:
-        choice_groups.append(["am", "is", "are"])
-    if "was/were" in c_raw:
-        choice_groups.append(["was", "were"])
-    if "have/has" in c_raw:
-        choice_groups.append(["have", "has"])
-
-    for group in choice_groups:
-        if not any(has_word(u, w) for w in group):
-            return False
-
-    # 2) Từ bắt buộc
-    if " not " in f" {c_raw} " and not has_word(u, "not"):
-        return False
-    if re.search(r"\bs\b", c) and not has_word(u, "s"):
-        return False
+@st.cache_resource
+def get_schedules():
+    """Lịch ôn của mọi học sinh có tên (dựng lại từ kho tiến độ khi gặp lần đầu)."""
+    return Schedules(get_store())
 
-    # 3) Dạng động từ
-    if "v(s/es)" in c_raw:
-        if not (has_word(u, "v") or re.search(r"\bv(s|es)\b", u)):
-            return False
-    if "v-ing" in c_raw:
-        if not (has_word(u, "ving") or re.search(r"\bv-?ing\b", u)):
-            return False
-    if "v2/v-ed" in c_raw:
-        if not (has_word(u, "v2") or has_word(u, "ved") or has_word(u, "v-ed")):
-            return False
-    if "v3" in c_raw and not has_word(u, "v3"):
-        return False
-    # Trường hợp là "… + V" trần
-    if " v " in f" {c} " and not any(tag in u for tag in [" v", "v ", "v-", "v2", "ved", "v3"]):
-        return False
 
-    return True
+def admin_password() -> str:
+    """Mật khẩu giáo viên đặt phía server: GRADER_ADMIN_PASSWORD hoặc `admin_password` trong
+    .streamlit/secrets.toml. Không đặt thì không ai vào được phần giáo viên."""
+    try:
+        secret = st.secrets.get("admin_password", "")
+    except FileNotFoundError:       # chưa có secrets.toml
+        secret = ""
+    return os.environ.get("GRADER_ADMIN_PASSWORD") or str(secret)
 
-def any_match(text: str, patterns):
-    t = norm(text)
-    for p in patterns:
-        if re.search(p, t):
-            return True
+
+def is_admin() -> bool:
+    """Giáo viên đã nhập đúng mật khẩu chưa (ô mật khẩu chỉ hiện khi mở với ?admin=1)."""
+    secret = admin_password()
+    if not secret or st.query_params.get("admin") != "1":
+        return False
+    entered = st.sidebar.text_input("🔑 Mật khẩu giáo viên", type="password", key="admin-password")
+    if not entered:
+        return False
+    if hmac.compare_digest(entered.encode(), secret.encode()):
+        return True
+    st.sidebar.error("Sai mật khẩu.")
     return False
 
 
-IRREG = [
-    ("go", "went", "gone"), ("eat", "ate", "eaten"), ("see", "saw", "seen"),
-    ("write", "wrote", "written"), ("begin", "began", "begun"), ("come", "came", "come"),
-    ("drink", "drank", "drunk"), ("sing", "sang", "sung"), ("swim", "swam", "swum"),
-    ("run", "ran", "run"), ("speak", "spoke", "spoken"), ("take", "took", "taken"),
-    ("give", "gave", "given"), ("drive", "drove", "driven"), ("break", "broke", "broken"),
-    ("choose", "chose", "chosen"), ("forget", "forgot", "forgotten"), ("freeze", "froze", "frozen"),
-    ("ride", "rode", "ridden"), ("fall", "fell", "fallen"), ("grow", "grew", "grown"),
-    ("know", "knew", "known"), ("fly", "flew", "flown"), ("blow", "blew", "blown"),
-    ("draw", "drew", "drawn"), ("show", "showed", "shown"), ("throw", "threw", "thrown"),
-    ("wear", "wore", "worn"), ("tear", "tore", "torn"), ("ring", "rang", "rung"),
-    ("get", "got", "gotten"), ("have", "had", "had"), ("be", "was/were", "been"),
-    ("make", "made", "made"), ("say", "said", "said"), ("sell", "sold", "sold"),
-    ("send", "sent", "sent"), ("set", "set", "set"), ("think", "thought", "thought"),
-]
-V2_SET = set(v2 for _, v2, _ in IRREG)
-V3_SET = set(v3 for _, _, v3 in IRREG)
-
-
-def validate_example(tense_key: str, group: str, form: str, sent: str):
-    """
-    tense_key: mã thì nội bộ (present_simple, past_continuous, ...)
-    group: 'verb' | 'tobe'
-    form: 'Khẳng định' | 'Phủ định' | 'Nghi vấn'
-    sent: câu ví dụ người dùng nhập
-    """
-    s = norm(sent)
-
-    # Các regex tiện lợi
-    BE_NOW = r"\b(am|is|are)\b"
-    BE_PAST = r"\b(was|were)\b"
-    DO_NOW = r"\b(do|does)\b"
-    DID = r"\b(did)\b"
-    HAVE_NOW = r"\b(have|has)\b"
-    HAD = r"\b(had)\b"
-    WILL = r"\b(will|shall)\b"
-    BEEN = r"\bbeen\b"
-    V_ING = r"\b\w+ing\b"
-    V_ED = r"\b\w+ed\b"
-    V3_END = r"\b\w+(ed|en|wn)\b"  # gần đúng
-    NEG = r"\b(not|n't)\b"
-
-    # một vài bộ nhận diện nhanh
-    def has_any_v2_or_ed():
-        return bool(re.search(V_ED, s) or any(w in s.split() for w in V2_SET))
-
-    def has_any_v3():
-        return bool(re.search(V3_END, s) or any(w in s.split() for w in V3_SET) or "been" in s)
-
-    # Mỗi thì: đặt các quy tắc "điển hình" (affirm/neg/question)
-    ok = False
-    hint = ""  
-
-    # ---- HIỆN TẠI ĐƠN
-    if tense_key == "present_simple":
-        if group == "verb":
-            if form == "Khẳng định":
-                # Không có will/ have/ has/ had/ was/were/ am/is/are/ did, không V-ing; cho phép động từ V/Vs
-                ok = (not any_match(s, [WILL, HAVE_NOW, HAD, BE_PAST, BE_NOW, DID]) and not re.search(V_ING, s))
-                hint = "Tránh dùng trợ động từ; dùng V/ V(s/es)."
-            elif form == "Phủ định":
-                ok = any_match(s, [r"\bdo not\b", r"\bdoes not\b", r"\bdon't\b", r"\bdoesn't\b"])
-                hint = "Dùng do/does not + V."
-            else:  # Nghi vấn
-                ok = re.match(r"^(do|does)\b", s or "") is not None
-                hint = "Bắt đầu bằng Do/Does + S + V?"
-        else:  # tobe
-            if form == "Khẳng định":
-                ok = any_match(s, [BE_NOW])
-                hint = "Dùng am/is/are."
-            elif form == "Phủ định":
-                ok = any_match(s, [r"\bam not\b", r"\bis not\b", r"\bare not\b", r"\bisn't\b", r"\baren't\b"])
-                hint = "Dùng am/is/are + not."
-            else:
-                ok = re.match(r"^(am|is|are)\b", s or "") is not None
-                hint = "Bắt đầu bằng Am/Is/Are + S?"
-
-    # ---- HIỆN TẠI TIẾP DIỄN
-    elif tense_key == "present_continuous":
-        if form == "Khẳng định":
-            ok = any_match(s, [BE_NOW]) and re.search(V_ING, s)
-            hint = "am/is/are + V-ing."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bam not\b.*"+V_ING, r"\bis not\b.*"+V_ING, r"\bare not\b.*"+V_ING,
-                               r"\bisn't\b.*"+V_ING, r"\baren't\b.*"+V_ING])
-            hint = "am/is/are + not + V-ing."
+# Bảng luật, đáp án chuẩn hoá, chỉ mục cách dùng/dấu hiệu, từ điển động từ: dùng chung cho mọi phiên/rerun,
+# dựng lại khi file nội dung (grader/data/tenses.json) đổi
+assets = load_assets()
+
+# --------- HỌC SINH: tên nằm trên URL (?student=...) nên tải lại trang vẫn giữ được tiến độ
+student = st.sidebar.text_input("👤 Tên học sinh (để lưu tiến độ):", key="student",
+                                value=st.query_params.get("student", "")).strip()
+store = get_store() if student else None
+if student:
+    st.query_params["student"] = student
+    if st.session_state.get("restored-for") != student:
+        # điền lại các ô đã làm lần trước (chỉ những ô chưa có trong phiên này)
+        for item, answer in store.last_answers(student).items():
+            st.session_state.setdefault(item, answer)
+        st.session_state["restored-for"] = student
+
+
+def record(section: str, item: str, answer: str, ok: bool, form: str = "", tense: str | None = None,
+           hint: str = "") -> None:
+    get_log().record(student, tense or tense_key, section, form, ok, hint)
+    if store:
+        get_schedules().review(student, item, ok)
+        store.record(student, tense or tense_key, section, item, answer, ok, form)
+    elif "practice-schedule" in st.session_state:
+        st.session_state["practice-schedule"].review_key(item, ok)
+
+
+# Lịch ôn: của học sinh có tên thì dùng chung mọi phiên (chỉ qua get_schedules(), có khoá),
+# không tên thì chỉ trong phiên này
+def practice_schedule() -> Schedule:
+    bank, schedule = card_bank(), st.session_state.get("practice-schedule")
+    if schedule is None or schedule.bank is not bank:
+        schedule = Schedule(bank) if schedule is None else schedule.for_bank(bank)
+        st.session_state["practice-schedule"] = schedule
+    return schedule
+
+
+def next_practice_card() -> Card | None:
+    if store:
+        return get_schedules().next_card(student)
+    schedule = practice_schedule()
+    card = schedule.next()
+    return None if card is None else schedule.bank.cards[card]
+
+
+def practice_summary(k: int = 3) -> tuple[tuple[int, int, int], list[tuple[Card, int]]]:
+    """(thẻ mới, đến hạn, chưa tới hạn) và k thẻ hay sai nhất kèm số lần sai."""
+    if store:
+        return get_schedules().stats(student), get_schedules().weakest(student, k)
+    schedule = practice_schedule()
+    return schedule.stats(), [(schedule.bank.cards[c], schedule.lapses[c]) for c in schedule.weakest(k)]
+
+
+# --------- CHẤM: mỗi phần là một danh sách dòng; chấm từng dòng (mỗi nút một lần rerun)
+# hoặc cả phần trong một st.form (gõ không rerun, một lần bấm chấm hết bằng grade_items).
+# Mỗi phần là một st.fragment: gõ/bấm trong phần nào chỉ chạy lại phần đó, không chạy lại
+# cả trang (bảng tóm tắt, các phần khác); số đúng/tổng ở thanh bên cập nhật ở lần chạy lại
+# cả trang kế tiếp.
+ANSWER_FIELD = {"formula": "formula", "usage": "text", "signal": "text", "example": "sentence"}
+
+
+class Row(NamedTuple):
+    key: str            # khoá ô nhập, cũng là `item` khi lưu tiến độ
+    label: str
+    button: str         # nhãn nút ở chế độ chấm từng dòng
+    item: dict          # yêu cầu cho grade_items (chưa có câu trả lời)
+    form: str = ""
+    heading: str = ""   # tiêu đề nhóm in trước dòng
+    placeholder: str | None = None
+
+
+def show_verdict(row: Row, verdict: dict, owner: str | None = None) -> None:
+    check, owner = row.item["check"], owner or tense_key
+    if check == "formula":
+        if verdict["ok"]:
+            st.success("✅ Chính xác!")
+        elif verdict.get("problem"):
+            st.error(f"❌ Sai rồi: {verdict['problem']}. Gợi ý: {verdict['hint']}")
         else:
-            ok = re.match(r"^(am|is|are)\b.*\b\w+ing\b", s or "") is not None
-            hint = "Bắt đầu bằng Am/Is/Are + S + V-ing?"
-
-    # ---- HIỆN TẠI HOÀN THÀNH
-    elif tense_key == "present_perfect":
-        if form == "Khẳng định":
-            ok = any_match(s, [HAVE_NOW]) and has_any_v3()
-            hint = "have/has + V3."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bhave not\b.*"+V3_END, r"\bhas not\b.*"+V3_END, r"\bhaven't\b.*", r"\bhasn't\b.*"]) and has_any_v3()
-            hint = "have/has + not + V3."
+            st.error(f"❌ Sai rồi! Gợi ý: {verdict['hint']}")
+    elif check == "usage":
+        use, score = row.item["usage"], verdict["score"]
+        if verdict["ok"]:
+            st.success(f"✅ Chính xác! (độ khớp {score:.0%})")
+        elif verdict.get("best_tense", owner) != owner:
+            st.error(f"❌ Sai rồi! Đây giống cách dùng của {TENSE_NAMES[verdict['best_tense']]}. Gợi ý: {use}")
         else:
-            ok = re.match(r"^(have|has)\b.*\b\w+(ed|en|wn)\b", s or "") is not None or \
-                 re.match(r"^(have|has)\b.*\b(" + "|".join(map(re.escape, V3_SET)) + r")\b", s or "") is not None
-            hint = "Bắt đầu bằng Have/Has + S + V3?"
-
-    # ---- HIỆN TẠI HOÀN THÀNH TIẾP DIỄN
-    elif tense_key == "present_perfect_continuous":
-        if form == "Khẳng định":
-            ok = any_match(s, [HAVE_NOW]) and "been" in s and re.search(V_ING, s)
-            hint = "have/has been + V-ing."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bhave not been\b.*"+V_ING, r"\bhas not been\b.*"+V_ING,
-                               r"\bhaven't been\b.*"+V_ING, r"\bhasn't been\b.*"+V_ING])
-            hint = "have/has + not + been + V-ing."
+            st.error(f"❌ Sai rồi! Gợi ý: {use} (độ khớp {score:.0%})")
+    elif check == "signal":
+        sig = row.item["signal"]
+        if verdict["ok"] and verdict["distance"] == 0:
+            st.success("✅ Chính xác!")
+        elif verdict["ok"]:
+            st.success(f"✅ Chính xác! (chú ý chính tả: {sig})")
         else:
-            ok = re.match(r"^(have|has)\b.*\bbeen\b.*\b\w+ing\b", s or "") is not None
-            hint = "Bắt đầu bằng Have/Has + S + been + V-ing?"
-
-    # ---- QUÁ KHỨ ĐƠN
-    elif tense_key == "past_simple":
-        if group == "verb":
-            if form == "Khẳng định":
-                ok = has_any_v2_or_ed()
-                hint = "Dùng V2/ Ved."
-            elif form == "Phủ định":
-                ok = any_match(s, [r"\bdid not\b", r"\bdidn't\b"]) and not has_any_v2_or_ed()
-                hint = "did not + V (nguyên mẫu)."
-            else:
-                ok = re.match(r"^did\b", s or "") is not None
-                hint = "Bắt đầu bằng Did + S + V?"
-        else:  # to be
-            if form == "Khẳng định":
-                ok = any_match(s, [BE_PAST])
-                hint = "Dùng was/were."
-            elif form == "Phủ định":
-                ok = any_match(s, [r"\bwas not\b", r"\bwere not\b", r"\bwasn't\b", r"\bweren't\b"])
-                hint = "was/were + not."
+            owners = [k for k in verdict["tenses"] if k != owner]
+            if owners:
+                names = ", ".join(TENSE_NAMES[k] for k in owners)
+                st.error(f"❌ Sai rồi! Đây là dấu hiệu của {names}. Đúng là: {sig}")
             else:
-                ok = re.match(r"^(was|were)\b", s or "") is not None
-                hint = "Bắt đầu bằng Was/Were + S?"
-
-    # ---- QUÁ KHỨ TIẾP DIỄN
-    elif tense_key == "past_continuous":
-        if form == "Khẳng định":
-            ok = any_match(s, [BE_PAST]) and re.search(V_ING, s)
-            hint = "was/were + V-ing."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bwas not\b.*"+V_ING, r"\bwere not\b.*"+V_ING, r"\bwasn't\b.*"+V_ING, r"\bweren't\b.*"+V_ING])
-            hint = "was/were + not + V-ing."
-        else:
-            ok = re.match(r"^(was|were)\b.*\b\w+ing\b", s or "") is not None
-            hint = "Bắt đầu bằng Was/Were + S + V-ing?"
-
-    # ---- QUÁ KHỨ HOÀN THÀNH
-    elif tense_key == "past_perfect":
-        if form == "Khẳng định":
-            ok = any_match(s, [HAD]) and has_any_v3()
-            hint = "had + V3."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bhad not\b.*"+V3_END, r"\bhadn't\b.*"]) and has_any_v3()
-            hint = "had not + V3."
-        else:
-            ok = re.match(r"^had\b.*\b\w+(ed|en|wn)\b", s or "") is not None or re.match(r"^had\b.*\b(" + "|".join(map(re.escape, V3_SET)) + r")\b", s or "") is not None
-            hint = "Bắt đầu bằng Had + S + V3?"
-
-    # ---- QUÁ KHỨ HOÀN THÀNH TIẾP DIỄN
-    elif tense_key == "past_perfect_continuous":
-        if form == "Khẳng định":
-            ok = any_match(s, [HAD]) and "been" in s and re.search(V_ING, s)
-            hint = "had been + V-ing."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bhad not been\b.*"+V_ING, r"\bhadn't been\b.*"+V_ING])
-            hint = "had not been + V-ing."
-        else:
-            ok = re.match(r"^had\b.*\bbeen\b.*\b\w+ing\b", s or "") is not None
-            hint = "Bắt đầu bằng Had + S + been + V-ing?"
-
-    # ---- TƯƠNG LAI ĐƠN
-    elif tense_key == "future_simple":
-        if form == "Khẳng định":
-            ok = any_match(s, [WILL]) and "will have" not in s and "will be" not in s
-            hint = "will + V (nguyên mẫu)."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bwill not\b", r"\bwon't\b"])
-            hint = "will not + V."
-        else:
-            ok = re.match(r"^(will|shall)\b", s or "") is not None
-            hint = "Bắt đầu bằng Will/Shall + S + V?"
-
-    # ---- TƯƠNG LAI TIẾP DIỄN
-    elif tense_key == "future_continuous":
-        if form == "Khẳng định":
-            ok = "will be" in s and re.search(V_ING, s)
-            hint = "will be + V-ing."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bwill not be\b.*"+V_ING, r"\bwon't be\b.*"+V_ING])
-            hint = "will not be + V-ing."
-        else:
-            ok = re.match(r"^(will|shall)\b.*\bbe\b.*\b\w+ing\b", s or "") is not None
-            hint = "Bắt đầu bằng Will + S + be + V-ing?"
-
-    # ---- TƯƠNG LAI HOÀN THÀNH
-    elif tense_key == "future_perfect":
-        if form == "Khẳng định":
-            ok = "will have" in s and has_any_v3()
-            hint = "will have + V3."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bwill not have\b.*"+V3_END, r"\bwon't have\b.*"+V3_END]) or ("will not have" in s and has_any_v3())
-            hint = "will not have + V3."
-        else:
-            ok = re.match(r"^(will|shall)\b.*\bhave\b.*\b\w+(ed|en|wn)\b", s or "") is not None or \
-                 re.match(r"^(will|shall)\b.*\bhave\b.*\b(" + "|".join(map(re.escape, V3_SET)) + r")\b", s or "") is not None
-            hint = "Bắt đầu bằng Will + S + have + V3?"
-
-    # ---- TƯƠNG LAI HOÀN THÀNH TIẾP DIỄN
-    elif tense_key == "future_perfect_continuous":
-        if form == "Khẳng định":
-            ok = "will have been" in s and re.search(V_ING, s)
-            hint = "will have been + V-ing."
-        elif form == "Phủ định":
-            ok = any_match(s, [r"\bwill not have been\b.*"+V_ING, r"\bwon't have been\b.*"+V_ING])
-            hint = "will not have been + V-ing."
-        else:
-            ok = re.match(r"^(will|shall)\b.*\bhave been\b.*\b\w+ing\b", s or "") is not None
-            hint = "Bắt đầu bằng Will + S + have been + V-ing?"
-
-    return ok, hint
+                st.error(f"❌ Sai rồi! Đúng là: {sig}")
+    elif verdict["ok"]:
+        st.success("✅ Có vẻ đúng thì này!")
+    else:
+        st.error(f"❌ Chưa khớp dấu hiệu thì. Gợi ý: {verdict['hint']}")
+
+
+def example_hint(item: dict, verdict: dict) -> str:
+    # gợi ý của validate_example (với công thức, "hint" là đáp án đúng: không đưa vào thống kê)
+    return verdict.get("hint", "") if item["check"] == "example" else ""
+
+
+def grade_rows_of(section: str, rows: list[Row], answers: list[str]) -> list[dict]:
+    verdicts = grade_items([{**row.item, ANSWER_FIELD[row.item["check"]]: answer}
+                            for row, answer in zip(rows, answers)])
+    for row, answer, verdict in zip(rows, answers, verdicts):
+        record(section, row.key, answer, verdict["ok"], row.form, hint=example_hint(row.item, verdict))
+    return verdicts
+
+
+@st.fragment
+def grade_section(section: str, rows: list[Row]) -> None:
+    if not batch_mode:
+        for row in rows:
+            if row.heading:
+                st.markdown(f"**{row.heading}**")
+            answer = st.text_input(row.label, key=row.key, placeholder=row.placeholder,
+                                   max_chars=text.max_chars)
+            if st.button(row.button, key=f"btn-{row.key}"):
+                show_verdict(row, grade_rows_of(section, [row], [answer])[0])
+        return
+    with st.form(f"form-{section}-{tense_key}", border=False):
+        answers, slots = [], []
+        for row in rows:
+            if row.heading:
+                st.markdown(f"**{row.heading}**")
+            answers.append(st.text_input(row.label, key=row.key, placeholder=row.placeholder,
+                                         max_chars=text.max_chars))
+            slots.append(st.empty())
+        submitted = st.form_submit_button("Chấm cả phần", key=f"btn-form-{section}-{tense_key}", type="primary")
+    if submitted:
+        # ô để trống coi như chưa làm: không chấm, không lưu
+        todo = [i for i, answer in enumerate(answers) if answer.strip()]
+        verdicts = grade_rows_of(section, [rows[i] for i in todo], [answers[i] for i in todo])
+        for i, verdict in zip(todo, verdicts):
+            with slots[i].container():
+                show_verdict(rows[i], verdict)
+        st.caption(f"Đúng {sum(v['ok'] for v in verdicts)}/{len(verdicts)} ô đã làm.")
+
+
+# --------- LUYỆN TẬP: mỗi lần một thẻ của cả 12 thì (công thức, cách dùng, dấu hiệu, ví dụ); thẻ hay
+# sai quay lại sớm, thẻ đã thuộc giãn dần (lặp lại ngắt quãng, xem grader/practice.py)
+def next_practice() -> None:
+    st.session_state.pop("practice-card", None)
+    st.session_state["practice-n"] = st.session_state.get("practice-n", 0) + 1
+
+
+@st.fragment
+def practice() -> None:
+    card = st.session_state.get("practice-card")
+    if card is None or card.key not in card_bank().index:
+        card = st.session_state["practice-card"] = next_practice_card()
+    if card is None:
+        st.info("Chưa có thẻ nào để luyện.")
+        return
+    counts = st.empty()
+    with st.form("form-practice", border=False):
+        answer = st.text_input(card.prompt, key=f"practice-in-{st.session_state.get('practice-n', 0)}",
+                               max_chars=text.max_chars)
+        submitted = st.form_submit_button("Chấm", type="primary")
+    if submitted and answer.strip():
+        verdict = grade_items([{**card.item, ANSWER_FIELD[card.item["check"]]: answer}])[0]
+        record(card.section, card.key, answer, verdict["ok"], card.form, card.tense_key,
+               example_hint(card.item, verdict))
+        show_verdict(Row(card.key, card.prompt, "", card.item, card.form), verdict, card.tense_key)
+        if card.answer:
+            st.caption(f"Đáp án mẫu: {card.answer}")
+        st.button("Thẻ tiếp theo ➡️", key="btn-practice-next", on_click=next_practice)
+    (new, due, later), weak = practice_summary(3)
+    counts.caption(f"🃏 {new} thẻ mới · {due} thẻ đến hạn ôn · {later} thẻ chưa tới hạn")
+    if weak:
+        st.caption("Hay sai: " + " · ".join(f"{c.prompt.rstrip(':')} ({lapses} lần)" for c, lapses in weak))
+
+
+# --------- THỐNG KÊ LỚP (giáo viên, cần mật khẩu, xem is_admin): thì/dạng và gợi ý hay sai trên cả nhật ký lần chấm
+# (bảng tổng hợp cộng dồn, chỉ đọc các lần chấm mới, xem grader/analytics.py)
+SECTION_NAMES = {"formula": "Công thức", "use": "Cách dùng", "signal": "Dấu hiệu", "example": "Ví dụ"}
+
+
+@st.fragment
+def class_stats() -> None:
+    start = time.perf_counter()
+    log = get_log()
+    log.flush()
+    agg = log.aggregates()
+    section = st.segmented_control("Phần", list(SECTION_NAMES), format_func=SECTION_NAMES.get, key="stats-section")
+    attempts, fails = agg.totals(section)
+    if not attempts:
+        st.info("Chưa có lượt chấm nào.")
+        return
+    st.caption(f"{attempts:,} lượt chấm · sai {fails / attempts:.0%}")
+    data = [{"tense": TENSE_NAMES.get(c.tense_key, c.tense_key), "form": c.form or "—", "rate": c.fail_rate,
+             "fails": c.fails, "attempts": c.attempts} for c in agg.cells(section)]
+    chart = alt.Chart(alt.Data(values=data)).mark_rect().encode(
+        x=alt.X("form:N", title="Dạng", sort=[*FORMS, "—"]),
+        y=alt.Y("tense:N", title=None, sort=list(TENSE_NAMES.values())),
+        color=alt.Color("rate:Q", title="Tỉ lệ sai", scale=alt.Scale(scheme="reds", domain=[0, 1])),
+        tooltip=[alt.Tooltip("tense:N", title="Thì"), alt.Tooltip("form:N", title="Dạng"),
+                 alt.Tooltip("rate:Q", title="Tỉ lệ sai", format=".0%"),
+                 alt.Tooltip("fails:Q", title="Sai", format=","), alt.Tooltip("attempts:Q", title="Lượt", format=",")],
+    )
+    st.altair_chart(chart, width="stretch")
+    hints = agg.top_hints(10)
+    if hints and section in (None, "example"):
+        st.markdown("**Gợi ý của phần Ví dụ hay gặp nhất (câu sai)**")
+        st.dataframe([{"Thì": TENSE_NAMES.get(h.tense_key, h.tense_key), "Dạng": h.form, "Gợi ý": h.hint,
+                       "Số lần sai": h.fails} for h in hints], hide_index=True)
+    st.caption(f"Nhật ký: {agg.rows:,} dòng · tổng hợp + vẽ trong {(time.perf_counter() - start) * 1e3:.0f} ms")
 
-# ==========================
-# DỮ LIỆU 12 THÌ (tóm tắt – VN trước, EN trong ngoặc)
-# ==========================
-TENSES = {
-    "Hiện tại đơn (Present Simple)": {
-        "key": "present_simple",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + V(s/es)",
-                "Phủ định": "S + do/does not + V",
-                "Nghi vấn": "Do/Does + S + V ?"
-            },
-            "Động từ to be (To be)": {
-                "Khẳng định": "S + am/is/are",
-                "Phủ định": "S + am/is/are + not",
-                "Nghi vấn": "Am/Is/Are + S ?"
-            },
-        },
-        "uses": [
-            "Diễn tả thói quen, sự thật hiển nhiên (Habits, general truths)",
-            "Lịch trình, thời gian biểu (Schedules, timetables)"
-        ],
-        "signals": ["always", "often", "usually", "sometimes", "every day"]
-    },
-    "Hiện tại tiếp diễn (Present Continuous)": {
-        "key": "present_continuous",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + am/is/are + V-ing",
-                "Phủ định": "S + am/is/are + not + V-ing",
-                "Nghi vấn": "Am/Is/Are + S + V-ing ?"
-            }
-        },
-        "uses": [
-            "Hành động đang xảy ra (Action happening now)",
-            "Sự việc tạm thời (Temporary situations)"
-        ],
-        "signals": ["now", "at the moment", "right now", "currently"]
-    },
-    "Hiện tại hoàn thành (Present Perfect)": {
-        "key": "present_perfect",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + have/has + V3",
-                "Phủ định": "S + have/has + not + V3",
-                "Nghi vấn": "Have/Has + S + V3 ?"
-            }
-        },
-        "uses": [
-            "Kinh nghiệm, kết quả đến hiện tại (Experiences, present results)",
-            "Hành động vừa xảy ra/không rõ thời điểm (Recent/unspecified time)"
-        ],
-        "signals": ["already", "yet", "ever", "never", "just", "so far", "recently", "lately"]
-    },
-    "Hiện tại hoàn thành tiếp diễn (Present Perfect Continuous)": {
-        "key": "present_perfect_continuous",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + have/has + been + V-ing",
-                "Phủ định": "S + have/has + not + been + V-ing",
-                "Nghi vấn": "Have/Has + S + been + V-ing ?"
-            }
-        },
-        "uses": [
-            "Nhấn mạnh độ dài hành động tới hiện tại (Duration up to now)",
-            "Hành động vừa dừng lại và còn dấu vết (Recent activity)"
-        ],
-        "signals": ["for", "since", "all day", "recently", "lately"]
-    },
-    "Quá khứ đơn (Past Simple)": {
-        "key": "past_simple",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + V2/V-ed",
-                "Phủ định": "S + did not + V",
-                "Nghi vấn": "Did + S + V ?"
-            },
-            "Động từ to be (To be)": {
-                "Khẳng định": "S + was/were",
-                "Phủ định": "S + was/were + not",
-                "Nghi vấn": "Was/Were + S ?"
-            },
-        },
-        "uses": [
-            "Hành động đã kết thúc trong quá khứ (Finished past action)",
-            "Chuỗi sự kiện trong quá khứ (sequence)"
-        ],
-        "signals": ["yesterday", "last night/week/year", "in 2010", "ago"]
-    },
-    "Quá khứ tiếp diễn (Past Continuous)": {
-        "key": "past_continuous",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + was/were + V-ing",
-                "Phủ định": "S + was/were + not + V-ing",
-                "Nghi vấn": "Was/Were + S + V-ing ?"
-            }
-        },
-        "uses": [
-            "Hành động đang diễn ra tại 1 thời điểm quá khứ (action in progress in the past)",
-            "Bối cảnh cho hành động khác xen vào (background action)"
-        ],
-        "signals": ["while", "at 5 pm yesterday", "when + Past Simple"]
-    },
-    "Quá khứ hoàn thành (Past Perfect)": {
-        "key": "past_perfect",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + had + V3",
-                "Phủ định": "S + had + not + V3",
-                "Nghi vấn": "Had + S + V3 ?"
-            }
-        },
-        "uses": [
-            "Hành động xảy ra trước một thời điểm/quá khứ khác (earlier past)",
-            "Nhấn mạnh thứ tự sự kiện"
-        ],
-        "signals": ["before", "after", "by the time", "already"]
-    },
-    "Quá khứ hoàn thành tiếp diễn (Past Perfect Continuous)": {
-        "key": "past_perfect_continuous",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + had + been + V-ing",
-                "Phủ định": "S + had + not + been + V-ing",
-                "Nghi vấn": "Had + S + been + V-ing ?"
-            }
-        },
-        "uses": [
-            "Nhấn mạnh độ dài trước quá khứ (duration before a past point)"
-        ],
-        "signals": ["for", "since", "until", "before + Past Simple"]
-    },
-    "Tương lai đơn (Future Simple)": {
-        "key": "future_simple",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + will + V",
-                "Phủ định": "S + will not (won't) + V",
-                "Nghi vấn": "Will + S + V ?"
-            }
-        },
-        "uses": [
-            "Quyết định tức thì, dự đoán (instant decisions, predictions)",
-            "Lời hứa, đề nghị, yêu cầu"
-        ],
-        "signals": ["tomorrow", "next week", "soon", "probably"]
-    },
-    "Tương lai tiếp diễn (Future Continuous)": {
-        "key": "future_continuous",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + will be + V-ing",
-                "Phủ định": "S + will not be + V-ing",
-                "Nghi vấn": "Will + S + be + V-ing ?"
-            }
-        },
-        "uses": [
-            "Hành động sẽ đang diễn ra tại thời điểm tương lai (action in progress in the future)"
-        ],
-        "signals": ["at this time tomorrow", "at 5 pm next Monday"]
-    },
-    "Tương lai hoàn thành (Future Perfect)": {
-        "key": "future_perfect",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + will have + V3",
-                "Phủ định": "S + will not have + V3",
-                "Nghi vấn": "Will + S + have + V3 ?"
-            }
-        },
-        "uses": [
-            "Hoàn thành trước một mốc tương lai (completed before a future time)"
-        ],
-        "signals": ["by tomorrow", "by next year", "by the time"]
-    },
-    "Tương lai hoàn thành tiếp diễn (Future Perfect Continuous)": {
-        "key": "future_perfect_continuous",
-        "summary": {
-            "Động từ thường (Verb)": {
-                "Khẳng định": "S + will have been + V-ing",
-                "Phủ định": "S + will not have been + V-ing",
-                "Nghi vấn": "Will + S + have been + V-ing ?"
-            }
-        },
-        "uses": [
-            "Nhấn mạnh độ dài tới một mốc tương lai (duration up to a future point)"
-        ],
-        "signals": ["for", "since", "by the time + future"]
-    },
-}
 
 # ==========================
 # APP UI
 # ==========================
 st.title("📘 Luyện 12 thì Tiếng Anh")
 
+admin = is_admin()
+if admin and st.sidebar.toggle("📊 Thống kê lớp (giáo viên)", key="class-stats"):
+    class_stats()
+    st.stop()
+
+if st.sidebar.toggle("🎯 Luyện tập thẻ (ôn lại phần hay sai)", key="practice-mode"):
+    practice()
+    st.stop()
+
 tense_name = st.selectbox("👉 Chọn thì muốn học:", list(TENSES.keys()))
 tense = TENSES[tense_name]
-tense_key = tense["key"]
+tense_key = tense.key
+
+batch_mode = st.sidebar.toggle("📝 Chấm cả phần (một lần bấm)", value=True, key="batch-mode",
+                               help="Tắt để chấm từng dòng bằng nút riêng.")
+
+if store:
+    done = [v for (k, _), v in store.summary(student).items() if k == tense_key]
+    st.sidebar.caption(f"📈 Thì này: đúng {sum(c for _, c in done)}/{sum(n for n, _ in done)} lượt kiểm tra")
 
 # --------- BẢNG TÓM TẮT (chỉ hiện của thì đã chọn)
 with st.expander("📖 Bảng tóm tắt (Summary) – chỉ thì đang chọn", expanded=True):
-    for group, formulas in tense["summary"].items():
+    for group, formulas in tense.summary.items():
         st.markdown(f"**{group}:**")
         for form, formula in formulas.items():
             st.write(f"- {form}: {formula}")
 
 st.divider()
 
-# --------- KIỂM TRA CÔNG THỨC (mỗi dòng có nút kiểm tra riêng, không phân biệt hoa/thường)
+# --------- KIỂM TRA CÔNG THỨC (không phân biệt hoa/thường)
 st.subheader("✍️ Kiểm tra công thức (Formulas)")
-
-for group, formulas in tense["summary"].items():
-    st.markdown(f"**{group}**")
-    for form, correct in formulas.items():
-        key_input = f"formula-{tense_key}-{group}-{form}"
-        key_btn = f"btn-formula-{tense_key}-{group}-{form}"
-        user_input = st.text_input(f"{form} – nhập công thức (Enter formula):", key=key_input)
-        if st.button(f"Kiểm tra {form}", key=key_btn):
-            if formula_ok(user_input, correct):
-                st.success("✅ Chính xác!")
-            else:
-                st.error(f"❌ Sai rồi! Gợi ý: {correct}")
-
+st.caption("Viết đủ các phần theo đúng thứ tự (S, trợ động từ, not, dạng động từ), câu hỏi có dấu \"?\"; "
+           "chỗ V(s/es) viết V cũng được.")
+grade_section("formula", [
+    Row(f"formula-{tense_key}-{group}-{form}", f"{form} – nhập công thức (Enter formula):", f"Kiểm tra {form}",
+        {"check": "formula", "tense_key": tense_key, "group": group, "form": form},
+        form=form, heading=group if i == 0 else "")
+    for group, formulas in tense.summary.items()
+    for i, form in enumerate(formulas)
+])
 
 st.divider()
 
-# --------- KIỂM TRA CÁCH DÙNG
+# --------- KIỂM TRA CÁCH DÙNG (✅ đúng nếu đủ giống đáp án: TF-IDF, theo từ)
 st.subheader("📌 Cách dùng (Uses)")
-for i, use in enumerate(tense["uses"], 1):
-    key_use_in = f"use-{tense_key}-{i}"
-    key_use_btn = f"btn-use-{tense_key}-{i}"
-    user_use = st.text_input(f"Cách dùng {i} (Use {i}):", key=key_use_in)
-
-    if st.button(f"Kiểm tra cách dùng {i}", key=key_use_btn):
-        nu, na = norm(user_use), norm(use)
-
-        # ✅ đúng nếu 1 trong 2 chứa nhau
-        if nu in na or na in nu:
-            st.success("✅ Chính xác!")
-        else:
-            st.error(f"❌ Sai rồi! Gợi ý: {use}")
+grade_section("use", [
+    Row(f"use-{tense_key}-{i}", f"Cách dùng {i} (Use {i}):", f"Kiểm tra cách dùng {i}",
+        {"check": "usage", "tense_key": tense_key, "usage": use})
+    for i, use in enumerate(tense.uses, 1)
+])
 st.divider()
 
-# --------- KIỂM TRA DẤU HIỆU NHẬN BIẾT
+# --------- KIỂM TRA DẤU HIỆU NHẬN BIẾT (✅ đúng cả khi sai chính tả nhẹ: "alway", "at the momment")
 st.subheader("🔑 Dấu hiệu nhận biết (Signal words)")
-for i, sig in enumerate(tense["signals"], 1):
-    key_sig_in = f"sig-{tense_key}-{i}"
-    key_sig_btn = f"btn-sig-{tense_key}-{i}"
-    user_sig = st.text_input(f"Dấu hiệu {i} (Signal {i}):", key=key_sig_in)
-    if st.button(f"Kiểm tra dấu hiệu {i}", key=key_sig_btn):
-        if norm(user_sig) == norm(sig):
-            st.success("✅ Chính xác!")
+grade_section("signal", [
+    Row(f"sig-{tense_key}-{i}", f"Dấu hiệu {i} (Signal {i}):", f"Kiểm tra dấu hiệu {i}",
+        {"check": "signal", "signal": sig})
+    for i, sig in enumerate(tense.signals, 1)
+])
+
+
+# Tra ngược: một dấu hiệu thuộc những thì nào
+@st.fragment
+def signal_lookup() -> None:
+    lookup = st.text_input("Dấu hiệu này thuộc thì nào? (Which tense?):", key="sig-lookup-in",
+                           placeholder="vd: already, at the moment...", max_chars=text.max_chars)
+    if lookup.strip():
+        hit = assets.signal_index.best(lookup)
+        if hit:
+            names = ", ".join(TENSE_NAMES[k] for k in assets.signal_index.tenses_for(lookup))
+            st.info(f"🔁 \"{hit.signal}\" là dấu hiệu của: {names}")
         else:
-            st.error(f"❌ Sai rồi! Đúng là: {sig}")
+            st.warning("Không tìm thấy dấu hiệu này trong 12 thì.")
+
+
+signal_lookup()
 
 st.divider()
 
 # --------- KIỂM TRA VÍ DỤ (tự động nhận diện theo thì) ---------
 st.subheader("🧪 Kiểm tra ví dụ (Examples)")
-
-for group in tense["summary"].keys():
-    # xác định group_key cho validator
-    group_key = "tobe" if "to be" in group.lower() else "verb"
-
-    st.markdown(f"**{group}**")
-    for form in ["Khẳng định", "Phủ định", "Nghi vấn"]:
-        key_ex_in = f"ex-{tense_key}-{group_key}-{form}"
-        key_ex_btn = f"btn-ex-{tense_key}-{group_key}-{form}"
-        example = st.text_input(f"Ví dụ {form} ({form} example):", key=key_ex_in, placeholder="Nhập câu ví dụ của bạn...")
-        if st.button(f"Kiểm tra ví dụ {form}", key=key_ex_btn):
-            ok, hint = validate_example(tense_key, group_key, form, example)
-            if ok:
-                st.success("✅ Có vẻ đúng thì này!")
+grade_section("example", [
+    Row(f"ex-{tense_key}-{group_key(group)}-{form}", f"Ví dụ {form} ({form} example):", f"Kiểm tra ví dụ {form}",
+        {"check": "example", "tense_key": tense_key, "group": group_key(group), "form": form},
+        form=form, heading=group if i == 0 else "", placeholder="Nhập câu ví dụ của bạn...")
+    for group in tense.summary
+    for i, form in enumerate(FORMS)
+])
+
+# --------- TỰ NHẬN DIỆN THÌ (không cần chọn thì/dạng trước)
+@st.fragment
+def auto_detect() -> None:
+    if st.toggle("🔎 Tự nhận diện thì (Auto-detect)", key="auto-detect"):
+        sentence = st.text_input("Nhập một câu bất kỳ (Any sentence):", key="auto-detect-in",
+                                 placeholder="VD: She has not finished her homework yet.",
+                                 max_chars=text.max_chars)
+        if st.button("Nhận diện thì", key="btn-auto-detect"):
+            guess = classify_tense(sentence)
+            if guess.tense_key:
+                st.info(f"🔎 {TENSE_NAMES[guess.tense_key]} – {guess.form} "
+                        f"(độ tin cậy {guess.confidence:.0%})")
             else:
-                st.error(f"❌ Chưa khớp dấu hiệu thì. Gợi ý: {hint}")
+                st.warning("Chưa nhận diện được, hãy nhập một câu hoàn chỉnh.")
+
+
+auto_detect()
+
+# --------- CẢ ĐOẠN VĂN: tô màu thì của từng câu, hiện dần theo từng đoạn (không chờ chấm hết bài)
+ESSAY_COLORS = {"present": "blue", "past": "orange", "future": "green"}
+FORM_MARKS = {"Khẳng định": "+", "Phủ định": "−", "Nghi vấn": "?"}
+MD_SPECIAL = re.compile(r"([\\`*_{}\[\]()#+\-.!|<>$~:])")
+
+
+def essay_markdown(s: TaggedSentence) -> str:
+    sentence = MD_SPECIAL.sub(r"\\\1", s.text)
+    if not s.tense_key:
+        return f":gray-background[{sentence}]"
+    color = ESSAY_COLORS[s.tense_key.split("_", 1)[0]]
+    name = TENSE_NAMES[s.tense_key].rsplit("(", 1)[-1].rstrip(")")
+    warn = "" if s.ok else " ⚠️"
+    return f":{color}-background[{sentence}] :gray[{name} {FORM_MARKS.get(s.form, '')} {s.confidence:.0%}{warn}]"
+
+
+@st.fragment
+def essay_check() -> None:
+    if not st.toggle("📄 Nhận diện thì cả đoạn văn (Paragraph)", key="essay"):
+        return
+    with st.form("form-essay", border=False):
+        essay = st.text_area("Dán đoạn văn / bài luận (Paste a paragraph):", key="essay-in", height=200,
+                             placeholder="VD: I have lived here since 2010. Yesterday I went to school...",
+                             max_chars=ESSAY_MAX_CHARS)
+        submitted = st.form_submit_button("Nhận diện từng câu")
+    if not submitted or not essay.strip():
+        return
+    out, batch, paragraph = st.container(), [], 0
+    counts: Counter[str] = Counter()
+    for s in tag_text(essay):
+        if batch and (s.paragraph != paragraph or len(batch) >= 20):
+            out.markdown(" ".join(batch))
+            batch = []
+        paragraph = s.paragraph
+        batch.append(essay_markdown(s))
+        counts[s.tense_key] += 1
+    if batch:
+        out.markdown(" ".join(batch))
+    st.caption(f"{counts.total()} câu – " + ", ".join(
+        f"{TENSE_NAMES.get(k, 'chưa rõ')}: {n}" for k, n in counts.most_common()))
+
+
+essay_check()
+
+# --------- QUẢN TRỊ: số đo hiệu năng (cùng mật khẩu giáo viên với Thống kê lớp, xem is_admin)
+if admin:
+    with st.sidebar.expander("🛠 Đo đạc bộ chấm (admin)"):
+        on = st.toggle("Bật đo đạc (mọi phiên)", value=metrics.enabled, key="metrics-on")
+        if on and not metrics.enabled:
+            metrics.enable()
+        elif not on and metrics.enabled:
+            metrics.disable()
+        if st.button("Xoá số đo", key="btn-metrics-reset"):
+            metrics.reset()
+        latency = metrics.latency_rows()
+        st.caption("Độ trễ bộ chấm (µs; p50/p99 là cận trên của ô histogram)")
+        st.dataframe([{k: v for k, v in r.items() if k != "metric"} for r in latency
+                      if r["metric"] == "grader_checker_seconds"], hide_index=True)
+        st.caption("Độ trễ từng luật của validate_example (µs)")
+        st.dataframe([{k: v for k, v in r.items() if k != "metric"} for r in latency
+                      if r["metric"] == "grader_rule_seconds"], hide_index=True)
+        st.caption("Luật của validate_example: qua / trượt ở điều kiện thứ mấy")
+        st.dataframe(metrics.counter_rows("grader_rule_outcomes_total"), hide_index=True)
+        st.caption("Mẫu của any_match")
+        st.dataframe(metrics.counter_rows("grader_pattern_total"), hide_index=True)
+        st.caption("Bộ nhớ đệm")
+        st.dataframe(metrics.cache_rows(), hide_index=True)
+        st.caption(f"Nội dung: {content.current().path} (phiên bản {content.current().version})")
+        if content.last_error:
+            st.error(f"Không nạp lại được nội dung, vẫn dùng bản cũ: {content.last_error}")
+        st.download_button("Tải số đo (Prometheus)", metrics.render(), file_name="metrics.prom",
+                           mime="text/plain", key="btn-metrics-dl")
 
 # Gợi ý nhỏ ở cuối
 st.info("💡 Lưu ý: Trình kiểm tra ví dụ dùng luật nhận dạng đơn giản (trợ động từ, V-ing/V-ed/V3...). Bạn cứ tập trung đúng **công thức** và **dấu hiệu** là ổn nhé!")
@@ -0,0 +1,135 @@
+"""
+Độ trễ xấu nhất của bộ chấm trên đầu vào "độc" (cố tình dài, lặp mẫu để regex
+phải quay lui): cụm trợ động từ lặp lại ("have been x have been x ..."), "am
+not" lặp, dạng rút gọn lặp, chuỗi dấu cách dài, một từ rất dài, "(" / "/" lặp,
+chữ có dấu. Mỗi đầu vào được chạy qua:
+- norm
+- validate_example với mọi luật trong RULES
+- formula_ok với mọi công thức trong `summary`
+- classify_tense
+- usage_ok với cách dùng của từng thì (TF-IDF, `similarity`)
+- signal_index: tra dấu hiệu nhận biết chấp nhận lỗi chính tả (`fuzzy`), như
+  khi chấm câu trả lời phần "Dấu hiệu"
+
+In p50/p99/max (ms) mỗi bộ chấm ở độ dài `--chars` và gấp đôi: chấm tuyến tính
+thì gấp đôi độ dài chỉ tăng thời gian khoảng 2 lần. `--legacy` chạy thêm bộ
+regex cũ của validate_example (`benchmarks.legacy`, rất chậm) để so.
+
+Repo không có bộ test, nên đây là chốt chặn: `--check` thoát mã 1 nếu p99 của
+bộ chấm nào vượt `--max-p99-ms`. Độ dài mặc định 10 000 ký tự gấp 10 lần giới
+hạn nhận vào (GRADER_MAX_CHARS, mặc định 1000), nên là cận trên rộng rãi.
+
+Chạy: python -m benchmarks.bench_adversarial [--chars 10000] [--check --max-p99-ms 20] [--legacy]
+"""
+import argparse
+import statistics
+import time
+
+from grader import RULES, TENSES_BY_KEY, classify_tense, formula_ok, norm, usage_ok, validate_example
+from grader.fuzzy import signal_index
+
+from .legacy import legacy_validate_example
+
+ATTACKS = {
+    "have been x ...": "have been x ",
+    "am not x ...": "am not x ",
+    "had been x ...": "had been x ",
+    "will have been ...": "will have been doing ",
+    "don't ...": "don't ",
+    "dấu cách": " ",
+    "một từ dài": "a",
+    "( ...": "( ",
+    "have/has/...": "have/",
+    "chữ có dấu": "ă ",
+    "dấu hiệu gõ sai ...": "evry day ",
+}
+
+
+def attack(unit: str, chars: int) -> str:
+    text = unit * (chars // len(unit) + 1)
+    return text[:chars - 1] + "x"
+
+
+def checkers(legacy: bool = False) -> dict:
+    """tên -> hàm nhận một chuỗi, chạy mọi lần gọi của bộ chấm đó và trả về từng độ trễ (giây)."""
+    formulas = [correct for tense in TENSES_BY_KEY.values() for formulas in tense.summary.values()
+                for correct in formulas.values()]
+    rules = [(t, g or "verb", f) for t, g, f in RULES]
+    uses = [(tuple(tense.uses),) for tense in TENSES_BY_KEY.values()]
+    for args in uses:
+        usage_ok("", *args)      # nạp NumPy và dựng chỉ mục trước khi đo
+
+    def each(fn, argses):
+        def run(text):
+            times = []
+            for args in argses:
+                start = time.perf_counter()
+                fn(*args, text)
+                times.append(time.perf_counter() - start)
+            return times
+        return run
+
+    fns = {
+        "norm": each(norm, [()]),
+        "validate_example": each(validate_example, rules),
+        "formula_ok": each(lambda correct, s: formula_ok(s, correct), [(c,) for c in formulas]),
+        "classify_tense": each(classify_tense, [()]),
+        "usage_ok": each(lambda usages, s: usage_ok(s, usages), uses),
+        "signal_index": each(signal_index().lookup, [()]),
+    }
+    if legacy:
+        fns["validate_example (cũ)"] = each(legacy_validate_example, rules)
+    return fns
+
+
+def measure(fns: dict, chars: int, repeat: int) -> dict[str, list[float]]:
+    """Độ trễ từng lần gọi (giây) của mỗi bộ chấm trên mọi đầu vào độc."""
+    texts = [attack(unit, chars) for unit in ATTACKS.values()]
+    times = {name: [] for name in fns}
+    for _ in range(repeat):
+        for text in texts:
+            for name, run in fns.items():
+                times[name] += run(text)
+    return times
+
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--chars", type=int, default=10_000, help="độ dài mỗi đầu vào độc")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--legacy", action="store_true", help="so với bộ regex cũ của validate_example (chậm)")
+    ap.add_argument("--check", action="store_true", help="thoát mã 1 nếu p99 vượt --max-p99-ms")
+    ap.add_argument("--max-p99-ms", type=float, default=20.0)
+    args = ap.parse_args(argv)
+
+    fns = checkers(args.legacy)
+    print(f"{len(ATTACKS)} đầu vào độc: {', '.join(ATTACKS)}")
+    print(f"{'bộ chấm':<24} {'ký tự':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'x2 ký tự':>9}")
+    failed = []
+    for name, run in fns.items():
+        repeat = 1 if name.endswith("(cũ)") else args.repeat
+        p99s = []
+        for chars in (args.chars, 2 * args.chars):
+            times = measure({name: run}, chars, repeat)[name]
+            p99s.append(_pct(times, 0.99))
+            growth = f"{p99s[1] / p99s[0]:>8.1f}x" if len(p99s) == 2 else ""
+            print(f"{name:<24} {chars:>7,} {statistics.median(times) * 1e3:>8.3f} {p99s[-1] * 1e3:>8.3f} "
+                  f"{max(times) * 1e3:>8.3f} {growth:>9}")
+        if not name.endswith("(cũ)") and p99s[0] * 1e3 > args.max_p99_ms:
+            failed.append(f"{name}: p99 {p99s[0] * 1e3:.2f} ms > {args.max_p99_ms} ms")
+
+    if args.check:
+        for line in failed:
+            print(f"VƯỢT NGƯỠNG {line}")
+        print("OK" if not failed else f"{len(failed)} bộ chấm vượt ngưỡng")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
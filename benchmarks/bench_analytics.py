@@ -0,0 +1,148 @@
+"""
+Nhật ký lần chấm dạng cột và bảng tổng hợp cộng dồn (`grader.analytics`) ở cỡ
+hàng chục triệu lượt chấm.
+
+Lượt chấm tổng hợp: thì/phần/dạng như nội dung thật, gợi ý lấy từ bảng luật
+`validate_example`, --students học sinh, sai ~30%. Báo cáo:
+- nạp (`AttemptLog.extend`): dòng/giây, byte/dòng trên đĩa
+- tổng hợp lần đầu khi chưa có bản lưu (quét cả nhật ký), tiến trình mới có bản
+  lưu, và cộng dồn sau khi thêm --new dòng: thời gian chỉ theo số dòng mới
+- truy vấn cho trang thống kê (ô thì × dạng của mọi phần / phần Ví dụ, gợi ý hay
+  sai nhất): µs mỗi lần
+- so với cách làm thẳng: bảng SQLite kiểu `progress` (chuỗi) và GROUP BY trên
+  --sqlite-rows dòng (ns mỗi dòng)
+- --app: thời gian chạy trang "Thống kê lớp" của app (AppTest) trên nhật ký này
+
+Chạy: python -m benchmarks.bench_analytics [--rows 10000000] [--app]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from itertools import cycle, islice
+from typing import Iterator
+
+from streamlit.testing.v1 import AppTest
+
+from grader import FORMS, RULES, content
+from grader.analytics import COLUMNS, AttemptLog, Entry
+
+SECTIONS = ("formula", "use", "signal", "example")
+
+
+def entries(n: int, students: int, seed: int = 0) -> Iterator[Entry]:
+    rng = random.Random(seed)
+    tenses = list(content.current().by_key)
+    hints = {}
+    for (tense_key, _, form), rule in RULES.items():
+        hints.setdefault((tense_key, form), []).append(rule.hint)
+    ts = 1_700_000_000
+    for i in range(n):
+        tense_key, section = rng.choice(tenses), rng.choice(SECTIONS)
+        form = rng.choice(FORMS) if section in ("formula", "example") else ""
+        ok = rng.random() >= 0.3
+        hint = rng.choice(hints[tense_key, form]) if section == "example" and not ok else ""
+        yield Entry(f"hs-{rng.randrange(students)}", tense_key, section, form, hint, ok, ts + i // 100)
+
+
+def stream(n: int, students: int, seed: int = 0, pool: int = 100_000) -> Iterator[Entry]:
+    """`n` lượt chấm lặp vòng trên `pool` lượt ngẫu nhiên (sinh ngẫu nhiên chậm hơn nạp nhiều lần)."""
+    return islice(cycle(list(entries(min(n, pool), students, seed))), n)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _median_us(fn, repeat: int = 50) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def sqlite_group_by(rows: int, students: int) -> float:
+    """Giây cho GROUP BY (phần, thì, dạng) trên bảng chuỗi kiểu `progress`, `rows` dòng."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE attempts (student TEXT, tense_key TEXT, section TEXT, form TEXT, hint TEXT, "
+                 "ok INTEGER, ts REAL)")
+    conn.executemany("INSERT INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?)", stream(rows, students))
+    _, elapsed = _timed(lambda: conn.execute(
+        "SELECT section, tense_key, form, COUNT(*), SUM(1 - ok) FROM attempts GROUP BY section, tense_key, form"
+    ).fetchall())
+    conn.close()
+    return elapsed
+
+
+def app_seconds(root: str) -> tuple[float, float]:
+    """Giây chạy trang Thống kê lớp: lần đầu (mở nhật ký) và chạy lại."""
+    cwd = os.getcwd()
+    os.chdir(root)          # app mở nhật ký mặc định ./attempts
+    try:
+        at = AppTest.from_file(os.path.join(cwd, "app.py"), default_timeout=120)
+        at.query_params["admin"] = "1"
+        at.secrets["admin_password"] = "bench"
+        at.run()
+        at.text_input(key="admin-password").input("bench").run()
+        at.toggle(key="class-stats").set_value(True)
+        _, first = _timed(at.run)
+        _, again = _timed(at.run)
+        assert not at.exception, at.exception
+        return first, again
+    finally:
+        os.chdir(cwd)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--new", type=int, default=1_000, help="số dòng thêm vào trước lần cộng dồn")
+    ap.add_argument("--students", type=int, default=5_000)
+    ap.add_argument("--sqlite-rows", type=int, default=1_000_000)
+    ap.add_argument("--app", action="store_true", help="đo cả trang Thống kê lớp của app (AppTest)")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "attempts")
+        log = AttemptLog(path)
+        rows = stream(args.rows, args.students)
+        n, elapsed = _timed(lambda: log.extend(rows))
+        size = sum(os.path.getsize(os.path.join(path, f"{column}.bin")) for column in COLUMNS)
+        print(f"nạp: {n:,} dòng trong {elapsed:.1f}s ({n / elapsed:,.0f} dòng/s), "
+              f"{size / 1e6:.0f} MB ({size / n:.0f} byte/dòng)")
+
+        agg, cold = _timed(AttemptLog(path).aggregates)       # chưa có bản lưu: quét cả nhật ký
+        _, warm = _timed(AttemptLog(path).aggregates)         # tiến trình mới, đọc bản lưu
+        log.extend(entries(args.new, args.students, seed=1))
+        _, incremental = _timed(log.aggregates)
+        print(f"tổng hợp lần đầu (quét {agg.rows:,} dòng): {cold * 1e3:,.0f} ms "
+              f"({cold / agg.rows * 1e9:.1f} ns/dòng)")
+        print(f"tiến trình mới, có bản lưu:            {warm * 1e3:,.1f} ms")
+        print(f"cộng dồn sau {args.new:,} dòng mới:           {incremental * 1e3:,.2f} ms")
+
+        agg = log.aggregates()
+        print(f"\ntruy vấn (µs, trung vị): ô mọi phần {_median_us(agg.cells):,.0f}, "
+              f"ô phần Ví dụ {_median_us(lambda: agg.cells('example')):,.0f}, "
+              f"gợi ý hay sai {_median_us(agg.top_hints):,.0f}, "
+              f"aggregates() không có dòng mới {_median_us(log.aggregates):,.0f}")
+
+        sqlite = sqlite_group_by(args.sqlite_rows, args.students)
+        print(f"\nGROUP BY SQLite trên {args.sqlite_rows:,} dòng: {sqlite * 1e3:,.0f} ms "
+              f"({sqlite / args.sqlite_rows * 1e9:,.0f} ns/dòng, quét lại mỗi lần xem); "
+              f"quét cột: {cold / agg.rows * 1e9:.1f} ns/dòng, một lần")
+
+        if args.app:
+            first, again = app_seconds(tmp)
+            print(f"\ntrang Thống kê lớp ({agg.rows:,} dòng): lần đầu {first * 1e3:,.0f} ms, "
+                  f"chạy lại {again * 1e3:,.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
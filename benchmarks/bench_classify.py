@@ -0,0 +1,69 @@
+"""
+Benchmark: `classify_tense` (một lượt quét) so với vòng lặp vét cạn gọi
+`validate_example` cho 12 thì × 2 nhóm × 3 dạng.
+
+Chạy: python -m benchmarks.bench_classify [--repeat 5] [--number 20]
+"""
+import argparse
+import timeit
+
+from grader import FORMS, validate_example
+from grader.classify import classify_tense
+from grader.rules import GROUPS
+
+from .bench_rules import SENTENCES, TENSE_KEYS
+
+# Nhãn đúng của SENTENCES (cùng thứ tự): 3 dạng cho mỗi thì,
+# hiện tại đơn/quá khứ đơn có thêm 3 câu to be.
+LABELS = [
+    (tense_key, form)
+    for tense_key in TENSE_KEYS
+    for _ in (("verb", "tobe") if tense_key in ("present_simple", "past_simple") else ("verb",))
+    for form in FORMS
+]
+
+# Vét cạn: thì cụ thể hơn (nhiều trợ động từ hơn) được ưu tiên khi nhiều luật cùng khớp
+BRUTE_ORDER = [
+    "future_perfect_continuous", "past_perfect_continuous", "present_perfect_continuous",
+    "future_perfect", "future_continuous", "past_perfect", "present_perfect",
+    "past_continuous", "present_continuous", "future_simple", "past_simple", "present_simple",
+]
+
+
+def brute_force(sentence: str):
+    for tense_key in BRUTE_ORDER:
+        for group in GROUPS:
+            for form in reversed(FORMS):  # Nghi vấn, Phủ định rồi mới Khẳng định
+                if validate_example(tense_key, group, form, sentence)[0]:
+                    return tense_key, form
+    return "", ""
+
+
+def single_pass(sentence: str):
+    guess = classify_tense(sentence)
+    return guess.tense_key, guess.form
+
+
+def _accuracy(fn) -> float:
+    hits = sum(fn(sent) == label for sent, label in zip(SENTENCES, LABELS))
+    return hits / len(SENTENCES)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--number", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    assert len(LABELS) == len(SENTENCES)
+    best = {}
+    for name, fn in (("vét cạn validate_example", brute_force), ("classify_tense", single_pass)):
+        t = min(timeit.repeat(lambda: [fn(s) for s in SENTENCES], repeat=args.repeat, number=args.number))
+        best[name] = t
+        per_call = t / (args.number * len(SENTENCES)) * 1e6
+        print(f"{name:<26} {per_call:9.2f} µs/câu   đúng thì+dạng: {_accuracy(fn):.0%}")
+    print(f"tăng tốc x{best['vét cạn validate_example'] / best['classify_tense']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
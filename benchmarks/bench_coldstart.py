@@ -0,0 +1,153 @@
+"""
+Khởi động nguội: thời gian import và thời gian tới kết quả chấm đầu tiên của một
+tiến trình mới (worker, một lần chạy CLI), có và không có gói dựng sẵn (`grader.bundle`).
+
+Mỗi kịch bản chạy --repeat lần, mỗi lần một tiến trình Python mới (GRADER_BUNDLE trỏ
+tới gói, hoặc =0), in trung vị:
+- import: `import ...` đo trong tiến trình con (không tính khởi động trình thông dịch)
+- chấm đầu: lần chấm đầu tiên ngay sau import (dựng/nạp bảng, chỉ mục lười)
+- tổng: cả tiến trình, đo từ tiến trình cha (gồm khởi động Python)
+
+Thêm: các module tự tốn nhiều thời gian nhất của `import grader.core` theo
+`python -X importtime`, và kiểm tra `grader.core` không kéo Streamlit, NumPy,
+multiprocessing. Trước khi đo, bytecode của package được dịch sẵn (compileall)
+như khi cài thật, để không đo nhầm thời gian dịch mã nguồn.
+
+Repo không có bộ test, nên đây là chốt chặn: `--check` thoát mã 1 nếu (có gói)
+import `grader.core` vượt --max-import-ms, chấm đầu vượt --max-verdict-ms, hoặc
+grader.core kéo theo module nặng.
+
+Chạy: python -m benchmarks.bench_coldstart [--repeat 7] [--check --max-import-ms 60 --max-verdict-ms 15]
+"""
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from grader import bundle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("streamlit", "numpy", "multiprocessing", "concurrent.futures.process")
+
+# (tên, mã import, mã chấm đầu); tiến trình con in JSON {"import", "verdict", "heavy"} (ms)
+SCENARIOS = [
+    ("grader.core: công thức + câu ví dụ", "import grader.core as core",
+     "core.formula_ok('S + V(s/es)', 'S + V(s/es)'); "
+     "core.validate_example('present_simple', 'verb', 'Khẳng định', 'She works every day.')"),
+    ("grader.core: cách dùng", "import grader.core as core",
+     "core.usage_ok('thói quen', ['Diễn tả thói quen, sự thật hiển nhiên (Habits, general truths)'])"),
+    ("grade_items: cả 4 loại", "from grader import grade_items",
+     "grade_items(["
+     "{'check': 'formula', 'tense_key': 'present_simple', 'group': 'verb', 'form': 'Khẳng định', 'formula': 'S + V'}, "
+     "{'check': 'usage', 'tense_key': 'present_simple', 'text': 'thói quen'}, "
+     "{'check': 'signal', 'tense_key': 'present_simple', 'text': 'alway'}, "
+     "{'check': 'example', 'tense_key': 'present_simple', 'form': 'Khẳng định', 'sentence': 'She works.'}])"),
+]
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+mid = time.perf_counter()
+{verdict}
+end = time.perf_counter()
+print(json.dumps({{"import": (mid - start) * 1e3, "verdict": (end - mid) * 1e3,
+                   "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _env(use_bundle: bool, path: str) -> dict:
+    return {**os.environ, "GRADER_BUNDLE": path if use_bundle else "0", "PYTHONPATH": ROOT}
+
+
+def run_child(imports: str, verdict: str, env: dict) -> tuple[dict, float]:
+    code = _CHILD.format(imports=imports, verdict=verdict, heavy=HEAVY)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout), (time.perf_counter() - start) * 1e3
+
+
+def run_cli(csv_path: str, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "grader", csv_path, "-o", os.devnull], env=env, cwd=ROOT,
+                   capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1e3
+
+
+def import_profile(env: dict, top: int) -> list[tuple[int, str]]:
+    """(µs tự tốn, module) của `import grader.core`, nhiều nhất trước."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import grader.core"], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[0].strip().isdigit():
+            rows.append((int(parts[0]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _tiny_csv(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("id,tense_key,group,form,sentence,formula\n"
+                "1,present_simple,verb,Khẳng định,She works every day.,\n"
+                "2,present_simple,verb,Khẳng định,,S + V(s/es)\n")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--top", type=int, default=8, help="số module in trong phần -X importtime")
+    ap.add_argument("--check", action="store_true", help="thoát mã 1 nếu vượt ngân sách (xem đầu file)")
+    ap.add_argument("--max-import-ms", type=float, default=60.0)
+    ap.add_argument("--max-verdict-ms", type=float, default=15.0)
+    args = ap.parse_args(argv)
+
+    compileall.compile_dir(os.path.join(ROOT, "grader"), quiet=1)
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bundle.bin")
+        sizes = bundle.build(path)
+        print(f"gói: {sum(sizes.values()) / 1024:.0f} KiB ({', '.join(sizes)})")
+        print(f"{'kịch bản':<36} {'gói':<5} {'import ms':>10} {'chấm đầu ms':>12} {'tổng ms':>9}")
+        base = statistics.median(run_child("pass", "pass", _env(False, path))[1] for _ in range(args.repeat))
+        print(f"{'python -c pass':<36} {'':<5} {'':>10} {'':>12} {base:>9.1f}")
+        for name, imports, verdict in SCENARIOS:
+            for use_bundle in (True, False):
+                runs = [run_child(imports, verdict, _env(use_bundle, path)) for _ in range(args.repeat)]
+                imp = statistics.median(r["import"] for r, _ in runs)
+                first = statistics.median(r["verdict"] for r, _ in runs)
+                total = statistics.median(wall for _, wall in runs)
+                print(f"{name:<36} {'có' if use_bundle else 'không':<5} {imp:>10.1f} {first:>12.1f} {total:>9.1f}")
+                if use_bundle and name.startswith("grader.core: công thức"):
+                    heavy = runs[0][0]["heavy"]
+                    if imp > args.max_import_ms:
+                        failed.append(f"import grader.core {imp:.1f} ms > {args.max_import_ms} ms")
+                    if first > args.max_verdict_ms:
+                        failed.append(f"chấm đầu {first:.1f} ms > {args.max_verdict_ms} ms")
+                    if heavy:
+                        failed.append(f"grader.core kéo theo {', '.join(heavy)}")
+        csv_path = os.path.join(tmp, "bai_nop.csv")
+        _tiny_csv(csv_path)
+        for use_bundle in (True, False):
+            wall = statistics.median(run_cli(csv_path, _env(use_bundle, path)) for _ in range(args.repeat))
+            print(f"{'python -m grader (2 dòng)':<36} {'có' if use_bundle else 'không':<5} "
+                  f"{'':>10} {'':>12} {wall:>9.1f}")
+
+        print(f"\n-X importtime, import grader.core (có gói), {args.top} module tự tốn nhiều nhất:")
+        for us, module in import_profile(_env(True, path), args.top):
+            print(f"  {us / 1e3:>7.2f} ms  {module}")
+
+    if args.check:
+        for line in failed:
+            print(f"VƯỢT NGÂN SÁCH {line}")
+        print("OK" if not failed else f"{len(failed)} mục vượt ngân sách")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
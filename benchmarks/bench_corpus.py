@@ -0,0 +1,69 @@
+"""
+Đổ một kho câu tổng hợp (`grader.corpus`) qua `validate_example` và `grade_rows`.
+
+Báo cáo tốc độ sinh + chấm (câu/giây), bộ nhớ đỉnh (không tăng theo số câu vì mọi
+bước đều là generator) và tỉ lệ chấm đúng theo từng loại câu: câu đúng phải được
+nhận, mỗi loại lỗi (wrong_aux, missing_not, v2_for_v3...) phải bị bắt.
+
+Chạy: python -m benchmarks.bench_corpus [-n 100000] [--seed 0]
+"""
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+
+from grader import grade_rows, validate_example
+from grader.corpus import as_rows, generate
+
+
+def _by_mutation(samples) -> tuple[int, Counter, Counter]:
+    total, right = Counter(), Counter()
+    n = 0
+    for s in samples:
+        ok = bool(validate_example(s.tense_key, s.group, s.form, s.sentence)[0])
+        kind = s.mutation or "câu đúng"
+        total[kind] += 1
+        right[kind] += ok == s.expected
+        n += 1
+    return n, total, right
+
+
+def _timed(label: str, fn, count: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26} {count / elapsed:>10,.0f} câu/giây")
+    return result
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", "--count", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    n = args.count
+
+    _timed("chỉ sinh câu", lambda: sum(1 for _ in generate(args.seed, n)), n)
+    _, total, right = _timed("sinh + validate_example", lambda: _by_mutation(generate(args.seed, n)), n)
+    _timed("sinh + grade_rows", lambda: sum(1 for _ in grade_rows(as_rows(generate(args.seed, n)))), n)
+
+    # bộ nhớ đỉnh không phụ thuộc số câu (tracemalloc làm chậm nên đo trên cỡ nhỏ hơn)
+    for size in (1_000, 10_000):
+        peak = _peak_kib(lambda: sum(1 for _ in grade_rows(as_rows(generate(args.seed, size)))))
+        print(f"bộ nhớ đỉnh sinh + grade_rows, {size:>6,} câu: {peak:,.0f} KiB")
+
+    print("\nchấm đúng theo loại câu:")
+    for kind in sorted(total, key=lambda k: (k != "câu đúng", k)):
+        print(f"  {kind:<14} {right[kind] / total[kind]:>6.1%}  ({total[kind]:,} câu)")
+
+
+if __name__ == "__main__":
+    main()
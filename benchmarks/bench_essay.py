@@ -0,0 +1,130 @@
+"""
+Nhận diện thì từng câu trên một bài luận nhiều MB (`grader.essay`).
+
+Bài luận ghép từ câu đúng của `grader.corpus` (mỗi đoạn 5 câu, cách nhau một
+dòng trống), ghi ra file tạm rồi đọc lại theo từng khúc 64 KiB như CLI. Báo cáo:
+- tốc độ chỉ tách câu và tách + gắn thì (câu/giây, MB/giây) ở cỡ --mb và 4 lần
+  --mb: tốc độ như nhau nghĩa là thời gian tuyến tính theo độ dài
+- bộ nhớ đỉnh (tracemalloc) ở hai cỡ: như nhau nghĩa là không giữ cả văn bản
+- số câu tách được và tỉ lệ đoán đúng thì (so với nhãn của kho câu)
+- tách theo khúc: mỗi văn bản mẫu (dòng trống nhiều dạng, viết tắt, ngoặc/nháy,
+  câu dài quá giới hạn) cắt làm hai ở mọi vị trí, và cắt thành từng ký tự, phải
+  cho đúng kết quả như khi đưa cả văn bản một lần
+
+Repo không có bộ test, nên đây là chốt chặn: `--check` thoát mã 1 nếu cách chia
+khúc làm đổi kết quả tách câu.
+
+Chạy: python -m benchmarks.bench_essay [--mb 2] [--seed 0] [--check]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator
+
+from grader.corpus import generate
+from grader.essay import read_chunks, split_sentences, tag_text
+
+
+# văn bản mẫu cho phần tách theo khúc: chỗ khớp dấu kết thúc dễ rơi vào ranh giới khúc
+CHUNK_SAMPLES = [
+    "She works here. He is reading now!\n\n\n\nThey have left… “Did you go?” she asked.\n \n\t"
+    "We were there (last year.) Mr. Smith met Dr. Lee, e.g. at J. K. Rowling's house.\n\n",
+    "\n\nA.\n\n\n\nB.  \n\n  C?! D...\n\n",
+    "No terminator here and a rather long run of words that must be cut somewhere sensible",
+    "x" * 50 + ". Short.\n\n" + "y " * 40,
+]
+CHUNK_LIMITS = (None, 10, 25, 40)     # max_chars: cả giới hạn mặc định và cắt câu dài
+
+
+def sentences(seed: int) -> Iterator:
+    return (s for s in generate(seed) if s.expected)
+
+
+def write_essay(path: str, mb: float, seed: int) -> int:
+    """Ghi bài luận khoảng `mb` MB; trả về số câu."""
+    limit, n, size = mb * 1e6, 0, 0
+    with open(path, "w", encoding="utf-8") as f:
+        for s in sentences(seed):
+            if size >= limit:
+                break
+            sep = "\n\n" if n % 5 == 4 else " "
+            size += f.write(s.sentence + sep)
+            n += 1
+    return n
+
+
+def _run(path: str, fn) -> tuple[int, float]:
+    start = time.perf_counter()
+    with open(path, encoding="utf-8") as f:
+        n = fn(read_chunks(f))
+    return n, time.perf_counter() - start
+
+
+def _peak_kib(path: str, fn) -> float:
+    tracemalloc.start()
+    with open(path, encoding="utf-8") as f:
+        fn(read_chunks(f))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def _accuracy(path: str, seed: int) -> tuple[int, float]:
+    n = right = 0
+    with open(path, encoding="utf-8") as f:
+        for tagged, sample in zip(tag_text(read_chunks(f)), sentences(seed)):
+            n += 1
+            right += tagged.tense_key == sample.tense_key
+    return n, right / n
+
+
+def chunking_mismatches(texts: list[str], limits: tuple) -> tuple[int, list[str]]:
+    """(số cách chia đã thử, mô tả các cách chia cho kết quả khác khi đưa cả văn bản một lần)."""
+    tried, bad = 0, []
+    for text in texts:
+        for limit in limits:
+            whole = list(split_sentences(text, limit))
+            splits = [[text[:i], text[i:]] for i in range(len(text) + 1)] + [list(text)]
+            for chunks in splits:
+                tried += 1
+                if list(split_sentences(chunks, limit)) != whole:
+                    where = "từng ký tự" if len(chunks) > 2 else f"{chunks[0][-12:]!r} | {chunks[1][:12]!r}"
+                    bad.append(f"max_chars={limit}: {where}")
+    return tried, bad
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mb", type=float, default=2.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--check", action="store_true", help="thoát mã 1 nếu cách chia khúc làm đổi kết quả")
+    args = ap.parse_args(argv)
+
+    split_only = lambda chunks: sum(1 for _ in split_sentences(chunks))
+    split_tag = lambda chunks: sum(1 for _ in tag_text(chunks))
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'cỡ':>7} {'câu':>9} {'bước':<14} {'câu/giây':>10} {'MB/giây':>8} {'bộ nhớ đỉnh':>12}")
+        for mb in (args.mb, 4 * args.mb):
+            path = os.path.join(tmp, f"essay-{mb}.txt")
+            count = write_essay(path, mb, args.seed)
+            real_mb = os.path.getsize(path) / 1e6
+            for label, fn in (("tách câu", split_only), ("tách + gắn thì", split_tag)):
+                n, elapsed = _run(path, fn)
+                assert n == count, (n, count)
+                peak = _peak_kib(path, fn)
+                print(f"{real_mb:>5.1f}MB {count:>9,} {label:<14} {n / elapsed:>10,.0f} "
+                      f"{real_mb / elapsed:>8.2f} {peak:>9,.0f} KiB")
+        n, accuracy = _accuracy(os.path.join(tmp, f"essay-{args.mb}.txt"), args.seed)
+        print(f"\nđoán đúng thì: {accuracy:.1%} ({n:,} câu)")
+
+    tried, bad = chunking_mismatches(CHUNK_SAMPLES, CHUNK_LIMITS)
+    print(f"tách theo khúc: {tried:,} cách chia, {len(bad)} cách cho kết quả khác")
+    for line in bad[:10]:
+        print(f"  KHÁC {line}")
+    return 1 if args.check and bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
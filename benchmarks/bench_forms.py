@@ -0,0 +1,96 @@
+"""
+Số lần rerun và CPU của server cho MỘT bài hoàn chỉnh (mọi ô công thức, cách dùng,
+dấu hiệu, ví dụ của một thì), ở hai chế độ của app:
+- từng dòng: gõ xong một ô là một rerun (Enter/rời ô), bấm "Kiểm tra" thêm một rerun
+- cả phần: ô nằm trong st.form nên gõ không rerun; mỗi phần một lần bấm "Chấm cả phần"
+
+Mỗi ô được điền đúng đáp án (câu ví dụ lấy từ `grader.corpus`), rồi chấm như học
+sinh thật. CPU là thời gian CPU của luồng chạy script (`time.thread_time`, đo
+ngay trong script), cộng qua mọi lần rerun của bài; không tính lần tải trang đầu.
+
+Chạy: python -m benchmarks.bench_forms [--tense present_simple] [--rounds 5]
+"""
+import argparse
+import os
+import statistics
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_rerun import TIMER_KEY, _timed_copy
+from grader import FORMS, TENSE_NAMES, TENSES_BY_KEY, group_key
+from grader.corpus import generate
+
+
+def answers_for(tense_key: str) -> dict[str, dict[str, str]]:
+    """Đáp án đúng của mọi ô, theo phần: {section: {khoá ô: câu trả lời}}."""
+    tense = TENSES_BY_KEY[tense_key]
+    examples = {}
+    for s in generate(0, 20_000):
+        if s.tense_key == tense_key and s.expected:
+            examples.setdefault((s.group, s.form), s.sentence)
+    return {
+        "formula": {f"formula-{tense_key}-{group}-{form}": correct
+                    for group, formulas in tense.summary.items() for form, correct in formulas.items()},
+        "use": {f"use-{tense_key}-{i}": use for i, use in enumerate(tense.uses, 1)},
+        "signal": {f"sig-{tense_key}-{i}": sig for i, sig in enumerate(tense.signals, 1)},
+        "example": {f"ex-{tense_key}-{group_key(group)}-{form}": examples.get((group_key(group), form), "")
+                    for group in tense.summary for form in FORMS},
+    }
+
+
+def run_exercise(path: str, tense_key: str, batch: bool) -> tuple[int, float, int]:
+    """(số rerun, giây CPU, số ô đúng) cho một bài hoàn chỉnh."""
+    at = AppTest.from_file(path, default_timeout=30).run()
+    at.toggle(key="batch-mode").set_value(batch)
+    at.selectbox[0].select(TENSE_NAMES[tense_key]).run()   # tải trang, chưa tính
+    reruns, cpu, right = 0, 0.0, 0
+
+    def rerun(element):
+        nonlocal reruns, cpu
+        element.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        reruns += 1
+        cpu += at.session_state[TIMER_KEY]
+
+    for section, answers in answers_for(tense_key).items():
+        if batch:
+            for key, answer in answers.items():
+                at.text_input(key=key).input(answer)
+            rerun(at.button(key=f"btn-form-{section}-{tense_key}").click())
+            right += len(at.success)
+        else:
+            for key, answer in answers.items():
+                rerun(at.text_input(key=key).input(answer))
+                rerun(at.button(key=f"btn-{key}").click())
+                right += len(at.success)
+    return reruns, cpu, right
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default="app.py")
+    ap.add_argument("--tense", default="present_simple", choices=sorted(TENSES_BY_KEY))
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    total = sum(len(a) for a in answers_for(args.tense).values())
+    path = _timed_copy(args.app, clock="thread_time")
+    try:
+        print(f"{args.tense}: {total} ô")
+        print(f"{'chế độ':<10} {'rerun':>6} {'CPU/bài ms':>11} {'CPU/rerun ms':>13} {'ô đúng':>7}")
+        results = {}
+        for label, batch in (("từng dòng", False), ("cả phần", True)):
+            runs = [run_exercise(path, args.tense, batch) for _ in range(args.rounds)]
+            reruns, right = runs[0][0], runs[0][2]
+            cpu = statistics.median(r[1] for r in runs)
+            results[label] = (reruns, cpu)
+            print(f"{label:<10} {reruns:>6} {cpu * 1e3:>11.1f} {cpu / reruns * 1e3:>13.2f} {right:>4}/{total}")
+        (r0, c0), (r1, c1) = results.values()
+        print(f"\ncả phần so với từng dòng: rerun ÷{r0 / r1:.1f}, CPU ÷{c0 / c1:.1f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
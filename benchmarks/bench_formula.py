@@ -0,0 +1,69 @@
+"""
+`formula_ok` theo văn phạm ô (grader.formula) so với bản dò từ khoá cũ, trên bộ công
+thức có nhãn của `benchmarks.suite` (cách viết tương đương: đúng; công thức của dạng
+khác, bỏ "not", V2 thay V3, V thay V-ing: sai).
+
+In tốc độ (ns mỗi lần gọi, hai bản chạy xen kẽ trong mỗi vòng), độ chính xác, các
+ca hai bản chấm khác nhau, và chẩn đoán (`check_formula`) cho các câu sai: mỗi
+loại lỗi bao nhiêu ca, vài ví dụ.
+
+Chạy: python -m benchmarks.bench_formula [--rounds 7]
+"""
+import argparse
+import time
+from collections import Counter
+
+from grader import formula_ok
+from grader.formula import check_formula
+
+from .legacy import legacy_formula_ok
+from .suite import formula_cases
+
+
+def _ns_per_call(fns: dict, argses, rounds: int, min_seconds: float = 0.05) -> dict[str, float]:
+    clock = time.perf_counter
+    start = clock()
+    for args in argses:
+        legacy_formula_ok(*args)
+    passes = max(1, int(min_seconds / max(clock() - start, 1e-9)))
+    best = dict.fromkeys(fns, float("inf"))
+    for _ in range(rounds):
+        for label, fn in fns.items():
+            start = clock()
+            for _ in range(passes):
+                for args in argses:
+                    fn(*args)
+            best[label] = min(best[label], (clock() - start) / (passes * len(argses)))
+    return {label: t * 1e9 for label, t in best.items()}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rounds", type=int, default=7)
+    ap.add_argument("--examples", type=int, default=12, help="số ví dụ chẩn đoán in ra")
+    args = ap.parse_args(argv)
+
+    cases = formula_cases()
+    argses = [case.args for case in cases]
+    fns = {"cũ": legacy_formula_ok, "văn phạm": formula_ok.__wrapped__, "văn phạm + đo đạc": formula_ok}
+    ns = _ns_per_call(fns, argses, args.rounds)
+    print(f"{len(cases)} ca")
+    print(f"{'bản':<20} {'ns/lần':>9} {'chính xác':>10}")
+    for label, fn in fns.items():
+        right = sum(bool(fn(*c.args)) == c.expected for c in cases)
+        print(f"{label:<20} {ns[label]:>9,.0f} {right / len(cases):>9.1%}")
+
+    changed = [c for c in cases if bool(legacy_formula_ok(*c.args)) != formula_ok(*c.args)]
+    print(f"\n{len(changed)} ca hai bản chấm khác nhau (đúng theo nhãn: "
+          f"{sum(formula_ok(*c.args) == c.expected for c in changed)}/{len(changed)} là bản mới)")
+
+    wrong = [(c.args, check_formula(*c.args)) for c in cases if not c.expected]
+    print(f"\nchẩn đoán {len(wrong)} công thức sai:")
+    for problem, n in Counter(r.problem for _, r in wrong).most_common():
+        print(f"  {problem or '(không bắt được)':<16} {n}")
+    for (user, correct), r in wrong[:args.examples]:
+        print(f"  {user!r:<38} đáp án {correct!r:<36} -> {r.message}")
+
+
+if __name__ == "__main__":
+    main()
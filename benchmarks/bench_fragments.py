@@ -0,0 +1,106 @@
+"""
+Thời gian phía server cho mỗi tương tác: chạy lại cả trang (như trước khi có
+st.fragment) so với chỉ chạy lại fragment chứa nút/ô vừa dùng.
+
+AppTest (streamlit.testing.v1) luôn chạy lại cả script, kể cả khi widget nằm
+trong fragment, nên cả hai con số được đo trong cùng một lần chạy: bản sao của
+app bấm giờ cả script (như bench_rerun) và bấm giờ riêng thân từng hàm
+@st.fragment. Thời gian fragment chưa gồm phần việc cố định của Streamlit cho một
+lần chạy lại (gửi delta, khôi phục ngữ cảnh), vốn nhỏ so với chạy cả trang.
+
+Chạy: python -m benchmarks.bench_fragments [--rounds 20] [--app app.py]
+"""
+import argparse
+import os
+import statistics
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_forms import answers_for
+from benchmarks.bench_rerun import TIMER_KEY, _timed_copy
+
+FRAGMENT_KEY = "_bench_fragment_seconds"
+# bọc st.fragment để ghi thời gian thân từng fragment, theo tên hàm (+ tham số đầu)
+_FRAGMENT_TIMER = f"""
+import functools as _bench_functools
+import streamlit as _bench_st
+_bench_st.session_state[{FRAGMENT_KEY!r}] = {{}}
+_bench_fragment = getattr(_bench_st.fragment, "_bench_original", _bench_st.fragment)
+
+
+def _bench_timed_fragment(fn):
+    @_bench_functools.wraps(fn)
+    def timed(*args, **kwargs):
+        t0 = _bench_time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            name = fn.__name__ + (f":{{args[0]}}" if args and isinstance(args[0], str) else "")
+            _bench_st.session_state[{FRAGMENT_KEY!r}][name] = _bench_time.perf_counter() - t0
+    return _bench_fragment(timed)
+
+
+_bench_timed_fragment._bench_original = _bench_fragment
+_bench_st.fragment = _bench_timed_fragment
+"""
+TENSE_KEY = "present_simple"
+
+
+def interactions():
+    """(nhãn, chế độ chấm cả phần?, fragment xử lý, hàm thực hiện tương tác trên AppTest)."""
+    answers = answers_for(TENSE_KEY)
+    first_formula = next(iter(answers["formula"]))
+
+    def fill_and_submit(section):
+        def act(at):
+            for key, answer in answers[section].items():
+                at.text_input(key=key).input(answer)
+            return at.button(key=f"btn-form-{section}-{TENSE_KEY}").click()
+        return act
+
+    def auto_detect(at):
+        at.toggle(key="auto-detect").set_value(True).run()
+        at.text_input(key="auto-detect-in").input("She has not finished her homework yet.")
+        return at.button(key="btn-auto-detect").click()
+
+    yield "gõ một ô (từng dòng)", False, "grade_section:formula", \
+        lambda at: at.text_input(key=first_formula).input(answers["formula"][first_formula])
+    yield "Kiểm tra một dòng", False, "grade_section:formula", \
+        lambda at: at.button(key=f"btn-{first_formula}").click()
+    for section in answers:
+        yield f"Chấm cả phần {section}", True, f"grade_section:{section}", fill_and_submit(section)
+    yield "tra ngược dấu hiệu", True, "signal_lookup", lambda at: at.text_input(key="sig-lookup-in").input("alway")
+    yield "nhận diện thì", True, "auto_detect", auto_detect
+
+
+def measure(path: str, batch: bool, act, fragment: str, rounds: int) -> tuple[float, float]:
+    at = AppTest.from_file(path, default_timeout=30).run()
+    at.toggle(key="batch-mode").set_value(batch).run()
+    page, frag = [], []
+    for _ in range(rounds):
+        act(at).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        page.append(at.session_state[TIMER_KEY])
+        frag.append(at.session_state[FRAGMENT_KEY][fragment])
+    return statistics.median(page), statistics.median(frag)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default="app.py")
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    path = _timed_copy(args.app, extra=_FRAGMENT_TIMER)
+    try:
+        print(f"{'tương tác':<24} {'fragment':<22} {'cả trang ms':>11} {'fragment ms':>12} {'nhanh hơn':>9}")
+        for label, batch, fragment, act in interactions():
+            page, frag = measure(path, batch, act, fragment, args.rounds)
+            print(f"{label:<24} {fragment:<22} {page * 1e3:>11.2f} {frag * 1e3:>12.2f} {page / frag:>8.1f}x")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark từ điển động từ: thời gian nạp, bộ nhớ, và chi phí nhận diện V2/V3.
+
+So sánh cách tra cũ (quét tuyến tính `any(w in s.split() for w in V3_SET)`, tách
+lại câu cho mỗi động từ) với một lần tra dict cho mỗi từ của câu, cả với danh
+sách 39 động từ cũ lẫn toàn bộ các dạng trong từ điển mới.
+
+Chạy: python -m benchmarks.bench_lexicon [--repeat 5] [--number 20]
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from grader.lexicon import LEXICON, V3, V3_SET, load_lexicon
+from grader.text import normalize
+
+from .bench_rules import SENTENCES
+from .legacy import V3_SET as LEGACY_V3_SET, norm as legacy_norm
+
+
+def linear_scan(forms):
+    def has_v3(sentence: str) -> bool:
+        s = legacy_norm(sentence)
+        return any(w in s.split() for w in forms)
+    return has_v3
+
+
+def indexed(sentence: str) -> bool:
+    tags = LEXICON.tags
+    return any(tags(w) & V3 for w in normalize(sentence).tokens)
+
+
+def _measure_load(repeat: int):
+    best = min(timeit.repeat(load_lexicon, repeat=repeat, number=1))
+    tracemalloc.start()
+    lexicon = load_lexicon()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return lexicon, best, current, peak
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--number", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    lexicon, load_s, current, peak = _measure_load(args.repeat)
+    print(f"từ điển: {len(lexicon)} dạng bề mặt, nạp {load_s * 1e3:.1f} ms, "
+          f"bộ nhớ {current / 1024:.0f} KiB (đỉnh khi nạp {peak / 1024:.0f} KiB)")
+
+    every_v3 = sorted(V3_SET | {f for f in LEXICON.index if LEXICON.tags(f) & V3})
+    contenders = (
+        (f"quét {len(LEGACY_V3_SET)} dạng V3 cũ", linear_scan(sorted(LEGACY_V3_SET))),
+        (f"quét {len(every_v3)} dạng V3 mới", linear_scan(every_v3)),
+        ("tra dict mỗi từ", indexed),
+    )
+    for name, fn in contenders:
+        t = min(timeit.repeat(lambda: [fn(s) for s in SENTENCES], repeat=args.repeat, number=args.number))
+        hits = sum(map(fn, SENTENCES))
+        print(f"{name:<24} {t / (args.number * len(SENTENCES)) * 1e6:8.2f} µs/câu   "
+              f"câu có V3: {hits}/{len(SENTENCES)}")
+
+
+if __name__ == "__main__":
+    main()
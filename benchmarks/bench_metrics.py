@@ -0,0 +1,98 @@
+"""
+Chi phí của lớp đo đạc (`grader.metrics`): mỗi bộ chấm được gọi ở ba chế độ
+- gốc: hàm chưa bọc (`fn.__wrapped__`)
+- tắt: hàm đã bọc, đo đạc tắt (mặc định khi chạy thật)
+- bật: hàm đã bọc, đo đạc bật
+
+Chi phí khi tắt phải gần bằng không: một lần gọi hàm bọc + một phép kiểm tra cờ
+(dòng "(hàm rỗng)" cho thấy chi phí cố định đó, không lẫn với thời gian chấm).
+Cuối cùng là cả chuỗi `grade_rows` trên kho câu tổng hợp khi tắt và khi bật.
+
+Chạy: python -m benchmarks.bench_metrics [--rounds 9]
+"""
+import argparse
+import time
+
+from grader import (TENSES_BY_KEY, any_match, classify_tense, formula_ok, grade_rows, metrics, norm, usage_ok,
+                    validate_example)
+from grader.corpus import as_rows, generate
+
+USES = TENSES_BY_KEY["present_simple"].uses
+PATTERNS = [r"\bnow\b", r"\bat the moment\b", r"\bevery day\b"]
+def _noop(x):
+    return x
+
+
+CASES = {
+    # chi phí cố định của hàm bọc, không lẫn với thời gian chấm
+    "(hàm rỗng)": (metrics.timed("noop")(_noop), [(1,)]),
+    "norm": (norm, [("  Don’t   STOP!!  ",), ("S + have/has + not + V3",), ("She goes to school every day.",)]),
+    "formula_ok": (formula_ok, [("S + V(s/es)", "S + V(s/es)"), ("S + have + V2", "S + have/has + V3")]),
+    "any_match": (any_match, [("I am reading now.", PATTERNS), ("I go every day.", PATTERNS)]),
+    "usage_ok": (usage_ok, [("thói quen", USES), ("Habits, general truths", USES)]),
+    "validate_example": (validate_example, [
+        ("present_perfect", "verb", "Phủ định", "She has not finished her homework yet."),
+        ("past_simple", "verb", "Khẳng định", "I went to school yesterday."),
+    ]),
+    "classify_tense": (classify_tense, [("She has not finished her homework yet.",), ("Will you be working?",)]),
+}
+
+
+def _ns_per_call(variants: dict, argses, rounds: int, min_seconds: float = 0.05) -> dict[str, float]:
+    """ns mỗi lần gọi của từng chế độ; các chế độ chạy xen kẽ trong mỗi vòng để nhiễu của máy chia đều."""
+    clock = time.perf_counter
+    fn = next(iter(variants.values()))[0]
+    start = clock()
+    for args in argses:
+        fn(*args)
+    passes = max(1, int(min_seconds / max(clock() - start, 1e-9)))
+    best = dict.fromkeys(variants, float("inf"))
+    for _ in range(rounds):
+        for label, (fn, enabled) in variants.items():
+            _mode(enabled)
+            start = clock()
+            for _ in range(passes):
+                for args in argses:
+                    fn(*args)
+            best[label] = min(best[label], (clock() - start) / (passes * len(argses)))
+    return {label: t * 1e9 for label, t in best.items()}
+
+
+def _mode(enabled: bool) -> None:
+    if enabled:
+        metrics.enable()
+    else:
+        metrics.disable()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rounds", type=int, default=9)
+    ap.add_argument("-n", "--count", type=int, default=20_000, help="số câu cho phép đo grade_rows")
+    args = ap.parse_args(argv)
+    was_enabled = metrics.enabled
+
+    print(f"{'bộ chấm':<17} {'gốc ns':>9} {'tắt ns':>9} {'thêm khi tắt':>14} {'bật ns':>9} {'thêm khi bật':>14}")
+    for name, (fn, argses) in CASES.items():
+        t = _ns_per_call({"gốc": (fn.__wrapped__, False), "tắt": (fn, False), "bật": (fn, True)},
+                         argses, args.rounds)
+        raw, off, on = t["gốc"], t["tắt"], t["bật"]
+        print(f"{name:<17} {raw:>9,.0f} {off:>9,.0f} {off - raw:>+8,.0f} ({(off - raw) / raw:>+5.1%})"
+              f" {on:>9,.0f} {on - raw:>+8,.0f} ({(on - raw) / raw:>+5.1%})")
+
+    rows = list(as_rows(generate(0, args.count)))
+    best = {"tắt": float("inf"), "bật": float("inf")}
+    for _ in range(args.rounds):
+        for label in best:
+            _mode(label == "bật")
+            start = time.perf_counter()
+            for _ in grade_rows(rows):
+                pass
+            best[label] = min(best[label], time.perf_counter() - start)
+    print(f"\ngrade_rows ({len(rows):,} câu): tắt {len(rows) / best['tắt']:,.0f} câu/giây, "
+          f"bật {len(rows) / best['bật']:,.0f} câu/giây ({best['bật'] / best['tắt'] - 1:+.1%})")
+    _mode(was_enabled)
+    metrics.reset()
+
+if __name__ == "__main__":
+    main()
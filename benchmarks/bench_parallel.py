@@ -0,0 +1,46 @@
+"""
+Chấm song song (`grade_rows_parallel`) so với một tiến trình (`grade_rows`) trên
+kho câu tổng hợp, với 1/2/4/8 tiến trình và vài cỡ khối.
+
+Kết quả song song phải trùng từng dòng (cả thứ tự) với bản một tiến trình. Tăng
+tốc không vượt quá số lõi CPU thật của máy (in ở dòng đầu).
+
+Chạy: python -m benchmarks.bench_parallel [-n 200000] [--workers 1 2 4 8] [--chunk-size 500 2000]
+"""
+import argparse
+import os
+import time
+
+from grader import grade_rows, grade_rows_parallel
+from grader.corpus import as_rows, generate
+
+
+def _timed(fn) -> tuple[list[dict], float]:
+    start = time.perf_counter()
+    result = list(fn())
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", "--count", type=int, default=200_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--chunk-size", type=int, nargs="+", default=[500, 2000])
+    args = ap.parse_args(argv)
+
+    rows = list(as_rows(generate(args.seed, args.count)))
+    print(f"{len(rows):,} câu, {os.cpu_count()} CPU")
+
+    expected, base = _timed(lambda: grade_rows(rows))
+    print(f"{'một tiến trình':<24} {base:>7.2f} s {len(rows) / base:>10,.0f} câu/giây")
+    for chunk_size in args.chunk_size:
+        for workers in args.workers:
+            got, elapsed = _timed(lambda: grade_rows_parallel(rows, workers, chunk_size))
+            same = "" if got == expected else "  KHÁC kết quả một tiến trình!"
+            print(f"{workers} tiến trình, khối {chunk_size:<6} {elapsed:>7.2f} s {len(rows) / elapsed:>10,.0f} câu/giây"
+                  f"  x{base / elapsed:.2f}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Lịch ôn ngắt quãng (`grader.practice.Schedule`) trên ngân hàng thẻ lớn.
+
+So với cách làm thẳng: trạng thái mỗi thẻ là một dict, thẻ kế tiếp tìm bằng cách
+quét hết các thẻ (cùng quy tắc chọn: thẻ quá hạn lâu nhất, rồi thẻ mới, rồi thẻ
+gần hạn nhất). Mỗi lượt là chọn một thẻ rồi chấm (đúng với xác suất --ok).
+
+In µs mỗi lượt chọn + chấm khi ngân hàng thẻ lớn dần (heap: gần như không đổi,
+quét: tăng tuyến tính), và bộ nhớ lịch của một học sinh, cả cho ngân hàng thẻ
+thật (12 thì) lẫn --students học sinh giữ cùng lúc trong một tiến trình.
+
+Chạy: python -m benchmarks.bench_practice [--sizes 1000 10000 100000] [--students 5000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from grader.practice import FIRST, RELEARN, SECOND, START_EASE, Card, CardBank, Schedule, card_bank
+
+NOW = 1_700_000_000
+
+
+def synthetic_bank(n: int) -> CardBank:
+    cards = tuple(Card(f"card-{i}", "present_simple", "signal", f"Thẻ {i}", {}) for i in range(n))
+    return CardBank(f"synthetic-{n}", cards, {card.key: i for i, card in enumerate(cards)})
+
+
+class DictSchedule:
+    """Cách làm thẳng: một dict trạng thái mỗi thẻ, chọn thẻ bằng cách quét hết."""
+
+    def __init__(self, bank: CardBank):
+        self.cards = {card.key: {"due": 0, "interval": 0, "ease": START_EASE, "streak": 0, "lapses": 0, "seen": False}
+                      for card in bank.cards}
+
+    def next(self, now: float) -> str:
+        seen = [(s["due"], key) for key, s in self.cards.items() if s["seen"]]
+        overdue = min(seen, default=None)
+        if overdue and overdue[0] <= now:
+            return overdue[1]
+        new = next((key for key, s in self.cards.items() if not s["seen"]), None)
+        return new if new is not None else overdue[1]
+
+    def review(self, key: str, ok: bool, now: float) -> None:
+        s = self.cards[key]
+        if ok:
+            s["streak"] += 1
+            interval = FIRST if s["streak"] == 1 else SECOND if s["streak"] == 2 else s["interval"] * s["ease"] // 100
+            s["ease"] = min(s["ease"] + 5, 350)
+        else:
+            s["streak"], s["lapses"], s["ease"] = 0, s["lapses"] + 1, max(s["ease"] - 20, 130)
+            interval = RELEARN
+        s["interval"], s["due"], s["seen"] = interval, int(now) + interval, True
+
+
+def simulate(schedule, steps: int, ok_rate: float, seed: int = 0) -> float:
+    """µs mỗi lượt chọn + chấm."""
+    rng, now = random.Random(seed), NOW
+    start = time.perf_counter()
+    for _ in range(steps):
+        card = schedule.next(now)
+        schedule.review(card, rng.random() < ok_rate, now)
+        now += 20
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def warm(schedule, reviews: int, ok_rate: float, seed: int = 0):
+    """Lịch của một học sinh đã học được một thời gian (có thẻ đã gặp, thẻ mới, thẻ sai)."""
+    rng = random.Random(seed)
+    simulate(schedule, reviews, ok_rate, seed=rng.randrange(1 << 30))
+    return schedule
+
+
+def _peak_bytes(build) -> tuple[int, object]:
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--steps", type=int, default=2_000, help="số lượt đo mỗi cỡ (cách quét: tối đa 200)")
+    ap.add_argument("--ok", type=float, default=0.8)
+    ap.add_argument("--students", type=int, default=5_000)
+    args = ap.parse_args(argv)
+
+    print(f"{'số thẻ':>8} {'heap µs/lượt':>13} {'quét µs/lượt':>13} {'heap B/thẻ':>11} {'dict B/thẻ':>11}")
+    for n in args.sizes:
+        bank = synthetic_bank(n)
+        # lịch đã học một nửa ngân hàng thẻ: heap lớn, vẫn còn thẻ mới
+        heap_mem, heap = _peak_bytes(lambda: warm(Schedule(bank), n // 2, args.ok))
+        dict_mem, naive = _peak_bytes(lambda: DictSchedule(bank))
+        heap_us = simulate(heap, args.steps, args.ok, seed=1)
+        warm(naive, min(n // 2, 2_000), args.ok)
+        naive_us = simulate(naive, min(args.steps, 200), args.ok, seed=1)
+        print(f"{n:>8,} {heap_us:>13.1f} {naive_us:>13.1f} {heap_mem / n:>11.1f} {dict_mem / n:>11.1f}")
+
+    bank = card_bank()
+    rng = random.Random(0)
+    mem, schedules = _peak_bytes(lambda: [warm(Schedule(bank), rng.randrange(20, 200), args.ok, seed=i)
+                                          for i in range(args.students)])
+    print(f"\nngân hàng thẻ thật: {len(bank.cards)} thẻ; {args.students:,} học sinh giữ trong bộ nhớ: "
+          f"{mem / 1e6:.1f} MB ({mem / args.students / 1024:.1f} KiB/học sinh, "
+          f"mảng trạng thái {schedules[0].nbytes} B)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark kho tiến độ (`grader.progress`): ghi qua hàng đợi + luồng nền theo lô so
+với cách làm thẳng (mỗi lần bấm mở kết nối, INSERT, COMMIT).
+
+Báo cáo:
+- độ trễ `record()` mà một lần bấm phải chờ (p50/p99) và số dòng ghi xong/giây
+- cùng số đó khi nhiều phiên (luồng) ghi song song, kèm độ trễ truy vấn
+  `attempts()` / `last_answers()` chạy cùng lúc
+- số dòng/giây của cách ghi từng dòng, để so
+
+Chạy: python -m benchmarks.bench_progress [-n 20000] [--sessions 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from grader.progress import SCHEMA, ProgressStore, connect
+
+TENSE_KEYS = ("present_simple", "past_simple", "present_perfect", "future_simple")
+FORMS = ("Khẳng định", "Phủ định", "Nghi vấn")
+
+
+def _attempt(rng: random.Random, student: str) -> tuple:
+    tense_key, form = rng.choice(TENSE_KEYS), rng.choice(FORMS)
+    return (student, tense_key, "example", f"ex-{tense_key}-verb-{form}", "She has gone to school.",
+            rng.random() < 0.7, form)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def bench_store(path: str, n: int, sessions: int) -> None:
+    store = ProgressStore(path)
+    rng = random.Random(0)
+    rows = [_attempt(rng, f"hs{rng.randrange(1000)}") for _ in range(n)]
+
+    latencies = []
+    start = time.perf_counter()
+    for row in rows:
+        t0 = time.perf_counter()
+        store.record(*row[:6], form=row[6])
+        latencies.append(time.perf_counter() - t0)
+    store.flush()
+    elapsed = time.perf_counter() - start
+    print(f"1 phiên:   record p50 {_percentile(latencies, 0.5) * 1e6:6.1f} µs, "
+          f"p99 {_percentile(latencies, 0.99) * 1e6:6.1f} µs; {n / elapsed:>9,.0f} dòng ghi xong/giây")
+
+    # nhiều phiên ghi song song, vài luồng đọc chạy cùng lúc
+    per_session = max(1, n // sessions)
+    latencies, query_latencies = [], []
+    stop = threading.Event()
+
+    def session(k: int):
+        local = random.Random(k)
+        mine = []
+        for _ in range(per_session):
+            row = _attempt(local, f"hs{k}")
+            t0 = time.perf_counter()
+            store.record(*row[:6], form=row[6])
+            mine.append(time.perf_counter() - t0)
+        latencies.extend(mine)
+
+    def reader(k: int):
+        local = random.Random(-k)
+        while not stop.is_set():
+            student = f"hs{local.randrange(sessions)}"
+            t0 = time.perf_counter()
+            store.attempts(student, local.choice(TENSE_KEYS), local.choice(FORMS), limit=20)
+            store.last_answers(student)
+            query_latencies.append(time.perf_counter() - t0)
+
+    readers = [threading.Thread(target=reader, args=(k,)) for k in range(4)]
+    for t in readers:
+        t.start()
+    writers = [threading.Thread(target=session, args=(k,)) for k in range(sessions)]
+    written_before = store.written
+    start = time.perf_counter()
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    store.flush()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in readers:
+        t.join()
+    total = store.written - written_before
+    print(f"{sessions} phiên: record p50 {_percentile(latencies, 0.5) * 1e6:6.1f} µs, "
+          f"p99 {_percentile(latencies, 0.99) * 1e6:6.1f} µs; {total / elapsed:>9,.0f} dòng ghi xong/giây")
+    print(f"          truy vấn trong lúc ghi: p50 {_percentile(query_latencies, 0.5) * 1e6:.0f} µs, "
+          f"p99 {_percentile(query_latencies, 0.99) * 1e6:.0f} µs ({len(query_latencies):,} lần)")
+    print(f"          lỗi ghi: {store.errors}")
+    store.close()
+
+
+def bench_naive(path: str, n: int) -> None:
+    """Mỗi lần bấm: mở kết nối, INSERT, COMMIT (chờ đĩa ngay trong lượt rerun)."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+    rng = random.Random(0)
+    rows = [_attempt(rng, f"hs{rng.randrange(1000)}") for _ in range(n)]
+    start = time.perf_counter()
+    for student, tense_key, section, item, answer, ok, form in rows:
+        conn = connect(path)
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO attempts (student, tense_key, section, form, item, answer, ok, ts) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (student, tense_key, section, form, item, answer, ok, time.time()))
+        conn.execute("COMMIT")
+        conn.close()
+    elapsed = time.perf_counter() - start
+    print(f"ghi từng dòng (kết nối + commit mỗi lần): {elapsed / n * 1e6:.1f} µs/lần; {n / elapsed:>9,.0f} dòng/giây")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", "--count", type=int, default=20_000)
+    ap.add_argument("--sessions", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_store(os.path.join(tmp, "queued.sqlite3"), args.count, args.sessions)
+        bench_naive(os.path.join(tmp, "naive.sqlite3"), min(args.count, 2_000))
+
+
+if __name__ == "__main__":
+    main()
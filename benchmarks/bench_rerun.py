@@ -0,0 +1,69 @@
+"""
+Đo thời gian chạy script mỗi lần rerun của app Streamlit (streamlit.testing.v1.AppTest).
+
+Mỗi vòng chọn một thì, bấm một nút "Kiểm tra" rồi rerun, đúng như khi học sinh
+dùng app. Thời gian được đo ngay trong script (bản sao của app có thêm bộ bấm giờ
+ở đầu và cuối), vì thời gian tường của AppTest bị chi phối bởi vòng chờ của nó.
+Chạy với `--app` trỏ tới một bản app.py cũ để so sánh trước/sau, ví dụ:
+
+    git show <rev>:app.py > /tmp/app_old.py
+    python -m benchmarks.bench_rerun --app /tmp/app_old.py
+    python -m benchmarks.bench_rerun
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+from streamlit.testing.v1 import AppTest
+
+TIMER_KEY = "_bench_script_seconds"
+
+
+def _timed_copy(app_path: str, clock: str = "perf_counter", extra: str = "") -> str:
+    """Bản sao của app ghi thời gian (theo `time.<clock>`) của mỗi lần chạy vào session_state;
+    `extra` được chèn ngay sau đồng hồ, trước mã của app."""
+    with open(app_path, encoding="utf-8") as f:
+        source = f.read()
+    prologue = f"import time as _bench_time\n_bench_t0 = _bench_time.{clock}()\n{extra}"
+    epilogue = ("\nimport streamlit as _bench_st\n"
+                f"_bench_st.session_state[{TIMER_KEY!r}] = _bench_time.{clock}() - _bench_t0\n")
+    fd, path = tempfile.mkstemp(suffix=".py", prefix="bench_app_")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(prologue + source + epilogue)
+    return path
+
+
+def measure(app_path: str, reruns: int) -> list[float]:
+    path = _timed_copy(app_path)
+    try:
+        at = AppTest.from_file(path, default_timeout=30).run()  # lần chạy đầu: import, dựng cache
+        options = at.selectbox[0].options
+        times = []
+        for i in range(reruns):
+            at.selectbox[0].select(options[i % len(options)]).run()
+            times.append(at.session_state[TIMER_KEY])
+            at.button[0].click().run()
+            times.append(at.session_state[TIMER_KEY])
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+        return times
+    finally:
+        os.remove(path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default="app.py")
+    ap.add_argument("--reruns", type=int, default=60)
+    args = ap.parse_args(argv)
+
+    times = sorted(measure(args.app, args.reruns))
+    print(f"{args.app}: {len(times)} rerun, "
+          f"trung bình {statistics.mean(times) * 1e3:.2f} ms, "
+          f"p50 {times[len(times) // 2] * 1e3:.2f} ms, "
+          f"p90 {times[int(len(times) * 0.9)] * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Microbenchmark: bảng luật biên dịch sẵn so với chuỗi if/elif cũ của `validate_example`.
+
+Chạy: python -m benchmarks.bench_rules [--repeat 5] [--number 5]
+
+Ngoài trường hợp thường, benchmark còn chạy kịch bản "re cache churn": xen giữa
+các lần chấm là các regex khác (như khi nhiều phiên/thư viện cùng dùng `re`),
+làm bộ nhớ đệm nội bộ của `re` bị xoá và bản cũ phải biên dịch lại mẫu. Các
+regex xen vào nằm ngoài phần đo: đồng hồ chỉ bấm quanh từng lần chấm, nên số
+µs/câu chỉ gồm phần chấm.
+
+Các khác biệt so với bản cũ được liệt kê để xem lại: từ khi có từ điển động từ
+đầy đủ, bản mới nhận thêm các dạng V2/V3 bất quy tắc mà danh sách 39 động từ cũ
+không có (built, bought...), nên khác biệt không còn là lỗi.
+"""
+import argparse
+import re
+import time
+import timeit
+
+from grader import FORMS, validate_example
+from grader.rules import GROUPS
+
+from .legacy import legacy_validate_example
+
+TENSE_KEYS = [
+    "present_simple", "present_continuous", "present_perfect", "present_perfect_continuous",
+    "past_simple", "past_continuous", "past_perfect", "past_perfect_continuous",
+    "future_simple", "future_continuous", "future_perfect", "future_perfect_continuous",
+]
+
+SENTENCES = [
+    "She goes to school every day.",
+    "He does not like coffee.",
+    "Do you play football?",
+    "I am a student.",
+    "They are not at home.",
+    "Is she your sister?",
+    "I am reading a book now.",
+    "She is not watching TV at the moment.",
+    "Are you listening to me?",
+    "I have finished my homework.",
+    "She has not seen that film yet.",
+    "Have you ever eaten sushi?",
+    "I have been waiting for two hours.",
+    "He has not been sleeping well lately.",
+    "Have you been studying all day?",
+    "We visited Hue last year.",
+    "I did not go to the party.",
+    "Did you call him yesterday?",
+    "It was cold yesterday.",
+    "They were not happy.",
+    "Were you at home last night?",
+    "I was cooking when he called.",
+    "They were not playing at 5 pm yesterday.",
+    "Was she sleeping when you came?",
+    "She had left before I arrived.",
+    "We had not finished by the time he came.",
+    "Had they eaten before the show?",
+    "I had been working there for five years.",
+    "He had not been feeling well.",
+    "Had you been waiting long?",
+    "I will help you tomorrow.",
+    "She will not come to the party.",
+    "Will you marry me?",
+    "I will be travelling at this time tomorrow.",
+    "They will not be working next Monday.",
+    "Will you be using the car tonight?",
+    "I will have finished the report by tomorrow.",
+    "She will not have arrived by 5 pm.",
+    "Will they have built the bridge by next year?",
+    "By June I will have been living here for ten years.",
+    "He will not have been working long.",
+    "Will you have been studying for three hours by then?",
+]
+
+CASES = [
+    (tense_key, group, form, sent)
+    for tense_key in TENSE_KEYS
+    for group in GROUPS
+    for form in FORMS
+    for sent in SENTENCES
+]
+
+
+def _check_same():
+    mismatches = 0
+    for case in CASES:
+        new_ok, new_hint = validate_example(*case)
+        old_ok, old_hint = legacy_validate_example(*case)
+        if bool(new_ok) != bool(old_ok) or new_hint != old_hint:
+            mismatches += 1
+            print("KHÁC", case, (new_ok, new_hint), (bool(old_ok), old_hint))
+    return mismatches
+
+
+# mỗi mẫu là một chuỗi mới -> đẩy các mẫu cũ ra khỏi cache của re
+CHURN = [f"churn{i}" for i in range(len(CASES))]
+
+
+def _run(fn):
+    def body():
+        for case in CASES:
+            fn(*case)
+    return body
+
+
+def _run_churn(fn, number: int) -> float:
+    """Giây của riêng các lần chấm; regex xen vào chạy ngoài đồng hồ."""
+    clock, total = time.perf_counter, 0.0
+    for _ in range(number):
+        for pattern, case in zip(CHURN, CASES):
+            re.search(pattern, "")
+            start = clock()
+            fn(*case)
+            total += clock() - start
+    return total
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--number", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    mismatches = _check_same()
+    print(f"{len(CASES)} trường hợp, {mismatches} khác biệt so với bản cũ")
+
+    for churn in (False, True):
+        label = "re cache churn" if churn else "thường"
+        best = {}
+        for name, fn in (("if/elif cũ", legacy_validate_example), ("bảng luật", validate_example)):
+            if churn:
+                t = min(_run_churn(fn, args.number) for _ in range(args.repeat))
+            else:
+                t = min(timeit.repeat(_run(fn), repeat=args.repeat, number=args.number))
+            best[name] = t
+            per_call = t / (args.number * len(CASES)) * 1e6
+            print(f"[{label:>14}] {name:<11} {per_call:8.2f} µs/câu")
+        print(f"[{label:>14}] tăng tốc x{best['if/elif cũ'] / best['bảng luật']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
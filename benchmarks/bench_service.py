@@ -0,0 +1,131 @@
+"""
+Load test cho `grader.service`: nhiều kết nối keep-alive cùng bắn yêu cầu vào
+localhost, báo cáo số yêu cầu/giây và độ trễ p50/p90/p99/max.
+
+Không có `--url` thì tự khởi động `python -m grader.service --port 0` (với
+`--workers`) rồi tắt khi xong. Yêu cầu là hỗn hợp bốn endpoint đơn lẻ với dữ
+liệu lấy từ kho câu tổng hợp; `--batch N` thì mỗi yêu cầu là một /batch N mục.
+
+Chạy: python -m benchmarks.bench_service [-n 20000] [-c 64] [--workers 4] [--batch 100]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from grader import TENSES
+from grader.corpus import generate
+
+
+def payloads(seed: int = 0) -> list[tuple[str, dict]]:
+    """Hỗn hợp (endpoint, body): câu ví dụ, công thức, cách dùng, dấu hiệu (có lỗi chính tả)."""
+    rng = random.Random(seed)
+    out = []
+    for s in generate(seed, 400):
+        out.append(("example", {"tense_key": s.tense_key, "group": s.group, "form": s.form,
+                                "sentence": s.sentence}))
+    for tense in TENSES.values():
+        for group, formulas in tense.summary.items():
+            for form, formula in formulas.items():
+                out.append(("formula", {"tense_key": tense.key, "form": form, "formula": formula.lower()}))
+        for use in tense.uses:
+            out.append(("usage", {"tense_key": tense.key, "text": use.split("(")[0]}))
+        for sig in tense.signals:
+            i = rng.randrange(len(sig))
+            out.append(("signal", {"tense_key": tense.key, "text": sig[:i] + sig[i + 1:]}))
+    rng.shuffle(out)
+    return out
+
+
+def _request(host: str, path: str, body: dict) -> bytes:
+    data = json.dumps(body, ensure_ascii=False).encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n").encode() + data
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = next(int(l.split(":", 1)[1]) for l in lines if l.lower().startswith("content-length:"))
+    await reader.readexactly(length)
+    return int(lines[0].split()[1])
+
+
+async def load(host: str, port: int, requests: list[bytes], concurrency: int) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    todo = iter(requests)
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for req in todo:   # các client cùng rút từ một iterator
+                t0 = time.perf_counter()
+                writer.write(req)
+                status = await _read_response(reader)
+                latencies.append(time.perf_counter() - t0)
+                errors += status >= 500
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def _start_server(workers: int | None) -> tuple[subprocess.Popen, str, int]:
+    cmd = [sys.executable, "-m", "grader.service", "--port", "0"]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()   # "đang chạy tại http://127.0.0.1:PORT"
+    url = urlsplit(line.split()[-1])
+    return proc, url.hostname, url.port
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", help="dịch vụ đang chạy, vd http://127.0.0.1:8765 (mặc định: tự khởi động)")
+    ap.add_argument("-n", "--requests", type=int, default=20_000)
+    ap.add_argument("-c", "--concurrency", type=int, default=64)
+    ap.add_argument("--workers", type=int, help="số tiến trình chấm khi tự khởi động dịch vụ (mặc định: số CPU)")
+    ap.add_argument("--batch", type=int, default=0, help="số mục mỗi yêu cầu /batch (0: yêu cầu đơn lẻ)")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        proc, host, port = _start_server(args.workers)
+    try:
+        mix = itertools.cycle(payloads())
+        if args.batch:
+            reqs = [_request(host, "/batch", {"items": [{"check": c, **b} for c, b in itertools.islice(mix, args.batch)]})
+                    for _ in range(args.requests)]
+        else:
+            reqs = [_request(host, f"/{c}", b) for c, b in itertools.islice(mix, args.requests)]
+        asyncio.run(load(host, port, reqs[:min(len(reqs), 500)], args.concurrency))   # khởi động
+        latencies, errors, elapsed = asyncio.run(load(host, port, reqs, args.concurrency))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1e3
+    items = len(latencies) * (args.batch or 1)
+    print(f"{len(latencies):,} yêu cầu, {args.concurrency} kết nối, "
+          f"{'batch ' + str(args.batch) if args.batch else 'đơn lẻ'}, lỗi 5xx: {errors}")
+    print(f"{len(latencies) / elapsed:,.0f} yêu cầu/giây ({items / elapsed:,.0f} lượt chấm/giây)")
+    print(f"độ trễ: p50 {pct(0.5):.2f} ms, p90 {pct(0.9):.2f} ms, p99 {pct(0.99):.2f} ms, max {latencies[-1] * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
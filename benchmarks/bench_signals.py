@@ -0,0 +1,114 @@
+"""
+Benchmark chấm "Dấu hiệu nhận biết": chỉ mục xoá-ký-tự (`SignalIndex`) so với quét
+tuyến tính tính khoảng cách tới mọi dấu hiệu, khi kho dấu hiệu lớn dần từ 12 thì
+thật lên hàng chục nghìn mục (thêm các cụm từ giả).
+
+Báo cáo thời gian dựng chỉ mục, độ trễ mỗi lần tra, và trên dấu hiệu thật: tỉ lệ
+nhận lại dấu hiệu bị gõ sai 1 lỗi (xoá/chèn/thay/đảo ký tự) và tỉ lệ nhận nhầm
+một từ tiếng Anh không phải dấu hiệu.
+
+Chạy: python -m benchmarks.bench_signals [--sizes 41 1000 10000]
+"""
+import argparse
+import random
+import string
+import time
+
+from grader import TENSES, norm
+from grader.fuzzy import MAX_DISTANCE, SignalIndex, allowed_distance, build_signal_index, osa_distance
+
+REAL = [(tense.key, sig) for tense in TENSES.values() for sig in tense.signals]
+# từ tiếng Anh thường gặp, không phải dấu hiệu: không được khớp
+NON_SIGNALS = (
+    "school friend happy garden teacher morning always home often mother sometimes window "
+    "because about table little large green yellow water money people family study quickly "
+    "not new how few far bus"
+).split()
+NON_SIGNALS = [w for w in NON_SIGNALS if w not in {norm(s) for _, s in REAL}]
+
+
+def bank(size: int, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    signals = list(REAL)
+    while len(signals) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        signals.append(("", " ".join(words)))
+    return signals
+
+
+def typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(len(word))
+    c = rng.choice(string.ascii_lowercase)
+    kind = rng.choice("dist" if len(word) > 1 else "is")
+    if kind == "d":
+        return word[:i] + word[i + 1:]
+    if kind == "i":
+        return word[:i] + c + word[i:]
+    if kind == "s":
+        return word[:i] + c + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def linear_best(forms: list[str], text: str) -> str | None:
+    """Quét tuyến tính: tính khoảng cách tới mọi dấu hiệu."""
+    text = norm(text)
+    best, best_d = None, MAX_DISTANCE + 1
+    for form in forms:
+        limit = min(MAX_DISTANCE, allowed_distance(form))
+        d = osa_distance(text, form, limit)
+        if d <= limit and d < best_d:
+            best, best_d = form, d
+    return best
+
+
+def _per_query_us(fn, queries: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+def accuracy(seed: int = 0) -> tuple[float, float, int]:
+    """(tỉ lệ nhận lại dấu hiệu gõ sai 1 lỗi, tỉ lệ nhận nhầm, số dấu hiệu được thử)."""
+    rng = random.Random(seed)
+    index = build_signal_index(TENSES)
+    # chỉ thử dấu hiệu đủ dài để được phép sai (từ 4 ký tự)
+    forms = [f for f in index.forms if allowed_distance(f) > 0]
+    hits = sum(
+        any(m.signal in index.forms[f] for m in index.lookup(typo(rng, f)))
+        for f in forms for _ in range(20)
+    )
+    false = sum(bool(index.lookup(w)) for w in NON_SIGNALS)
+    return hits / (20 * len(forms)), false / len(NON_SIGNALS), len(forms)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[len(REAL), 1000, 10000])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(1)
+    queries = [typo(rng, norm(sig)) for _, sig in REAL] + [norm(sig) for _, sig in REAL] + NON_SIGNALS
+
+    print(f"{'cỡ kho':>8} {'dựng chỉ mục':>13} {'quét tuyến tính':>16} {'chỉ mục':>11}")
+    for size in args.sizes:
+        signals = bank(size)
+        start = time.perf_counter()
+        index = SignalIndex(signals)
+        build_ms = (time.perf_counter() - start) * 1e3
+        forms = list(index.forms)
+        # quét tuyến tính chậm theo cỡ kho: giảm số lượt với kho lớn
+        old = _per_query_us(lambda q: linear_best(forms, q), queries, max(1, args.repeat * 50 // size))
+        new = _per_query_us(index.best, queries, args.repeat)
+        print(f"{len(index):>8,} {build_ms:>10.1f} ms {old:>13.1f} µs {new:>8.1f} µs")
+
+    recall, false_rate, n = accuracy()
+    print(f"\nnhận lại dấu hiệu gõ sai 1 lỗi: {recall:.1%} ({n} dấu hiệu × 20 lỗi ngẫu nhiên)")
+    print(f"nhận nhầm từ không phải dấu hiệu: {false_rate:.1%} ({len(NON_SIGNALS)} từ)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark chấm "Cách dùng": vòng lặp từ khoá cũ (`usage_ok` bản cũ) so với chỉ mục
+TF-IDF (`UsageIndex`), khi ngân hàng cách dùng lớn dần từ 12 thì thật lên hàng
+chục nghìn mục (thêm các cách dùng giả ghép từ ngẫu nhiên).
+
+Mỗi câu trả lời được chấm với toàn bộ ngân hàng: bản cũ phải duyệt hết, chỉ mục
+chỉ chạm các văn bản có chung từ, nên độ trễ gần như không đổi.
+
+Chạy: python -m benchmarks.bench_usage [--sizes 20 200 2000 20000]
+"""
+import argparse
+import random
+import time
+
+from grader import TENSES
+from grader.similarity import UsageIndex
+
+from .legacy import legacy_usage_ok
+
+REAL = [(tense.key, use) for tense in TENSES.values() for use in tense.uses]
+QUERIES = [use for _, use in REAL] + [
+    "thói quen", "Habits, general truths", "hành động đang xảy ra", "lịch trình", "this is wrong",
+    "duration up to now", "sự việc tạm thời", "hoàn thành trước một mốc tương lai",
+]
+_FILLER = (
+    "hành động sự việc thói quen kế hoạch thời điểm quá khứ tương lai hiện tại kéo dài lặp lại "
+    "dự định kinh nghiệm kết quả plan habit repeated event result moment future past period "
+    "ongoing finished schedule promise request prediction background interrupted sequence"
+).split()
+
+
+def bank(size: int, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    usages = list(REAL)
+    while len(usages) < size:
+        # một từ thông dụng + vài từ riêng: kho từ lớn dần theo ngân hàng như dữ liệu thật
+        words = [rng.choice(_FILLER)] + [f"từ{rng.randrange(size)}" for _ in range(rng.randint(3, 7))]
+        usages.append(("", " ".join(words)))
+    return usages
+
+
+def _per_query_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in QUERIES:
+            fn(q)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000, 20000])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    print(f"{'cỡ ngân hàng':>12} {'dựng chỉ mục':>13} {'vòng lặp cũ':>13} {'chỉ mục':>11}")
+    for size in args.sizes:
+        usages = bank(size)
+        start = time.perf_counter()
+        index = UsageIndex(usages)
+        build_ms = (time.perf_counter() - start) * 1e3
+        texts = [u for _, u in usages]
+        # bản cũ chậm tuyến tính: giảm số lượt với ngân hàng lớn
+        old = _per_query_us(lambda q: legacy_usage_ok(q, texts), max(1, args.repeat * 20 // size))
+        new = _per_query_us(index.best, args.repeat)
+        print(f"{len(index):>12,} {build_ms:>10.1f} ms {old:>10.1f} µs {new:>8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Bộ nhớ đệm kết quả chấm (`grader.verdicts`) khi cả lớp nộp cùng một bài.
+
+Mỗi học sinh làm đủ các ô của thì `--tense` (công thức, cách dùng, dấu hiệu, ví dụ).
+Phần lớn học sinh nộp cùng vài đáp án: với xác suất `--same` một ô là đáp án
+đúng chung của cả lớp (viết hoa/thường, khoảng trắng khác nhau), còn lại là một
+câu riêng (câu tổng hợp của `grader.corpus`, hoặc thêm một từ lạ). Cả lớp được
+chấm qua `grade_items` (như app và /batch), nhiều luồng song song như các phiên
+Streamlit, có và không có bộ nhớ đệm.
+
+In thời gian chấm cả lớp, µs mỗi ô, tỉ lệ trúng và số mục đang nhớ.
+
+Chạy: python -m benchmarks.bench_verdicts [--tense present_simple] [--students 40] [--same 0.8] [--threads 8]
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from grader import TENSES_BY_KEY, grade_items
+from grader.corpus import generate
+from grader.verdicts import verdict_cache
+
+from .bench_forms import answers_for
+
+
+def _vary(rng: random.Random, answer: str) -> str:
+    """Cùng đáp án, khác cách gõ (vẫn trùng khoá sau khi chuẩn hoá)."""
+    if rng.random() < 0.3:
+        answer = answer.lower()
+    return answer.replace(" ", "  ") if rng.random() < 0.2 else answer
+
+
+def submissions(tense_key: str, students: int, same: float, seed: int = 0) -> list[list[dict]]:
+    """Bài nộp của từng học sinh: danh sách mục {"check": ..., ...} cho `grade_items`."""
+    rng = random.Random(seed)
+    own = {}
+    for s in generate(seed, 5_000):
+        own.setdefault((s.tense_key, s.group, s.form), []).append(s.sentence)
+    answers = answers_for(tense_key)
+    papers = []
+    for _ in range(students):
+        items = []
+        for key, answer in answers["formula"].items():
+            _, _, group, form = key.split("-", 3)
+            text = _vary(rng, answer) if rng.random() < same else answer + " + V"
+            items.append({"check": "formula", "tense_key": tense_key, "group": group, "form": form, "formula": text})
+        for check, section in (("usage", "use"), ("signal", "signal")):
+            for answer in answers[section].values():
+                text = _vary(rng, answer) if rng.random() < same else f"{answer} {rng.randrange(10_000)}"
+                items.append({"check": check, "tense_key": tense_key, "text": text})
+        for key, answer in answers["example"].items():
+            _, _, group, form = key.split("-", 3)
+            if rng.random() >= same:
+                answer = rng.choice(own.get((tense_key, group, form)) or [answer])
+            items.append({"check": "example", "tense_key": tense_key, "group": group, "form": form,
+                          "sentence": _vary(rng, answer)})
+        papers.append(items)
+    return papers
+
+
+def grade_class(papers: list[list[dict]], threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(grade_items, papers))
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tense", default="present_simple", choices=sorted(TENSES_BY_KEY))
+    ap.add_argument("--students", type=int, default=40)
+    ap.add_argument("--same", type=float, default=0.8, help="tỉ lệ ô nộp đáp án chung của cả lớp")
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    papers = submissions(args.tense, args.students, args.same)
+    items = sum(len(p) for p in papers)
+    grade_class(papers[:2], 1)   # nạp assets, dịch văn phạm công thức
+    print(f"{args.students} học sinh, {items} ô, {args.threads} luồng")
+    print(f"{'bộ nhớ đệm':<12} {'cả lớp ms':>10} {'µs/ô':>7} {'trúng':>7} {'đang nhớ':>9}")
+    maxsize = verdict_cache.maxsize
+    for label, size in (("tắt", 0), ("bật", maxsize or 50_000)):
+        verdict_cache.maxsize = size
+        best = float("inf")
+        for _ in range(args.rounds):
+            verdict_cache.clear()    # mỗi vòng là một lớp mới: bắt đầu nguội
+            best = min(best, grade_class(papers, args.threads))
+        info = verdict_cache.cache_info()
+        ratio = info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0
+        print(f"{label:<12} {best * 1e3:>10.1f} {best / items * 1e6:>7.1f} {ratio:>7.1%} {info.currsize:>9}")
+    verdict_cache.maxsize = maxsize
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Bộ câu có nhãn cho bộ benchmark/độ chính xác (`benchmarks.suite`).
+
+EXAMPLES[(tense_key, group, form)] = (câu đúng, câu sai). Câu sai là lỗi học sinh
+hay mắc với đúng ô đó: thiếu/sai trợ động từ, quên "not", dùng V2 thay V3, sai
+dạng động từ... Các thì tiếp diễn/hoàn thành dùng chung luật cho hai nhóm nên
+chỉ gắn nhãn nhóm "verb".
+"""
+EXAMPLES = {
+    # ---- HIỆN TẠI ĐƠN
+    ("present_simple", "verb", "Khẳng định"): (
+        ["She goes to school every day.", "They play football on Sundays.",
+         "My father drinks coffee every morning.", "Water boils at 100 degrees."],
+        ["She is going to school now.", "They played football yesterday.",
+         "He will drink coffee.", "I have eaten breakfast."],
+    ),
+    ("present_simple", "verb", "Phủ định"): (
+        ["He does not like coffee.", "I do not know the answer.",
+         "We do not watch TV in the morning."],
+        ["He not like coffee.", "I did not know the answer.", "She likes coffee."],
+    ),
+    ("present_simple", "verb", "Nghi vấn"): (
+        ["Do you play football?", "Does she speak English?", "Do they live near here?"],
+        ["You play football?", "Did she speak English?", "Is she speak English?"],
+    ),
+    ("present_simple", "tobe", "Khẳng định"): (
+        ["I am a student.", "She is very kind.", "They are in the garden."],
+        ["I was a student.", "She were very kind.", "They be in the garden."],
+    ),
+    ("present_simple", "tobe", "Phủ định"): (
+        ["They are not at home.", "I am not tired.", "He is not a doctor."],
+        ["They not at home.", "I was not tired.", "He is a doctor."],
+    ),
+    ("present_simple", "tobe", "Nghi vấn"): (
+        ["Is she your sister?", "Are you ready?", "Am I late?"],
+        ["She is your sister?", "Was she your sister?", "Do you ready?"],
+    ),
+
+    # ---- HIỆN TẠI TIẾP DIỄN
+    ("present_continuous", "verb", "Khẳng định"): (
+        ["I am reading a book now.", "They are playing in the yard.",
+         "She is cooking dinner at the moment."],
+        ["I reading a book now.", "They are play in the yard.", "She was cooking dinner."],
+    ),
+    ("present_continuous", "verb", "Phủ định"): (
+        ["She is not watching TV at the moment.", "I am not sleeping.",
+         "They are not listening to the teacher."],
+        ["She not watching TV.", "I am not sleep.", "They were not listening to the teacher."],
+    ),
+    ("present_continuous", "verb", "Nghi vấn"): (
+        ["Are you listening to me?", "Is he working today?", "Am I speaking too fast?"],
+        ["You are listening to me?", "Are you listen to me?", "Was he working today?"],
+    ),
+
+    # ---- HIỆN TẠI HOÀN THÀNH
+    ("present_perfect", "verb", "Khẳng định"): (
+        ["I have finished my homework.", "She has bought a new car.",
+         "We have seen that film twice.", "He has written three letters."],
+        ["I finished my homework.", "She has buy a new car.", "We saw that film twice."],
+    ),
+    ("present_perfect", "verb", "Phủ định"): (
+        ["She has not seen that film yet.", "I have not bought the tickets.",
+         "They have not finished the project."],
+        ["She has not see that film yet.", "I did not buy the tickets.",
+         "They have finished the project."],
+    ),
+    ("present_perfect", "verb", "Nghi vấn"): (
+        ["Have you ever eaten sushi?", "Has she found her keys?", "Have they taken the bus?"],
+        ["Did you ever eat sushi?", "Have you ever eat sushi?", "You have found your keys?"],
+    ),
+
+    # ---- HIỆN TẠI HOÀN THÀNH TIẾP DIỄN
+    ("present_perfect_continuous", "verb", "Khẳng định"): (
+        ["I have been waiting for two hours.", "She has been studying since morning.",
+         "They have been living here for ten years."],
+        ["I have waiting for two hours.", "She has been study since morning.",
+         "They had been living here for ten years."],
+    ),
+    ("present_perfect_continuous", "verb", "Phủ định"): (
+        ["He has not been sleeping well lately.", "I have not been working today.",
+         "We have not been talking for long."],
+        ["He has been sleeping well lately.", "I have not working today.",
+         "We had not been talking for long."],
+    ),
+    ("present_perfect_continuous", "verb", "Nghi vấn"): (
+        ["Have you been studying all day?", "Has she been crying?",
+         "Have they been waiting long?"],
+        ["You have been studying all day?", "Have you studying all day?",
+         "Had she been crying?"],
+    ),
+
+    # ---- QUÁ KHỨ ĐƠN
+    ("past_simple", "verb", "Khẳng định"): (
+        ["We visited Hue last year.", "I bought a new phone yesterday.",
+         "She went to the market two days ago.", "They built a bridge in 2010."],
+        ["We visit Hue every year.", "I will buy a new phone.", "She is going to the market."],
+    ),
+    ("past_simple", "verb", "Phủ định"): (
+        ["I did not go to the party.", "She did not buy anything.",
+         "They did not read the letter."],
+        ["I did not went to the party.", "She not bought anything.",
+         "They do not read the letter."],
+    ),
+    ("past_simple", "verb", "Nghi vấn"): (
+        ["Did you call him yesterday?", "Did she finish her work?", "Did they see the film?"],
+        ["You called him yesterday?", "Do you call him?", "Were you call him yesterday?"],
+    ),
+    ("past_simple", "tobe", "Khẳng định"): (
+        ["It was cold yesterday.", "They were at school.", "I was tired last night."],
+        ["It is cold today.", "They are at school.", "I am tired."],
+    ),
+    ("past_simple", "tobe", "Phủ định"): (
+        ["They were not happy.", "She was not at home.", "I was not late."],
+        ["They are not happy.", "She not at home.", "I was late."],
+    ),
+    ("past_simple", "tobe", "Nghi vấn"): (
+        ["Were you at home last night?", "Was she angry?", "Was it expensive?"],
+        ["You were at home last night?", "Are you at home?", "Did she angry?"],
+    ),
+
+    # ---- QUÁ KHỨ TIẾP DIỄN
+    ("past_continuous", "verb", "Khẳng định"): (
+        ["I was cooking when he called.", "They were playing chess at 8 pm.",
+         "She was reading while I was sleeping."],
+        ["I cooked when he called.", "They are playing chess now.", "She was read a book."],
+    ),
+    ("past_continuous", "verb", "Phủ định"): (
+        ["They were not playing at 5 pm yesterday.", "I was not listening.",
+         "She was not driving fast."],
+        ["They were not play at 5 pm.", "I was listening.", "She is not driving fast."],
+    ),
+    ("past_continuous", "verb", "Nghi vấn"): (
+        ["Was she sleeping when you came?", "Were they working at noon?",
+         "Was he running in the park?"],
+        ["She was sleeping when you came?", "Was she sleep?", "Is he running in the park?"],
+    ),
+
+    # ---- QUÁ KHỨ HOÀN THÀNH
+    ("past_perfect", "verb", "Khẳng định"): (
+        ["She had left before I arrived.", "They had eaten dinner before the show.",
+         "He had bought the tickets by then."],
+        ["She has left already.", "They ate dinner before the show.", "He had buy the tickets."],
+    ),
+    ("past_perfect", "verb", "Phủ định"): (
+        ["We had not finished by the time he came.", "She had not seen him before.",
+         "They had not bought the house yet."],
+        ["We had finished by the time he came.", "She had not see him before.",
+         "They did not buy the house."],
+    ),
+    ("past_perfect", "verb", "Nghi vấn"): (
+        ["Had they eaten before the show?", "Had she left when you arrived?",
+         "Had you bought the gift?"],
+        ["They had eaten before the show?", "Had they eat before the show?",
+         "Did you buy the gift?"],
+    ),
+
+    # ---- QUÁ KHỨ HOÀN THÀNH TIẾP DIỄN
+    ("past_perfect_continuous", "verb", "Khẳng định"): (
+        ["I had been working there for five years.", "She had been crying before he came.",
+         "They had been waiting since noon."],
+        ["I have been working there for five years.", "She had been cry before he came.",
+         "They had waiting since noon."],
+    ),
+    ("past_perfect_continuous", "verb", "Phủ định"): (
+        ["He had not been feeling well.", "We had not been sleeping long.",
+         "She had not been studying hard."],
+        ["He had been feeling well.", "We have not been sleeping long.",
+         "She had not studying hard."],
+    ),
+    ("past_perfect_continuous", "verb", "Nghi vấn"): (
+        ["Had you been waiting long?", "Had she been working there?",
+         "Had they been living abroad?"],
+        ["You had been waiting long?", "Have you been waiting long?", "Had she working there?"],
+    ),
+
+    # ---- TƯƠNG LAI ĐƠN
+    ("future_simple", "verb", "Khẳng định"): (
+        ["I will help you tomorrow.", "She will call you soon.", "It will rain next week."],
+        ["I help you tomorrow.", "She will be calling you.", "It will have rained."],
+    ),
+    ("future_simple", "verb", "Phủ định"): (
+        ["She will not come to the party.", "I will not tell anyone.",
+         "They will not win the game."],
+        ["She will come to the party.", "I not tell anyone.", "They did not win the game."],
+    ),
+    ("future_simple", "verb", "Nghi vấn"): (
+        ["Will you marry me?", "Will it rain tomorrow?", "Shall we dance?"],
+        ["You will marry me?", "Do you marry me?", "Would it rain tomorrow?"],
+    ),
+
+    # ---- TƯƠNG LAI TIẾP DIỄN
+    ("future_continuous", "verb", "Khẳng định"): (
+        ["I will be travelling at this time tomorrow.", "She will be working at 9 am.",
+         "They will be sleeping when you arrive."],
+        ["I will travel tomorrow.", "She will be work at 9 am.", "They are sleeping now."],
+    ),
+    ("future_continuous", "verb", "Phủ định"): (
+        ["They will not be working next Monday.", "I will not be using the car.",
+         "She will not be staying long."],
+        ["They will be working next Monday.", "I will not use the car.",
+         "She will not be stay long."],
+    ),
+    ("future_continuous", "verb", "Nghi vấn"): (
+        ["Will you be using the car tonight?", "Will she be coming with us?",
+         "Will they be waiting for us?"],
+        ["You will be using the car tonight?", "Will you use the car tonight?",
+         "Will she be come with us?"],
+    ),
+
+    # ---- TƯƠNG LAI HOÀN THÀNH
+    ("future_perfect", "verb", "Khẳng định"): (
+        ["I will have finished the report by tomorrow.", "She will have left by noon.",
+         "They will have built the bridge by 2030."],
+        ["I will finish the report tomorrow.", "She will have leave by noon.",
+         "They have built the bridge."],
+    ),
+    ("future_perfect", "verb", "Phủ định"): (
+        ["She will not have arrived by 5 pm.", "I will not have finished by then.",
+         "They will not have bought the house by June."],
+        ["She will have arrived by 5 pm.", "I will not finish by then.",
+         "They will not have buy the house."],
+    ),
+    ("future_perfect", "verb", "Nghi vấn"): (
+        ["Will they have built the bridge by next year?", "Will you have finished by six?",
+         "Will she have left by then?"],
+        ["They will have built the bridge?", "Will you finish by six?",
+         "Will she have leave by then?"],
+    ),
+
+    # ---- TƯƠNG LAI HOÀN THÀNH TIẾP DIỄN
+    ("future_perfect_continuous", "verb", "Khẳng định"): (
+        ["By June I will have been living here for ten years.",
+         "She will have been teaching for 20 years.", "They will have been driving all night."],
+        ["I will have lived here for ten years.", "She will be teaching for 20 years.",
+         "They have been driving all night."],
+    ),
+    ("future_perfect_continuous", "verb", "Phủ định"): (
+        ["He will not have been working long.", "I will not have been waiting long.",
+         "They will not have been studying for an hour."],
+        ["He will have been working long.", "I will not have waited long.",
+         "They will not be studying for an hour."],
+    ),
+    ("future_perfect_continuous", "verb", "Nghi vấn"): (
+        ["Will you have been studying for three hours by then?",
+         "Will she have been working here for a year?", "Will they have been travelling long?"],
+        ["You will have been studying for three hours?", "Will you have studied for three hours?",
+         "Will she be working here?"],
+    ),
+}
@@ -0,0 +1,319 @@
+"""
+Bản cũ của `norm`/`any_match`/`usage_ok`/`validate_example` (chuỗi if/elif, biên dịch regex mỗi lần gọi)
+và `formula_ok` (dò từ khoá trong đáp án mỗi lần gọi, trước khi có văn phạm ô).
+
+Chỉ giữ lại để làm mốc so sánh tốc độ/kết quả trong các benchmark.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+from grader.text import has_word, normalize
+
+IRREG = [
+    ("go", "went", "gone"), ("eat", "ate", "eaten"), ("see", "saw", "seen"),
+    ("write", "wrote", "written"), ("begin", "began", "begun"), ("come", "came", "come"),
+    ("drink", "drank", "drunk"), ("sing", "sang", "sung"), ("swim", "swam", "swum"),
+    ("run", "ran", "run"), ("speak", "spoke", "spoken"), ("take", "took", "taken"),
+    ("give", "gave", "given"), ("drive", "drove", "driven"), ("break", "broke", "broken"),
+    ("choose", "chose", "chosen"), ("forget", "forgot", "forgotten"), ("freeze", "froze", "frozen"),
+    ("ride", "rode", "ridden"), ("fall", "fell", "fallen"), ("grow", "grew", "grown"),
+    ("know", "knew", "known"), ("fly", "flew", "flown"), ("blow", "blew", "blown"),
+    ("draw", "drew", "drawn"), ("show", "showed", "shown"), ("throw", "threw", "thrown"),
+    ("wear", "wore", "worn"), ("tear", "tore", "torn"), ("ring", "rang", "rung"),
+    ("get", "got", "gotten"), ("have", "had", "had"), ("be", "was/were", "been"),
+    ("make", "made", "made"), ("say", "said", "said"), ("sell", "sold", "sold"),
+    ("send", "sent", "sent"), ("set", "set", "set"), ("think", "thought", "thought"),
+]
+V2_SET = set(v2 for _, v2, _ in IRREG)
+V3_SET = set(v3 for _, _, v3 in IRREG)
+
+
+def norm(s: str) -> str:
+    if s is None:
+        return ""
+    s = unicodedata.normalize("NFC", s).lower().strip()
+    s = s.replace("+", " ")
+    s = re.sub(r"[()]", " ", s)
+    s = re.sub(r"\s*/\s*", " / ", s)
+    s = re.sub(r"[^\w\s/\-]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def any_match(text: str, patterns):
+    t = norm(text)
+    for p in patterns:
+        if re.search(p, t):
+            return True
+    return False
+
+
+def legacy_usage_ok(user_input: str, correct_usages: list[str]) -> bool:
+    text = norm(user_input)
+    for usage in correct_usages:
+        keywords = [w for w in norm(usage).split() if len(w) > 2]
+        if any(k in text for k in keywords):
+            return True
+    return False
+
+
+def legacy_validate_example(tense_key: str, group: str, form: str, sent: str):
+    """
+    tense_key: mã thì nội bộ (present_simple, past_continuous, ...)
+    group: 'verb' | 'tobe'
+    form: 'Khẳng định' | 'Phủ định' | 'Nghi vấn'
+    sent: câu ví dụ người dùng nhập
+    """
+    s = norm(sent)
+
+    # Các regex tiện lợi
+    BE_NOW = r"\b(am|is|are)\b"
+    BE_PAST = r"\b(was|were)\b"
+    DO_NOW = r"\b(do|does)\b"
+    DID = r"\b(did)\b"
+    HAVE_NOW = r"\b(have|has)\b"
+    HAD = r"\b(had)\b"
+    WILL = r"\b(will|shall)\b"
+    BEEN = r"\bbeen\b"
+    V_ING = r"\b\w+ing\b"
+    V_ED = r"\b\w+ed\b"
+    V3_END = r"\b\w+(ed|en|wn)\b"  # gần đúng
+    NEG = r"\b(not|n't)\b"
+
+    # một vài bộ nhận diện nhanh
+    def has_any_v2_or_ed():
+        return bool(re.search(V_ED, s) or any(w in s.split() for w in V2_SET))
+
+    def has_any_v3():
+        return bool(re.search(V3_END, s) or any(w in s.split() for w in V3_SET) or "been" in s)
+
+    # Mỗi thì: đặt các quy tắc "điển hình" (affirm/neg/question)
+    ok = False
+    hint = ""  
+
+    # ---- HIỆN TẠI ĐƠN
+    if tense_key == "present_simple":
+        if group == "verb":
+            if form == "Khẳng định":
+                # Không có will/ have/ has/ had/ was/were/ am/is/are/ did, không V-ing; cho phép động từ V/Vs
+                ok = (not any_match(s, [WILL, HAVE_NOW, HAD, BE_PAST, BE_NOW, DID]) and not re.search(V_ING, s))
+                hint = "Tránh dùng trợ động từ; dùng V/ V(s/es)."
+            elif form == "Phủ định":
+                ok = any_match(s, [r"\bdo not\b", r"\bdoes not\b", r"\bdon't\b", r"\bdoesn't\b"])
+                hint = "Dùng do/does not + V."
+            else:  # Nghi vấn
+                ok = re.match(r"^(do|does)\b", s or "") is not None
+                hint = "Bắt đầu bằng Do/Does + S + V?"
+        else:  # tobe
+            if form == "Khẳng định":
+                ok = any_match(s, [BE_NOW])
+                hint = "Dùng am/is/are."
+            elif form == "Phủ định":
+                ok = any_match(s, [r"\bam not\b", r"\bis not\b", r"\bare not\b", r"\bisn't\b", r"\baren't\b"])
+                hint = "Dùng am/is/are + not."
+            else:
+                ok = re.match(r"^(am|is|are)\b", s or "") is not None
+                hint = "Bắt đầu bằng Am/Is/Are + S?"
+
+    # ---- HIỆN TẠI TIẾP DIỄN
+    elif tense_key == "present_continuous":
+        if form == "Khẳng định":
+            ok = any_match(s, [BE_NOW]) and re.search(V_ING, s)
+            hint = "am/is/are + V-ing."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bam not\b.*"+V_ING, r"\bis not\b.*"+V_ING, r"\bare not\b.*"+V_ING,
+                               r"\bisn't\b.*"+V_ING, r"\baren't\b.*"+V_ING])
+            hint = "am/is/are + not + V-ing."
+        else:
+            ok = re.match(r"^(am|is|are)\b.*\b\w+ing\b", s or "") is not None
+            hint = "Bắt đầu bằng Am/Is/Are + S + V-ing?"
+
+    # ---- HIỆN TẠI HOÀN THÀNH
+    elif tense_key == "present_perfect":
+        if form == "Khẳng định":
+            ok = any_match(s, [HAVE_NOW]) and has_any_v3()
+            hint = "have/has + V3."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bhave not\b.*"+V3_END, r"\bhas not\b.*"+V3_END, r"\bhaven't\b.*", r"\bhasn't\b.*"]) and has_any_v3()
+            hint = "have/has + not + V3."
+        else:
+            ok = re.match(r"^(have|has)\b.*\b\w+(ed|en|wn)\b", s or "") is not None or \
+                 re.match(r"^(have|has)\b.*\b(" + "|".join(map(re.escape, V3_SET)) + r")\b", s or "") is not None
+            hint = "Bắt đầu bằng Have/Has + S + V3?"
+
+    # ---- HIỆN TẠI HOÀN THÀNH TIẾP DIỄN
+    elif tense_key == "present_perfect_continuous":
+        if form == "Khẳng định":
+            ok = any_match(s, [HAVE_NOW]) and "been" in s and re.search(V_ING, s)
+            hint = "have/has been + V-ing."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bhave not been\b.*"+V_ING, r"\bhas not been\b.*"+V_ING,
+                               r"\bhaven't been\b.*"+V_ING, r"\bhasn't been\b.*"+V_ING])
+            hint = "have/has + not + been + V-ing."
+        else:
+            ok = re.match(r"^(have|has)\b.*\bbeen\b.*\b\w+ing\b", s or "") is not None
+            hint = "Bắt đầu bằng Have/Has + S + been + V-ing?"
+
+    # ---- QUÁ KHỨ ĐƠN
+    elif tense_key == "past_simple":
+        if group == "verb":
+            if form == "Khẳng định":
+                ok = has_any_v2_or_ed()
+                hint = "Dùng V2/ Ved."
+            elif form == "Phủ định":
+                ok = any_match(s, [r"\bdid not\b", r"\bdidn't\b"]) and not has_any_v2_or_ed()
+                hint = "did not + V (nguyên mẫu)."
+            else:
+                ok = re.match(r"^did\b", s or "") is not None
+                hint = "Bắt đầu bằng Did + S + V?"
+        else:  # to be
+            if form == "Khẳng định":
+                ok = any_match(s, [BE_PAST])
+                hint = "Dùng was/were."
+            elif form == "Phủ định":
+                ok = any_match(s, [r"\bwas not\b", r"\bwere not\b", r"\bwasn't\b", r"\bweren't\b"])
+                hint = "was/were + not."
+            else:
+                ok = re.match(r"^(was|were)\b", s or "") is not None
+                hint = "Bắt đầu bằng Was/Were + S?"
+
+    # ---- QUÁ KHỨ TIẾP DIỄN
+    elif tense_key == "past_continuous":
+        if form == "Khẳng định":
+            ok = any_match(s, [BE_PAST]) and re.search(V_ING, s)
+            hint = "was/were + V-ing."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bwas not\b.*"+V_ING, r"\bwere not\b.*"+V_ING, r"\bwasn't\b.*"+V_ING, r"\bweren't\b.*"+V_ING])
+            hint = "was/were + not + V-ing."
+        else:
+            ok = re.match(r"^(was|were)\b.*\b\w+ing\b", s or "") is not None
+            hint = "Bắt đầu bằng Was/Were + S + V-ing?"
+
+    # ---- QUÁ KHỨ HOÀN THÀNH
+    elif tense_key == "past_perfect":
+        if form == "Khẳng định":
+            ok = any_match(s, [HAD]) and has_any_v3()
+            hint = "had + V3."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bhad not\b.*"+V3_END, r"\bhadn't\b.*"]) and has_any_v3()
+            hint = "had not + V3."
+        else:
+            ok = re.match(r"^had\b.*\b\w+(ed|en|wn)\b", s or "") is not None or re.match(r"^had\b.*\b(" + "|".join(map(re.escape, V3_SET)) + r")\b", s or "") is not None
+            hint = "Bắt đầu bằng Had + S + V3?"
+
+    # ---- QUÁ KHỨ HOÀN THÀNH TIẾP DIỄN
+    elif tense_key == "past_perfect_continuous":
+        if form == "Khẳng định":
+            ok = any_match(s, [HAD]) and "been" in s and re.search(V_ING, s)
+            hint = "had been + V-ing."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bhad not been\b.*"+V_ING, r"\bhadn't been\b.*"+V_ING])
+            hint = "had not been + V-ing."
+        else:
+            ok = re.match(r"^had\b.*\bbeen\b.*\b\w+ing\b", s or "") is not None
+            hint = "Bắt đầu bằng Had + S + been + V-ing?"
+
+    # ---- TƯƠNG LAI ĐƠN
+    elif tense_key == "future_simple":
+        if form == "Khẳng định":
+            ok = any_match(s, [WILL]) and "will have" not in s and "will be" not in s
+            hint = "will + V (nguyên mẫu)."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bwill not\b", r"\bwon't\b"])
+            hint = "will not + V."
+        else:
+            ok = re.match(r"^(will|shall)\b", s or "") is not None
+            hint = "Bắt đầu bằng Will/Shall + S + V?"
+
+    # ---- TƯƠNG LAI TIẾP DIỄN
+    elif tense_key == "future_continuous":
+        if form == "Khẳng định":
+            ok = "will be" in s and re.search(V_ING, s)
+            hint = "will be + V-ing."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bwill not be\b.*"+V_ING, r"\bwon't be\b.*"+V_ING])
+            hint = "will not be + V-ing."
+        else:
+            ok = re.match(r"^(will|shall)\b.*\bbe\b.*\b\w+ing\b", s or "") is not None
+            hint = "Bắt đầu bằng Will + S + be + V-ing?"
+
+    # ---- TƯƠNG LAI HOÀN THÀNH
+    elif tense_key == "future_perfect":
+        if form == "Khẳng định":
+            ok = "will have" in s and has_any_v3()
+            hint = "will have + V3."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bwill not have\b.*"+V3_END, r"\bwon't have\b.*"+V3_END]) or ("will not have" in s and has_any_v3())
+            hint = "will not have + V3."
+        else:
+            ok = re.match(r"^(will|shall)\b.*\bhave\b.*\b\w+(ed|en|wn)\b", s or "") is not None or \
+                 re.match(r"^(will|shall)\b.*\bhave\b.*\b(" + "|".join(map(re.escape, V3_SET)) + r")\b", s or "") is not None
+            hint = "Bắt đầu bằng Will + S + have + V3?"
+
+    # ---- TƯƠNG LAI HOÀN THÀNH TIẾP DIỄN
+    elif tense_key == "future_perfect_continuous":
+        if form == "Khẳng định":
+            ok = "will have been" in s and re.search(V_ING, s)
+            hint = "will have been + V-ing."
+        elif form == "Phủ định":
+            ok = any_match(s, [r"\bwill not have been\b.*"+V_ING, r"\bwon't have been\b.*"+V_ING])
+            hint = "will not have been + V-ing."
+        else:
+            ok = re.match(r"^(will|shall)\b.*\bhave been\b.*\b\w+ing\b", s or "") is not None
+            hint = "Bắt đầu bằng Will + S + have been + V-ing?"
+
+    return ok, hint
+
+
+_S_OR_ES = re.compile(r"\bv(s|es)\b")
+_V_ING = re.compile(r"\bv-?ing\b")
+
+
+@lru_cache(maxsize=1024)
+def _answer_key(correct: str):
+    return normalize(correct), correct.lower()
+
+
+def legacy_formula_ok(user_input: str, correct: str) -> bool:
+    u = normalize(user_input)
+    c, c_raw = _answer_key(correct)
+
+    # 1) Nhóm lựa chọn (chỉ cần có 1)
+    choice_groups = []
+    if "do/does" in c_raw:
+        choice_groups.append(["do", "does"])
+    if "am/is/are" in c_raw:
+        choice_groups.append(["am", "is", "are"])
+    if "was/were" in c_raw:
+        choice_groups.append(["was", "were"])
+    if "have/has" in c_raw:
+        choice_groups.append(["have", "has"])
+
+    for group in choice_groups:
+        if not any(has_word(u, w) for w in group):
+            return False
+
+    # 2) Từ bắt buộc
+    if " not " in f" {c_raw} " and not has_word(u, "not"):
+        return False
+    if "s" in c.words and not has_word(u, "s"):
+        return False
+
+    # 3) Dạng động từ
+    if "v(s/es)" in c_raw:
+        if not (has_word(u, "v") or _S_OR_ES.search(u.text)):
+            return False
+    if "v-ing" in c_raw:
+        if not (has_word(u, "ving") or _V_ING.search(u.text)):
+            return False
+    if "v2/v-ed" in c_raw:
+        if not (has_word(u, "v2") or has_word(u, "ved") or has_word(u, "v-ed")):
+            return False
+    if "v3" in c_raw and not has_word(u, "v3"):
+        return False
+    # Trường hợp là "… + V" trần
+    if "v" in c.token_set and not any(tag in u.text for tag in [" v", "v ", "v-", "v2", "ved", "v3"]):
+        return False
+
+    return True
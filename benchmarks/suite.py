@@ -0,0 +1,306 @@
+"""
+Bộ benchmark + độ chính xác cho mọi bộ chấm, có mốc (baseline) JSON để chặn hồi quy.
+
+Chạy `norm`, `formula_ok`, `usage_ok`, `any_match`, `validate_example` trên bộ dữ
+liệu có nhãn:
+- validate_example: câu đúng/sai cho mọi (thì, nhóm, dạng) trong `labelled.py`
+- formula_ok: mọi công thức trong `summary` của TENSES, các cách viết tương đương
+  (đúng) và công thức của dạng khác / bỏ "not" / V2 thay V3 / V thay V-ing (sai)
+- usage_ok: cách dùng của đúng thì (cả phần tiếng Việt, phần tiếng Anh) và của thì khác
+- any_match: câu chứa dấu hiệu nhận biết, so với danh sách dấu hiệu của từng thì
+- norm: so với `norm` cũ trên toàn bộ chuỗi ở trên cùng vài chuỗi "bẩn"
+
+Báo cáo số lần chấm/giây, độ trễ p50/p99 mỗi lần gọi, độ chính xác và
+precision/recall theo thì.
+
+    python -m benchmarks.suite                 # chỉ in kết quả
+    python -m benchmarks.suite --save          # ghi mốc vào benchmarks/baseline.json
+    python -m benchmarks.suite --check         # thoát mã 1 nếu chậm/kém chính xác hơn mốc
+
+Ngưỡng: `--max-slowdown 0.3` (chấm/giây giảm hoặc p99 tăng quá 30%) và
+`--max-accuracy-drop 0` (độ chính xác, precision, recall không được giảm).
+Mốc tốc độ chỉ có ý nghĩa trên cùng một máy; nên `--save` lại khi đổi máy.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, NamedTuple
+
+from grader import TENSES, any_match, formula_ok, group_key, norm, usage_ok, validate_example
+
+from .labelled import EXAMPLES
+from .legacy import norm as legacy_norm
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class Case(NamedTuple):
+    tense_key: str
+    args: tuple
+    expected: object   # bool với các bộ chấm đúng/sai, chuỗi với norm
+
+
+class Checker(NamedTuple):
+    fn: Callable
+    cases: list[Case]
+    binary: bool       # có tính precision/recall theo thì không
+
+
+# ---- dựng bộ dữ liệu có nhãn
+def example_cases() -> list[Case]:
+    return [
+        Case(tense_key, (tense_key, group, form, sent), label)
+        for (tense_key, group, form), (good, bad) in EXAMPLES.items()
+        for label, sents in ((True, good), (False, bad))
+        for sent in sents
+    ]
+
+
+_CHOICES = {"do/does": "does", "am/is/are": "is", "was/were": "were", "have/has": "has"}
+
+
+def formula_variants(correct: str) -> set[str]:
+    """Các cách viết khác của cùng một công thức (đều phải được chấp nhận)."""
+    variants = {correct, correct.lower(), correct.upper(), correct.replace(" + ", " "),
+                "  " + correct.replace("+", " + ") + " "}
+    short = correct
+    for choices, pick in _CHOICES.items():
+        short = short.replace(choices, pick)
+    variants.add(short)
+    variants.add(correct.replace("V-ing", "Ving").replace("V(s/es)", "Vs").replace("V2/V-ed", "V2"))
+    return variants
+
+
+def formula_mutations(correct: str) -> set[str]:
+    """Các lỗi hay gặp khi chép công thức (đều phải bị từ chối)."""
+    mutated = {
+        re.sub(r"\s*\+?\s*\bnot\b", "", correct),
+        correct.replace("V3", "V2"),
+        correct.replace("V-ing", "V"),
+    }
+    mutated.discard(correct)
+    return mutated
+
+
+def formula_cases() -> list[Case]:
+    cases = []
+    for tense in TENSES.values():
+        slots = {
+            (group_key(group), form): formula
+            for group, formulas in tense.summary.items()
+            for form, formula in formulas.items()
+        }
+        for slot, correct in slots.items():
+            cases += [Case(tense.key, (v, correct), True) for v in sorted(formula_variants(correct))]
+            wrong = formula_mutations(correct) | {f for s, f in slots.items() if s != slot and f != correct}
+            cases += [Case(tense.key, (w, correct), False) for w in sorted(wrong)]
+    return cases
+
+
+def _use_parts(use: str) -> list[str]:
+    m = re.match(r"(.*?)\s*\((.*)\)\s*$", use)
+    return [use] + ([m.group(1), m.group(2)] if m else [])
+
+
+# câu trả lời tự viết: đúng nhưng thêm chữ ngoài ngân hàng / chỉ một vế, và từ quá chung (không đủ để khớp)
+_USAGE_EXTRA = {
+    "present_simple": [("thói quen hằng ngày", True), ("daily habits", True), ("sự thật", True),
+                       ("diễn tả thói quen hằng ngày của tôi", True), ("lịch trình tàu xe", True),
+                       ("hành động đang xảy ra", False)],
+    "present_continuous": [("hành động đang xảy ra lúc nói", True), ("sự việc tạm thời thôi", True),
+                           ("hành động", False)],
+    "past_simple": [("hành động đã kết thúc hôm qua", True), ("hành động", False)],
+    "future_simple": [("lời hứa", True), ("predictions about the future", True)],
+}
+
+
+def usage_cases() -> list[Case]:
+    cases = []
+    for tense in TENSES.values():
+        for other in TENSES.values():
+            label = other is tense
+            for use in other.uses:
+                for text in (_use_parts(use) if label else [use]):
+                    cases.append(Case(tense.key, (text, tense.uses), label))
+        cases += [Case(tense.key, (text, tense.uses), label) for text, label in _USAGE_EXTRA.get(tense.key, ())]
+    return cases
+
+
+def _signal_pattern(signal: str) -> str:
+    return rf"\b{re.escape(norm(signal))}\b"
+
+
+def signal_cases() -> list[Case]:
+    all_signals = sorted({sig for tense in TENSES.values() for sig in tense.signals})
+    cases = []
+    for tense in TENSES.values():
+        patterns = tuple(_signal_pattern(sig) for sig in tense.signals)
+        for sig in all_signals:
+            text = f"It happened {sig}."
+            cases.append(Case(tense.key, (text, patterns), sig in tense.signals))
+    return cases
+
+
+_MESSY = ["  Don’t   STOP!!  ", "S+V(s/es)", "Đi học – mỗi ngày…", "He's\tgone\n", "V-ing / V3 ?", ""]
+
+
+def norm_cases(*corpora: list[Case]) -> list[Case]:
+    texts = dict.fromkeys(_MESSY)
+    for cases in corpora:
+        for case in cases:
+            if isinstance(case.args[0], str):
+                texts[case.args[0]] = None
+    return [Case("", (text,), legacy_norm(text)) for text in texts]
+
+
+def build_checkers() -> dict[str, Checker]:
+    examples, formulas, usages, signals = example_cases(), formula_cases(), usage_cases(), signal_cases()
+    return {
+        "norm": Checker(norm, norm_cases(examples, formulas, usages, signals), False),
+        "formula_ok": Checker(formula_ok, formulas, True),
+        "usage_ok": Checker(usage_ok, usages, True),
+        "any_match": Checker(any_match, signals, True),
+        "validate_example": Checker(lambda *a: validate_example(*a)[0], examples, True),
+    }
+
+
+# ---- đo
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def _ratio(num: int, den: int) -> float:
+    return num / den if den else 0.0
+
+
+def accuracy_report(checker: Checker) -> dict:
+    hits = 0
+    counts = defaultdict(lambda: [0, 0, 0])   # tense -> [tp, fp, fn]
+    for case in checker.cases:
+        got = checker.fn(*case.args)
+        if checker.binary:
+            got = bool(got)
+            c = counts[case.tense_key]
+            c[0] += got and case.expected
+            c[1] += got and not case.expected
+            c[2] += not got and case.expected
+        hits += got == case.expected
+    report = {"accuracy": _ratio(hits, len(checker.cases))}
+    if checker.binary:
+        report["per_tense"] = {
+            tense: {"precision": _ratio(tp, tp + fp), "recall": _ratio(tp, tp + fn)}
+            for tense, (tp, fp, fn) in sorted(counts.items())
+        }
+    return report
+
+
+def speed_report(checker: Checker, rounds: int, min_round_seconds: float = 0.1) -> dict:
+    fn, argses = checker.fn, [case.args for case in checker.cases]
+    clock = time.perf_counter
+    # số lượt mỗi vòng sao cho một vòng đủ dài để ít nhiễu
+    start = clock()
+    for args in argses:
+        fn(*args)
+    passes = max(1, int(min_round_seconds / max(clock() - start, 1e-9)))
+    best = float("inf")
+    latencies = []
+    for _ in range(rounds):
+        start = clock()
+        for _ in range(passes):
+            for args in argses:
+                fn(*args)
+        best = min(best, (clock() - start) / passes)
+        for args in argses:
+            t0 = clock()
+            fn(*args)
+            latencies.append(clock() - t0)
+    latencies.sort()
+    return {
+        "checks_per_sec": len(argses) / best,
+        "p50_us": _percentile(latencies, 0.50) * 1e6,
+        "p99_us": _percentile(latencies, 0.99) * 1e6,
+    }
+
+
+def run(rounds: int) -> dict:
+    results = {}
+    for name, checker in build_checkers().items():
+        results[name] = {"cases": len(checker.cases), **speed_report(checker, rounds), **accuracy_report(checker)}
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "rounds": rounds},
+        "checkers": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{'bộ chấm':<17} {'số ca':>6} {'chấm/giây':>12} {'p50 µs':>8} {'p99 µs':>8} {'chính xác':>10}")
+    for name, r in report["checkers"].items():
+        print(f"{name:<17} {r['cases']:>6} {r['checks_per_sec']:>12,.0f} {r['p50_us']:>8.2f} "
+              f"{r['p99_us']:>8.2f} {r['accuracy']:>10.1%}")
+    for name, r in report["checkers"].items():
+        if "per_tense" not in r:
+            continue
+        print(f"\n{name}: precision / recall theo thì")
+        for tense, pr in r["per_tense"].items():
+            print(f"  {tense:<28} {pr['precision']:>6.0%} / {pr['recall']:>4.0%}")
+
+
+def regressions(report: dict, baseline: dict, max_slowdown: float, max_accuracy_drop: float) -> list[str]:
+    """Các chỉ số tệ hơn mốc quá ngưỡng (danh sách rỗng: đạt)."""
+    problems = []
+    for name, base in baseline["checkers"].items():
+        cur = report["checkers"].get(name)
+        if cur is None:
+            problems.append(f"{name}: không còn trong bộ benchmark")
+            continue
+        if cur["checks_per_sec"] < base["checks_per_sec"] * (1 - max_slowdown):
+            problems.append(f"{name}: {cur['checks_per_sec']:,.0f} chấm/giây < mốc {base['checks_per_sec']:,.0f}")
+        if cur["p99_us"] > base["p99_us"] / (1 - max_slowdown):
+            problems.append(f"{name}: p99 {cur['p99_us']:.2f} µs > mốc {base['p99_us']:.2f} µs")
+        metrics = [("accuracy", cur["accuracy"], base["accuracy"])]
+        for tense, pr in base.get("per_tense", {}).items():
+            cur_pr = cur.get("per_tense", {}).get(tense, {"precision": 0.0, "recall": 0.0})
+            metrics += [(f"{tense} {k}", cur_pr[k], pr[k]) for k in ("precision", "recall")]
+        for label, value, base_value in metrics:
+            if value < base_value - max_accuracy_drop - 1e-9:
+                problems.append(f"{name}: {label} {value:.1%} < mốc {base_value:.1%}")
+    return problems
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save", action="store_true", help="ghi kết quả làm mốc mới")
+    ap.add_argument("--check", action="store_true", help="so với mốc, thoát mã 1 nếu hồi quy")
+    ap.add_argument("--max-slowdown", type=float, default=0.3)
+    ap.add_argument("--max-accuracy-drop", type=float, default=0.0)
+    args = ap.parse_args(argv)
+
+    report = run(args.rounds)
+    print_report(report)
+
+    status = 0
+    if args.check:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = regressions(report, baseline, args.max_slowdown, args.max_accuracy_drop)
+        for problem in problems:
+            print("HỒI QUY", problem, file=sys.stderr)
+        print(f"\nso với mốc {args.baseline}: {'đạt' if not problems else f'{len(problems)} hồi quy'}")
+        status = 1 if problems else 0
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"đã ghi mốc: {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,34 @@
+"""Lõi chấm bài 12 thì (không phụ thuộc Streamlit)."""
+from importlib import import_module
+
+from . import content, metrics
+from .checkers import any_match, formula_ok, usage_ok
+from .classify import TenseGuess, classify_tense
+from .content import Tense, group_key
+from .formula import FormulaCheck, check_formula, compile_formula
+from .lexicon import IRREG, LEXICON, V2_SET, V3_SET, Lexicon
+from .rules import FORMS, RULES, validate_example
+from .text import NormalizedText, has_word, norm, normalize
+
+__all__ = [
+    "FORMS", "FormulaCheck", "IRREG", "LEXICON", "Lexicon", "NormalizedText", "RULES", "TENSE_NAMES", "TENSES",
+    "TENSES_BY_KEY", "TaggedSentence", "Tense", "TenseGuess", "V2_SET", "V3_SET", "any_match", "check_formula",
+    "classify_tense", "compile_formula", "formula_ok", "grade_file", "grade_items", "grade_rows",
+    "grade_rows_parallel", "group_key", "has_word", "metrics", "norm", "normalize", "split_sentences", "tag_text",
+    "usage_ok", "validate_example",
+]
+
+# chấm hàng loạt và nhận diện bài luận chỉ nạp khi được dùng: `import grader.core` nhẹ
+_LAZY = {
+    "grade_file": "bulk", "grade_items": "bulk", "grade_rows": "bulk", "grade_rows_parallel": "bulk",
+    "TaggedSentence": "essay", "split_sentences": "essay", "tag_text": "essay",
+}
+
+
+def __getattr__(name: str):
+    # nội dung được nạp lại khi file dữ liệu đổi (xem `content`): luôn trả bản mới nhất
+    if name in ("TENSES", "TENSES_BY_KEY", "TENSE_NAMES"):
+        return getattr(content, name)
+    if name in _LAZY:
+        return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,420 @@
+"""
+Thống kê cho giáo viên: nhật ký lần chấm dạng cột (chỉ nối thêm) và bảng tổng hợp
+cộng dồn (thì/dạng nào hay sai, gợi ý nào của `validate_example` hay gặp).
+
+Mỗi lần chấm là một dòng gồm các số nguyên nhỏ; mỗi cột là một file nhị phân
+`<cột>.bin` riêng trong thư mục nhật ký (14 byte/dòng):
+    student u4, tense u1, section u1, form u1, hint u2, ok u1, ts u4 (giây unix)
+Chuỗi (tên học sinh, tense_key, phần, dạng, gợi ý) được đổi ra mã qua bảng mã
+`codes.json`, chỉ thêm không sửa; mã 0 luôn là "".
+
+Ghi: `AttemptLog.record()` gom dòng trong bộ nhớ rồi ghi theo lô (đủ `batch_size`
+dòng, hoặc FLUSH_SECONDS sau dòng đầu của lô, `flush()`, và khi thoát). Mỗi lô
+giữ khoá file (nhiều tiến trình cùng ghi được), ghi bảng mã trước rồi nối vào cuối
+mọi cột. Số dòng của nhật ký là độ dài cột ngắn nhất: lô ghi dở (mất điện) chỉ mất
+chính lô đó, lần ghi sau cắt các cột về cùng độ dài. File của mọi cột được tạo trước
+khi nối dòng đầu tiên, nên thiếu một file cột trong khi cột khác đã có dữ liệu là
+nhật ký hỏng (`LogError`), không bị coi là lô dở mà cắt mất cả nhật ký.
+
+Đọc: `AttemptLog.aggregates()` trả về `Aggregates` (số lượt/số sai theo phần × thì
+× dạng, số sai theo thì × dạng × gợi ý) sau khi cộng thêm các dòng mới từ lần
+trước (đọc từ vị trí cũ, cộng bằng `np.bincount`): O(dòng mới), không quét lại cả
+nhật ký. Bản tổng hợp được lưu (`aggregates.npz`) nên tiến trình mới cũng chỉ đọc
+phần mới. Xoá nhật ký thì xoá cả thư mục.
+
+Đường dẫn: biến môi trường GRADER_ATTEMPT_LOG, mặc định ./attempts/.
+Chạy: python -m grader.analytics ingest ket_qua.jsonl [--student-column student]
+      python -m grader.analytics report [--top 10]      (xem: python -m grader.analytics info)
+"""
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from .bulk import FORMATS, detect_format, read_rows
+
+try:
+    import fcntl
+except ImportError:     # Windows: không khoá được giữa các tiến trình, chỉ nên có một tiến trình ghi
+    fcntl = None
+
+DEFAULT_PATH = os.environ.get("GRADER_ATTEMPT_LOG", "attempts")
+COLUMNS = {"student": "<u4", "tense": "u1", "section": "u1", "form": "u1", "hint": "<u2", "ok": "u1", "ts": "<u4"}
+CODED = ("student", "tense", "section", "form", "hint")
+FLUSH_SECONDS = 1.0
+READ_BLOCK = 1 << 20        # số dòng đọc mỗi lần khi cộng dồn (giới hạn bộ nhớ)
+SNAPSHOT_EVERY = 100_000    # lưu bản tổng hợp khi đã cộng thêm từng này dòng
+
+
+class LogError(ValueError):
+    """Nhật ký hỏng (thiếu file cột), không đọc/ghi tiếp được."""
+
+
+class Entry(NamedTuple):
+    student: str
+    tense_key: str
+    section: str        # formula | use | signal | example (như progress.SECTIONS)
+    form: str           # '' với cách dùng, dấu hiệu
+    hint: str           # gợi ý của validate_example ('' nếu không có)
+    ok: bool
+    ts: float
+
+
+class Cell(NamedTuple):
+    tense_key: str
+    form: str
+    attempts: int
+    fails: int
+
+    @property
+    def fail_rate(self) -> float:
+        return self.fails / self.attempts if self.attempts else 0.0
+
+
+class HintCount(NamedTuple):
+    tense_key: str
+    form: str
+    hint: str
+    fails: int
+
+
+class Codebook:
+    """Chuỗi <-> mã của các cột chuỗi; chỉ thêm, mã 0 là ""."""
+
+    def __init__(self, names: dict[str, list[str]] | None = None):
+        self.names = {column: list((names or {}).get(column) or [""]) for column in CODED}
+        self.index = {column: {s: i for i, s in enumerate(values)} for column, values in self.names.items()}
+
+    def size(self, column: str) -> int:
+        return len(self.names[column])
+
+    def code(self, column: str, value: str) -> int:
+        code = self.index[column].get(value)
+        if code is None:
+            code = len(self.names[column])
+            if code > np.iinfo(COLUMNS[column]).max:
+                raise ValueError(f"cột {column!r} đã hết mã ({code} giá trị khác nhau)")
+            self.index[column][value] = code
+            self.names[column].append(value)
+        return code
+
+    def encode(self, column: str, values: Iterable[str]) -> np.ndarray:
+        get, code = self.index[column].get, self.code
+        return np.array([c if (c := get(v)) is not None else code(column, v) for v in values], COLUMNS[column])
+
+
+class Aggregates(NamedTuple):
+    """Bảng tổng hợp tới dòng `rows` của nhật ký (bất biến: cộng thêm thì ra bản mới)."""
+    rows: int
+    attempts: np.ndarray                # [phần, thì, dạng] số lượt chấm
+    fails: np.ndarray                   # [phần, thì, dạng] số lượt sai
+    hints: np.ndarray                   # [thì, dạng, gợi ý] số lượt sai có gợi ý đó
+    names: dict[str, tuple[str, ...]]   # cột -> chuỗi theo mã (trừ student)
+
+    @classmethod
+    def empty(cls) -> "Aggregates":
+        zeros = np.zeros((1, 1, 1), np.int64)
+        return cls(0, zeros, zeros, zeros, {column: ("",) for column in CODED if column != "student"})
+
+    def add(self, columns: dict[str, np.ndarray], codes: Codebook) -> "Aggregates":
+        """Bản tổng hợp sau khi cộng thêm các dòng `columns` (mã theo `codes`)."""
+        S, T, F, H = (codes.size(c) for c in ("section", "tense", "form", "hint"))
+        s, t, f, h = (columns[c].astype(np.uint32) for c in ("section", "tense", "form", "hint"))
+        bad = columns["ok"] == 0
+        cell = (s * T + t) * F + f
+        attempts = _grow(self.attempts, (S, T, F)) + np.bincount(cell, minlength=S * T * F).reshape(S, T, F)
+        fails = _grow(self.fails, (S, T, F)) + np.bincount(cell[bad], minlength=S * T * F).reshape(S, T, F)
+        hint = ((t * F + f) * H + h)[bad & (h != 0)]
+        hints = _grow(self.hints, (T, F, H)) + np.bincount(hint, minlength=T * F * H).reshape(T, F, H)
+        names = {column: tuple(codes.names[column]) for column in self.names}
+        return Aggregates(self.rows + len(bad), attempts, fails, hints, names)
+
+    def _section(self, section: str | None) -> slice | int | None:
+        if section is None:
+            return slice(None)
+        names = self.names["section"]
+        return names.index(section) if section in names else None
+
+    def totals(self, section: str | None = None) -> tuple[int, int]:
+        """(số lượt, số lượt sai) của một phần (None: mọi phần)."""
+        i = self._section(section)
+        return (0, 0) if i is None else (int(self.attempts[i].sum()), int(self.fails[i].sum()))
+
+    def cells(self, section: str | None = None) -> list[Cell]:
+        """Các ô (thì, dạng) đã có lượt chấm, của một phần (None: mọi phần)."""
+        i = self._section(section)
+        if i is None:
+            return []
+        attempts, fails = self.attempts[i], self.fails[i]
+        if attempts.ndim == 3:
+            attempts, fails = attempts.sum(axis=0), fails.sum(axis=0)
+        tenses, forms = self.names["tense"], self.names["form"]
+        return [Cell(tenses[t], forms[f], int(attempts[t, f]), int(fails[t, f])) for t, f in zip(*attempts.nonzero())]
+
+    def top_hints(self, k: int = 10) -> list[HintCount]:
+        """Các (thì, dạng, gợi ý) sai nhiều nhất."""
+        flat = self.hints.ravel()
+        k = min(k, int(np.count_nonzero(flat)))
+        if k == 0:
+            return []
+        top = np.argpartition(flat, -k)[-k:]
+        top = top[np.argsort(flat[top], kind="stable")[::-1]]
+        tenses, forms, hints = self.names["tense"], self.names["form"], self.names["hint"]
+        return [HintCount(tenses[t], forms[f], hints[h], int(flat[i]))
+                for i, (t, f, h) in zip(top, zip(*np.unravel_index(top, self.hints.shape)))]
+
+
+def _grow(a: np.ndarray, shape: tuple[int, ...]) -> np.ndarray:
+    """`a` thêm số 0 ở cuối mỗi trục cho đủ `shape` (bảng mã chỉ thêm nên mã cũ giữ nguyên chỗ)."""
+    if a.shape == shape:
+        return a
+    return np.pad(a, [(0, n - m) for m, n in zip(a.shape, shape)])
+
+
+class AttemptLog:
+    """Nhật ký lần chấm dạng cột trong thư mục `path` (xem đầu module)."""
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 512):
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(path, exist_ok=True)
+        self.codes = Codebook()
+        self._codes_mtime = None
+        self._pending: list[Entry] = []
+        self._lock = threading.Lock()               # bộ đệm ghi, bảng mã
+        self._aggregates: Aggregates | None = None
+        self._saved_rows = 0
+        self._agg_lock = threading.Lock()
+        self._reload_codes()
+        atexit.register(self.flush)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def __len__(self) -> int:
+        """Số dòng đã ghi xong (độ dài cột ngắn nhất; 0 nếu chưa ghi gì)."""
+        sizes, missing = [], []
+        for column, dtype in COLUMNS.items():
+            try:
+                sizes.append(os.path.getsize(self._file(f"{column}.bin")) // np.dtype(dtype).itemsize)
+            except FileNotFoundError:
+                missing.append(column)
+        if missing and any(sizes):
+            raise LogError(f"{self.path}: thiếu file cột {', '.join(missing)} trong khi các cột khác đã có dữ liệu "
+                           f"(khôi phục các file đó, hoặc xoá cả thư mục để làm lại nhật ký)")
+        return min(sizes, default=0)
+
+    # ---- ghi
+    def record(self, student: str, tense_key: str, section: str, form: str = "", ok: bool = False,
+               hint: str = "", ts: float | None = None) -> None:
+        """Thêm một lần chấm vào bộ đệm; ghi xuống đĩa theo lô (không chờ đĩa ở mọi lần gọi)."""
+        entry = Entry(student, tense_key, section, form, hint, bool(ok), time.time() if ts is None else ts)
+        with self._lock:
+            if not self._pending:
+                # lô mới: ghi muộn nhất sau FLUSH_SECONDS dù ít người làm bài
+                timer = threading.Timer(FLUSH_SECONDS, self.flush)
+                timer.daemon = True
+                timer.start()
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def extend(self, entries: Iterable[Entry], chunk_size: int = 65_536) -> int:
+        """Ghi thẳng nhiều dòng (nạp file kết quả lớn), theo từng lô `chunk_size`; trả về số dòng."""
+        n = 0
+        entries = iter(entries)
+        with self._lock:
+            self._flush()
+            while chunk := [e for _, e in zip(range(chunk_size), entries)]:
+                self._write(chunk)
+                n += len(chunk)
+        return n
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self._write(batch)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self._file("lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write(self, batch: list[Entry]) -> None:
+        with self._file_lock():
+            self._reload_codes()            # tiến trình khác có thể vừa thêm mã
+            sizes = [self.codes.size(column) for column in CODED]
+            columns = {
+                "student": self.codes.encode("student", (e.student for e in batch)),
+                "tense": self.codes.encode("tense", (e.tense_key for e in batch)),
+                "section": self.codes.encode("section", (e.section for e in batch)),
+                "form": self.codes.encode("form", (e.form for e in batch)),
+                "hint": self.codes.encode("hint", (e.hint for e in batch)),
+                "ok": np.array([e.ok for e in batch], COLUMNS["ok"]),
+                "ts": np.array([int(e.ts) for e in batch], COLUMNS["ts"]),
+            }
+            if sizes != [self.codes.size(column) for column in CODED]:
+                self._save_codes()          # bảng mã trước: dòng đã ghi luôn có mã
+            rows = len(self)
+            # đủ file mọi cột, cùng độ dài, trước khi nối: sau đó thiếu file cột là hỏng chứ không phải lô dở
+            for column, dtype in COLUMNS.items():
+                with open(self._file(f"{column}.bin"), "ab") as f:
+                    if os.fstat(f.fileno()).st_size > rows * np.dtype(dtype).itemsize:
+                        f.truncate(rows * np.dtype(dtype).itemsize)         # bỏ phần dở của lô trước
+            for column in COLUMNS:
+                with open(self._file(f"{column}.bin"), "ab") as f:
+                    f.write(columns[column].tobytes())
+
+    def _reload_codes(self) -> None:
+        try:
+            mtime = os.stat(self._file("codes.json")).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._codes_mtime:
+            with open(self._file("codes.json"), encoding="utf-8") as f:
+                self.codes = Codebook(json.load(f))
+            self._codes_mtime = mtime
+
+    def _save_codes(self) -> None:
+        tmp = self._file(f"codes.json.tmp{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.codes.names, f, ensure_ascii=False)
+        os.replace(tmp, self._file("codes.json"))
+        self._codes_mtime = os.stat(self._file("codes.json")).st_mtime_ns
+
+    # ---- đọc
+    def read(self, start: int, stop: int) -> dict[str, np.ndarray]:
+        """Các cột của dòng [start, stop)."""
+        return {
+            column: np.fromfile(self._file(f"{column}.bin"), dtype, count=stop - start,
+                                offset=start * np.dtype(dtype).itemsize)
+            for column, dtype in COLUMNS.items()
+        }
+
+    def aggregates(self) -> Aggregates:
+        """Bảng tổng hợp tới dòng cuối đã ghi, chỉ cộng thêm các dòng mới từ lần trước."""
+        with self._agg_lock:
+            agg = self._aggregates or self._load_snapshot()
+            n = len(self)
+            if n < agg.rows:            # nhật ký bị xoá / làm lại
+                agg = Aggregates.empty()
+                self._saved_rows = 0
+            if n > agg.rows:
+                with self._lock:
+                    self._reload_codes()
+                    codes = self.codes
+                for start in range(agg.rows, n, READ_BLOCK):
+                    agg = agg.add(self.read(start, min(start + READ_BLOCK, n)), codes)
+                if agg.rows - self._saved_rows >= SNAPSHOT_EVERY:
+                    self._save_snapshot(agg)
+            self._aggregates = agg
+            return agg
+
+    def _load_snapshot(self) -> Aggregates:
+        try:
+            with np.load(self._file("aggregates.npz")) as z:
+                agg = Aggregates(int(z["rows"]), z["attempts"], z["fails"], z["hints"],
+                                 json.loads(str(z["names"])))
+        except (OSError, KeyError, ValueError):
+            return Aggregates.empty()
+        agg = agg._replace(names={column: tuple(values) for column, values in agg.names.items()})
+        self._saved_rows = agg.rows
+        return agg
+
+    def _save_snapshot(self, agg: Aggregates) -> None:
+        tmp = self._file(f"aggregates.npz.tmp{os.getpid()}")
+        with open(tmp, "wb") as f:
+            np.savez(f, rows=agg.rows, attempts=agg.attempts, fails=agg.fails, hints=agg.hints,
+                     names=json.dumps(agg.names, ensure_ascii=False))
+        os.replace(tmp, self._file("aggregates.npz"))
+        self._saved_rows = agg.rows
+
+
+# ---- nạp file kết quả của `python -m grader`
+def verdict_entries(rows: Iterable[dict], student_column: str = "student", ts: float | None = None
+                    ) -> Iterator[Entry]:
+    """Các dòng kết quả chấm hàng loạt (CSV/JSONL) thành `Entry`; bỏ dòng lỗi (cột `error`)."""
+    ts = time.time() if ts is None else ts
+    for row in rows:
+        if not isinstance(row, dict):       # dòng JSONL hỏng (`BadLine`) hoặc không phải object
+            continue
+        checker = row.get("checker") or ""
+        if row.get("error") or checker not in ("formula", "example"):
+            continue
+        ok = row.get("ok") in (True, 1, "True", "true", "1")
+        # cột hint của công thức là đáp án đúng, không phải gợi ý của validate_example
+        hint = (row.get("hint") or "") if checker == "example" else ""
+        yield Entry(str(row.get(student_column) or ""), (row.get("tense_key") or "").strip(), checker,
+                    (row.get("form") or "").strip(), hint, ok, ts)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m grader.analytics", description="Nhật ký lần chấm và thống kê lớp.")
+    ap.add_argument("--log", default=DEFAULT_PATH, help="thư mục nhật ký (mặc định: %(default)s)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="nạp file kết quả của python -m grader")
+    ingest.add_argument("input", nargs="+")
+    ingest.add_argument("--input-format", choices=FORMATS, help="mặc định: đoán theo đuôi file")
+    ingest.add_argument("--student-column", default="student")
+    report = sub.add_parser("report", help="thì/dạng và gợi ý hay sai nhất")
+    report.add_argument("--top", type=int, default=10)
+    report.add_argument("--min-attempts", type=int, default=20, help="bỏ ô có ít lượt hơn")
+    sub.add_parser("info", help="số dòng, dung lượng, số mã")
+    args = ap.parse_args(argv)
+
+    log = AttemptLog(args.log)
+    try:
+        len(log)
+    except LogError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if args.command == "ingest":
+        for path in args.input:
+            start = time.perf_counter()
+            with open(path, newline="", encoding="utf-8") as f:
+                n = log.extend(verdict_entries(read_rows(f, args.input_format or detect_format(path)),
+                                               args.student_column))
+            elapsed = time.perf_counter() - start
+            rate = n / elapsed if elapsed > 0 else float("inf")
+            print(f"{path}: {n} dòng trong {elapsed:.2f}s ({rate:,.0f} dòng/s)", file=sys.stderr)
+        return 0
+    start = time.perf_counter()
+    agg = log.aggregates()
+    elapsed = (time.perf_counter() - start) * 1e3
+    if args.command == "info":
+        size = sum(os.path.getsize(log._file(f"{column}.bin")) for column in COLUMNS) if len(log) else 0
+        print(f"{log.path}: {len(log):,} dòng, {size / 1e6:.1f} MB ({size / max(len(log), 1):.1f} byte/dòng)")
+        print("số mã: " + ", ".join(f"{column} {log.codes.size(column)}" for column in CODED))
+        return 0
+    attempts, fails = agg.totals()
+    print(f"{agg.rows:,} lượt chấm, sai {fails / max(attempts, 1):.1%} (tổng hợp trong {elapsed:.0f} ms)")
+    cells = sorted((c for c in agg.cells() if c.attempts >= args.min_attempts), key=Cell.fail_rate.fget, reverse=True)
+    print(f"\n{'thì':<28} {'dạng':<12} {'lượt':>10} {'tỉ lệ sai':>10}")
+    for c in cells[:args.top]:
+        print(f"{c.tense_key:<28} {c.form or '—':<12} {c.attempts:>10,} {c.fail_rate:>10.1%}")
+    print(f"\n{'lần sai':>10}  gợi ý (thì / dạng)")
+    for h in agg.top_hints(args.top):
+        print(f"{h.fails:>10,}  {h.hint} ({h.tense_key} / {h.form})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""
+Dữ liệu chấm bài bất biến, dựng một lần cho cả tiến trình (và dựng lại khi file
+nội dung đổi, xem `content`).
+
+Gồm bảng luật `validate_example`, văn phạm (dịch sẵn) của mọi công thức trong
+`TENSES`, chỉ mục TF-IDF của các cách dùng, chỉ mục dấu hiệu nhận biết (chấp nhận
+lỗi chính tả), và từ điển động từ. `load_assets()` là singleton cấp module theo
+phiên bản nội dung: mọi phiên và mọi lần rerun của app dùng chung một bản, nội
+dung đổi thì lần gọi kế tiếp dựng bản mới.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+from . import bundle, content
+from .formula import FormulaGrammar, compile_formula
+from .fuzzy import SignalIndex, signal_index
+from .lexicon import LEXICON, Lexicon
+from .rules import RULES, Rule
+from .similarity import UsageIndex, usage_index
+
+
+class AnswerKeys(NamedTuple):
+    summary: dict[tuple[str, str], FormulaGrammar]   # (group_key, form) -> văn phạm công thức
+
+
+class GradingAssets(NamedTuple):
+    rules: dict[tuple[str, str, str], Rule]
+    answer_keys: dict[str, AnswerKeys]              # tense_key -> đáp án chuẩn hoá
+    usage_index: UsageIndex                         # chấm "Cách dùng"
+    signal_index: SignalIndex                       # chấm "Dấu hiệu nhận biết"
+    lexicon: Lexicon                                # dạng bề mặt -> (nguyên mẫu, nhãn)
+
+
+def build_answer_keys(tenses: dict) -> dict[str, AnswerKeys]:
+    return {
+        tense.key: AnswerKeys(summary={key: compile_formula(formula) for key, formula in tense.formulas.items()})
+        for tense in tenses.values()
+    }
+
+
+def load_assets() -> GradingAssets:
+    return _load_assets(content.current().version)
+
+
+@lru_cache(maxsize=1)
+def _load_assets(version: str) -> GradingAssets:
+    answer_keys = bundle.load("answer_keys", version)
+    return GradingAssets(
+        rules=RULES,
+        answer_keys=answer_keys if answer_keys is not None else build_answer_keys(content.current().tenses),
+        usage_index=usage_index(),
+        signal_index=signal_index(),
+        lexicon=LEXICON,
+    )
@@ -0,0 +1,376 @@
+"""
+Chấm hàng loạt bài nộp của cả lớp (CSV/JSONL), không cần giao diện.
+
+Mỗi dòng là một câu ví dụ hoặc một công thức:
+- câu ví dụ: tense_key, group, form, sentence  -> `validate_example`
+- công thức: tense_key, [group, form,] formula  -> `formula_ok`
+  (không ghi group/form thì chỉ cần khớp một công thức bất kỳ của thì đó)
+
+Câu/công thức dài quá `--max-chars` ký tự (mặc định GRADER_MAX_CHARS hoặc 1000)
+không được chấm mà ghi lỗi vào cột `error`; dòng JSONL hỏng, không phải object
+hoặc có trường không phải chuỗi cũng vậy. Các cột khác (id, student...) được
+giữ nguyên trong kết quả. Toàn bộ là chuỗi
+generator: đọc một dòng, chấm, ghi một dòng, nên bộ nhớ không tăng theo cỡ file.
+
+File lớn (cả khoá thi) có thể chấm song song: `--workers N` chia dòng thành từng
+khối `--chunk-size` dòng, gửi cho N tiến trình (mỗi tiến trình nạp bảng luật và
+từ điển một lần), rồi trả kết quả đúng thứ tự dòng vào. Số khối đang chấm dở
+được giới hạn nên bộ nhớ vẫn không tăng theo cỡ file.
+
+`grade_items` chấm một lô mục lẻ {"check": "formula" | "usage" | "signal" |
+"example", ...}: app dùng khi chấm cả một phần, `grader.service` dùng cho /batch.
+Kết quả được nhớ trong `verdicts.verdict_cache` (dùng chung cả tiến trình), nên
+cùng một đáp án nộp lại chỉ chấm một lần.
+
+Chạy: python -m grader bai_nop.csv -o ket_qua.jsonl [--workers 4 --chunk-size 1000]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent import futures
+from itertools import islice
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from . import content, metrics, text
+from .checkers import formula_ok
+from .content import Tense, group_key
+from .formula import compile_formula
+from .fuzzy import signal_index
+from .rules import FORMS, validate_example
+from .text import normalize
+from .verdicts import verdict_cache
+
+FORMATS = ("csv", "jsonl")
+CHECKS = ("formula", "usage", "signal", "example")
+VERDICT_FIELDS = ("checker", "ok", "hint", "error")
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    return "csv"
+
+
+class BadLine(NamedTuple):
+    """Dòng JSONL không đọc được; `grade_row` ghi nó thành một dòng lỗi."""
+    line: int           # số thứ tự dòng trong file (từ 1)
+    error: str
+
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[dict | BadLine]:
+    """Đọc lần lượt từng dòng (dict) từ luồng CSV có header hoặc JSONL.
+
+    Dòng JSONL không phải JSON hợp lệ, hoặc không phải object, thành `BadLine`
+    thay vì dừng cả file.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for n, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield BadLine(n, f"dòng {n}: JSON không hợp lệ ({e.msg}, cột {e.colno})")
+                    continue
+                yield row if isinstance(row, dict) else BadLine(n, f"dòng {n}: không phải object JSON")
+    else:
+        raise ValueError(f"Định dạng không hỗ trợ: {fmt!r} (chỉ {', '.join(FORMATS)})")
+
+
+def formula_verdict(tense_key: str, group: str, form: str, formula: str):
+    group = group and group_key(group)
+    candidates = [
+        correct
+        for (g, f), correct in content.current().by_key[tense_key].formulas.items()
+        if (not group or g == group) and (not form or f == form)
+    ]
+    if not candidates:
+        raise KeyError(f"không có công thức cho group={group!r}, form={form!r}")
+    for correct in candidates:
+        if formula_ok(formula, correct):
+            return True, correct
+    return False, " | ".join(candidates)
+
+
+def _row_field(row: dict, name: str) -> str | None:
+    # ô trống của CSV là "" hoặc None; JSONL có thể ghi số, list...: báo lỗi dòng đó
+    value = row.get(name)
+    if value is not None and not isinstance(value, str):
+        raise KeyError(f"trường {name!r} phải là chuỗi")
+    return value
+
+
+def grade_row(row: dict | BadLine) -> dict:
+    """Chấm một dòng; lỗi dữ liệu được ghi vào cột `error` thay vì dừng cả file."""
+    if isinstance(row, BadLine):
+        return dict(checker="", ok=False, hint="", error=row.error)
+    if not isinstance(row, dict):
+        return dict(checker="", ok=False, hint="", error="mỗi dòng phải là một object JSON")
+    verdict = dict(row)
+    try:
+        tense_key = (_row_field(row, "tense_key") or "").strip()
+        group = (_row_field(row, "group") or "").strip()
+        form = (_row_field(row, "form") or "").strip()
+        sentence, formula = _row_field(row, "sentence"), _row_field(row, "formula")
+        if tense_key not in content.current().by_key:
+            raise KeyError(f"tense_key không hợp lệ: {tense_key!r}")
+        for name, value in (("sentence", sentence), ("formula", formula)):
+            if value and text.too_long(value):
+                raise KeyError(_too_long(name, value))
+        # CSV gộp cả hai cột: ưu tiên cột có nội dung, bỏ trống thì vẫn chấm (sai)
+        if sentence or (sentence is not None and not formula):
+            if form not in FORMS:
+                raise KeyError(f"form không hợp lệ: {form!r}")
+            result = example_verdict(tense_key, group_key(group or "verb"), form, sentence)
+            verdict.update(checker="example", ok=result["ok"], hint=result["hint"], error="")
+        elif formula is not None:
+            result = cached_formula_verdict(tense_key, group, form, None, formula)
+            verdict.update(checker="formula", ok=result["ok"], hint=result["hint"], error="")
+        else:
+            raise KeyError("thiếu cột 'sentence' hoặc 'formula'")
+    except KeyError as e:
+        verdict.update(checker="", ok=False, hint="", error=str(e.args[0]))
+    return verdict
+
+
+def grade_rows(rows: Iterable[dict | BadLine]) -> Iterator[dict]:
+    for row in rows:
+        yield grade_row(row)
+
+
+def _too_long(name: str, value: str) -> str:
+    return f"trường {name!r} quá dài ({len(value)} > {text.max_chars} ký tự)"
+
+
+# ---- chấm từng mục theo loại (app chấm cả phần, dịch vụ HTTP)
+def _field(payload: dict, name: str, default: str | None = None) -> str:
+    value = payload.get(name, default)
+    if value is None:
+        raise KeyError(f"thiếu trường {name!r}")
+    if not isinstance(value, str):
+        raise KeyError(f"trường {name!r} phải là chuỗi")
+    if text.too_long(value):
+        raise KeyError(_too_long(name, value))
+    return value
+
+
+def _tense(payload: dict) -> Tense:
+    tense_key = _field(payload, "tense_key")
+    tense = content.current().by_key.get(tense_key)
+    if tense is None:
+        raise KeyError(f"tense_key không hợp lệ: {tense_key!r}")
+    return tense
+
+
+def _formula_key(formula: str) -> str:
+    # công thức cần "?" và ngoặc (chuẩn hoá làm mất), chỉ bỏ hoa/thường và khoảng trắng thừa
+    return " ".join(formula.lower().split())
+
+
+def cached_formula_verdict(tense_key: str, group: str, form: str, correct: str | None, formula: str) -> dict:
+    """So với `correct` nếu có, nếu không thì với các công thức của (thì, group, form)."""
+    group = group_key(group) if group else ""
+    key = ("formula", tense_key, group, form, correct, _formula_key(formula))
+    return verdict_cache.get(key, lambda: _formula_result(tense_key, group, form, correct, formula))
+
+
+def _formula_result(tense_key: str, group: str, form: str, correct: str | None, formula: str) -> dict:
+    if correct is not None:
+        result = {"ok": formula_ok(formula, correct)}
+    else:
+        ok, correct = formula_verdict(tense_key, group, form, formula)
+        result = {"ok": ok, "hint": correct}
+    if not result["ok"] and " | " not in correct:
+        # chỉ có một đáp án để so: nói rõ ô nào thiếu/sai
+        result["problem"] = compile_formula(correct).check(formula).message
+    return result
+
+
+def check_formula(payload: dict) -> dict:
+    formula = _field(payload, "formula")
+    if "correct" in payload:
+        return cached_formula_verdict("", "", "", _field(payload, "correct"), formula)
+    return cached_formula_verdict(_tense(payload).key, _field(payload, "group", ""), _field(payload, "form", ""),
+                                  None, formula)
+
+
+def check_usage(payload: dict) -> dict:
+    from .similarity import USAGE_THRESHOLD, usage_index     # NumPy: chỉ nạp khi có mục "usage"
+
+    tense, text = _tense(payload), normalize(_field(payload, "text"))
+    index = usage_index()
+    usage = _field(payload, "usage") if "usage" in payload else None
+    usages = [usage] if usage is not None else tense.uses
+    if any(u not in index.usage_ids for u in usages):
+        raise KeyError("usage không có trong TENSES")
+
+    def grade() -> dict:
+        match = index.match(text, usages)
+        ok = match.score >= USAGE_THRESHOLD
+        result = {"ok": ok, "score": round(match.score, 4), "usage": match.usage}
+        if not ok:
+            best = index.best(text)
+            if best.score >= USAGE_THRESHOLD:
+                result["best_tense"] = best.tense_key
+        return result
+    return verdict_cache.get(("usage", tense.key, "", "", usage, text.text), grade)
+
+
+def check_signal(payload: dict) -> dict:
+    text = normalize(_field(payload, "text"))
+    index = signal_index()
+    signal = tense_key = None
+    if "signal" in payload:
+        signal = _field(payload, "signal")
+        wanted = {signal}
+    elif "tense_key" in payload:
+        tense = _tense(payload)
+        tense_key, wanted = tense.key, set(tense.signals)
+    else:
+        wanted = set(index.signals)
+
+    def grade() -> dict:
+        matches = index.lookup(text)
+        hit = next((m for m in matches if m.signal in wanted), None)
+        return {
+            "ok": hit is not None,
+            "signal": hit.signal if hit else "",
+            "distance": hit.distance if hit else None,
+            "tenses": list(index.tenses_for(text)),
+        }
+    return verdict_cache.get(("signal", tense_key, "", "", signal, text.text), grade)
+
+
+def example_verdict(tense_key: str, group: str, form: str, sentence: str) -> dict:
+    text = normalize(sentence)
+
+    def grade() -> dict:
+        ok, hint = validate_example(tense_key, group, form, text)
+        return {"ok": bool(ok), "hint": hint}
+    return verdict_cache.get(("example", tense_key, group, form, None, text.text), grade)
+
+
+def check_example(payload: dict) -> dict:
+    tense = _tense(payload)
+    form = _field(payload, "form")
+    if form not in FORMS:
+        raise KeyError(f"form không hợp lệ: {form!r}")
+    return example_verdict(tense.key, group_key(_field(payload, "group", "verb")), form,
+                           _field(payload, "sentence"))
+
+
+CHECKERS = {"formula": check_formula, "usage": check_usage, "signal": check_signal, "example": check_example}
+
+
+def grade_item(check: str, payload: dict) -> dict:
+    """Chấm một yêu cầu; lỗi dữ liệu được trả về trong "error" thay vì ném ra."""
+    try:
+        if not isinstance(payload, dict):
+            raise KeyError("mỗi yêu cầu phải là một object JSON")
+        if check not in CHECKERS:
+            raise KeyError(f"check không hợp lệ: {check!r} (chỉ {', '.join(CHECKS)})")
+        return CHECKERS[check](payload)
+    except KeyError as e:
+        return {"ok": False, "error": str(e.args[0])}
+
+
+def grade_items(items: list) -> list[dict]:
+    """Chấm cả lô mục {"check": ..., ...}; kết quả đúng thứ tự."""
+    return [grade_item(item.get("check", "") if isinstance(item, dict) else "", item) for item in items]
+
+
+def _init_worker(max_chars: int) -> None:
+    # dòng bài nộp chỉ là câu ví dụ/công thức: bảng luật và từ điển đã có từ lúc import
+    # (lấy từ gói `bundle` nếu có), không cần chỉ mục cách dùng/dấu hiệu
+    text.set_max_chars(max_chars)
+
+
+def _grade_chunk(rows: list[dict | BadLine]) -> list[dict]:
+    return [grade_row(row) for row in rows]
+
+
+def grade_rows_parallel(rows: Iterable[dict | BadLine], workers: int | None = None,
+                        chunk_size: int = 1000) -> Iterator[dict]:
+    """Như `grade_rows` nhưng chấm trên nhiều tiến trình; kết quả giữ đúng thứ tự dòng vào."""
+    workers = workers or os.cpu_count() or 1
+    rows = iter(rows)
+    pool = futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(text.max_chars,))
+    try:
+        # mỗi tiến trình giữ tối đa hai khối: đủ để không phải chờ, không đọc trước cả file
+        pending = deque()
+        while chunk := list(islice(rows, chunk_size)):
+            pending.append(pool.submit(_grade_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def grade_file(path: str, fmt: str | None = None, workers: int = 1, chunk_size: int = 1000) -> Iterator[dict]:
+    """Chấm từng dòng của file bài nộp, trả về kết quả dạng generator."""
+    fmt = fmt or detect_format(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if workers == 1:
+            yield from grade_rows(read_rows(f, fmt))
+        else:
+            yield from grade_rows_parallel(read_rows(f, fmt), workers, chunk_size)
+
+
+def write_verdicts(verdicts: Iterable[dict], out: IO[str], fmt: str) -> int:
+    """Ghi kết quả ngay khi có (CSV hoặc JSONL); trả về số dòng đã ghi."""
+    n = 0
+    writer = None
+    for verdict in verdicts:
+        if fmt == "jsonl":
+            out.write(json.dumps(verdict, ensure_ascii=False) + "\n")
+        else:
+            if writer is None:
+                fields = [k for k in verdict if k not in VERDICT_FIELDS] + list(VERDICT_FIELDS)
+                writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(verdict)
+        n += 1
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m grader", description="Chấm hàng loạt file bài nộp.")
+    ap.add_argument("input", help="file CSV (có header) hoặc JSONL")
+    ap.add_argument("-o", "--output", help="file kết quả (mặc định: stdout)")
+    ap.add_argument("--input-format", choices=FORMATS, help="mặc định: đoán theo đuôi file")
+    ap.add_argument("--output-format", choices=FORMATS, help="mặc định: đoán theo đuôi file, stdout là jsonl")
+    ap.add_argument("--workers", type=int, default=1, help="số tiến trình chấm (0: số CPU)")
+    ap.add_argument("--chunk-size", type=int, default=1000, help="số dòng mỗi khối gửi cho một tiến trình")
+    ap.add_argument("--metrics", metavar="FILE", help="đo đạc khi chấm, ghi số đo (Prometheus) vào FILE")
+    ap.add_argument("--max-chars", type=int, default=text.max_chars,
+                    help="độ dài tối đa của một câu/công thức (mặc định: %(default)s)")
+    args = ap.parse_args(argv)
+    text.set_max_chars(args.max_chars)
+    if args.metrics:
+        if args.workers != 1:
+            ap.error("--metrics chỉ đo được trong một tiến trình (--workers 1)")
+        metrics.enable()
+
+    out_fmt = args.output_format or (detect_format(args.output) if args.output else "jsonl")
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        n = write_verdicts(grade_file(args.input, args.input_format, args.workers, args.chunk_size), out, out_fmt)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed > 0 else float("inf")
+    print(f"{n} dòng trong {elapsed:.2f}s ({rate:,.0f} dòng/s)", file=sys.stderr)
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(metrics.render())
+    return 0
@@ -0,0 +1,189 @@
+"""
+Gói dữ liệu chấm dựng sẵn, để tiến trình mới (khởi động lại server, một lần chạy
+CLI, một worker trong pool) không phải tự dựng lại mọi thứ lúc khởi động.
+
+Gói là một file duy nhất (mặc định grader/data/bundle.bin), gồm các phần:
+- lexicon: chỉ mục dạng bề mặt của từ điển động từ và bảng IRREG (`lexicon`)
+- answer_keys: văn phạm đã dịch của mọi công thức đáp án (`formula`, `assets`)
+- usage_index: chỉ mục TF-IDF các cách dùng (`similarity`, cần NumPy)
+- signal_index: chỉ mục dấu hiệu nhận biết chấp nhận lỗi chính tả (`fuzzy`)
+
+File được ánh xạ bộ nhớ (mmap); đầu file là mục lục nhỏ, mỗi phần là một khối
+pickle riêng, chỉ giải khi được hỏi lần đầu (nên chưa chấm "Cách dùng" thì chưa
+nạp NumPy). Bảng luật `validate_example` là các hàm đóng, không tuần tự hoá được:
+vẫn dựng lúc import (khoảng 1 ms).
+
+Mỗi phần ghi kèm dấu vân tay đầu vào: mã nguồn dựng nó (`SCHEMA` và băm các module
+liên quan) và dữ liệu (file động từ; phiên bản nội dung `content`). Lệch dấu vân
+tay (sửa dữ liệu, nạp lại nóng, đổi code) thì phần đó bị bỏ qua và được dựng như
+chưa có gói: gói cũ chỉ làm chậm, không làm sai. Gói là mã tin cậy như chính
+package (pickle); đừng trỏ GRADER_BUNDLE tới file lạ.
+
+Dựng:  python -m grader.bundle build      (xem: python -m grader.bundle info)
+Đổi đường dẫn bằng GRADER_BUNDLE; GRADER_BUNDLE=0 thì không dùng gói.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+from functools import lru_cache
+
+SCHEMA = 1
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_PATH = os.path.join(DATA_DIR, "bundle.bin")
+MAGIC = b"GRBUNDLE"
+_HEADER = struct.Struct("<8sQ")     # magic, độ dài mục lục
+# mã nguồn quyết định nội dung các phần: đổi một file là cả gói hết hạn
+_SOURCES = ("bundle.py", "text.py", "lexicon.py", "formula.py", "similarity.py", "fuzzy.py", "assets.py")
+_VERB_FILES = ("irregular_verbs.txt", "regular_verbs.txt")
+
+
+def _path() -> str | None:
+    path = os.environ.get("GRADER_BUNDLE", DEFAULT_PATH)
+    return None if path.lower() in ("", "0", "off", "false") else path
+
+
+def _digest(paths) -> str:
+    h = hashlib.sha1()
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"\0missing\0")
+    return h.hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    here = os.path.dirname(__file__)
+    return f"{SCHEMA}-{_digest(os.path.join(here, name) for name in _SOURCES)}"
+
+
+@lru_cache(maxsize=1)
+def lexicon_inputs() -> str:
+    """Dấu vân tay của từ điển động từ (các phần khác dùng phiên bản nội dung)."""
+    return _digest(os.path.join(DATA_DIR, name) for name in _VERB_FILES)
+
+
+class Bundle:
+    """Một file gói đã mở: mục lục đọc ngay, các phần giải khi được hỏi."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: không phải gói dữ liệu chấm")
+        header = pickle.loads(self._map[_HEADER.size:_HEADER.size + size])
+        self.schema: int = header["schema"]
+        self.code: str = header["code"]
+        self.built: float = header["built"]
+        self.sections: dict[str, tuple[int, int, str]] = header["sections"]   # tên -> (vị trí, độ dài, đầu vào)
+        self._loaded: dict[str, object] = {}
+
+    def section(self, name: str, inputs: str):
+        """Nội dung phần `name` nếu dựng từ đúng `inputs` và đúng mã nguồn hiện tại, không thì None."""
+        entry = self.sections.get(name)
+        if entry is None or entry[2] != inputs or self.code != code_fingerprint():
+            return None
+        if name not in self._loaded:
+            offset, length, _ = entry
+            try:
+                self._loaded[name] = pickle.loads(memoryview(self._map)[offset:offset + length])
+            except (EOFError, ValueError, pickle.UnpicklingError):    # file cụt / hỏng: dựng như chưa có gói
+                return None
+        return self._loaded[name]
+
+
+@lru_cache(maxsize=1)
+def _open(path: str) -> Bundle | None:
+    try:
+        return Bundle(path)
+    except (OSError, ValueError, EOFError, struct.error, pickle.UnpicklingError):
+        return None
+
+
+def load(name: str, inputs: str):
+    """Phần `name` của gói (None nếu không có gói, hoặc gói lệch `inputs`/mã nguồn: tự dựng như cũ)."""
+    path = _path()
+    bundle = _open(path) if path else None
+    return bundle.section(name, inputs) if bundle is not None else None
+
+
+def build(path: str | None = None) -> dict[str, int]:
+    """Dựng mọi phần từ dữ liệu hiện tại và ghi gói (thay nguyên tử); trả về cỡ từng phần (byte)."""
+    from . import content                                   # dựng lúc build: nạp đủ mọi module
+    from .assets import build_answer_keys
+    from .fuzzy import build_signal_index
+    from .lexicon import IRREG, load_lexicon
+    from .similarity import build_usage_index
+
+    path = path or _path() or DEFAULT_PATH
+    current = content.current()
+    parts = {
+        "lexicon": (lexicon_inputs(), (load_lexicon(), IRREG)),
+        "answer_keys": (current.version, build_answer_keys(current.tenses)),
+        "usage_index": (current.version, build_usage_index(current.tenses)),
+        "signal_index": (current.version, build_signal_index(current.tenses)),
+    }
+    blobs = {name: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for name, (_, value) in parts.items()}
+    built = time.time()
+
+    def header(start: int) -> bytes:
+        sections, offset = {}, start
+        for name, blob in blobs.items():
+            sections[name] = (offset, len(blob), parts[name][0])
+            offset += len(blob)
+        return pickle.dumps({"schema": SCHEMA, "code": code_fingerprint(), "built": built, "sections": sections},
+                            protocol=pickle.HIGHEST_PROTOCOL)
+
+    # các vị trí nằm sau mục lục nên phụ thuộc độ dài của chính nó: lặp tới khi ổn định
+    head = header(_HEADER.size)
+    while len(again := header(_HEADER.size + len(head))) != len(head):
+        head = again
+    head = again
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(head)))
+        f.write(head)
+        for blob in blobs.values():
+            f.write(blob)
+    os.replace(tmp, path)
+    _open.cache_clear()
+    return {name: len(blob) for name, blob in blobs.items()}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m grader.bundle", description="Dựng / xem gói dữ liệu chấm dựng sẵn.")
+    ap.add_argument("command", choices=("build", "info"))
+    ap.add_argument("-o", "--output", help=f"đường dẫn gói (mặc định: GRADER_BUNDLE hoặc {DEFAULT_PATH})")
+    args = ap.parse_args(argv)
+
+    path = args.output or _path() or DEFAULT_PATH
+    if args.command == "build":
+        start = time.perf_counter()
+        sizes = build(path)
+        print(f"{path}: {sum(sizes.values()) / 1024:.0f} KiB trong {(time.perf_counter() - start) * 1e3:.0f} ms")
+        for name, size in sizes.items():
+            print(f"  {name:<14} {size / 1024:>7.1f} KiB")
+        return 0
+    bundle = _open(path)
+    if bundle is None:
+        print(f"{path}: chưa có gói (hoặc file hỏng); dựng bằng: python -m grader.bundle build", file=sys.stderr)
+        return 1
+    fresh = bundle.code == code_fingerprint()
+    print(f"{path}: schema {bundle.schema}, mã nguồn {'khớp' if fresh else 'đã đổi (gói bị bỏ qua)'}, "
+          f"dựng lúc {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(bundle.built))}")
+    for name, (_, length, inputs) in bundle.sections.items():
+        print(f"  {name:<14} {length / 1024:>7.1f} KiB  đầu vào {inputs}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,52 @@
+import re
+
+from . import metrics
+from .formula import compile_formula
+from .text import NormalizedText, normalize
+
+
+@metrics.timed("usage_ok")
+def usage_ok(user_input: str | NormalizedText, correct_usages: list[str]) -> bool:
+    """
+    Kiểm tra cách dùng bằng độ tương đồng TF-IDF (xem `similarity`) thay vì so khớp toàn bộ câu.
+    - user_input: người dùng nhập
+    - correct_usages: danh sách đáp án mẫu (chuẩn)
+    Đúng nếu khớp một đáp án mẫu với điểm >= USAGE_THRESHOLD.
+    """
+    from .similarity import USAGE_THRESHOLD, index_for     # NumPy: chỉ nạp khi chấm cách dùng lần đầu
+
+    usages = tuple(correct_usages)
+    return index_for(usages).match(user_input, usages).score >= USAGE_THRESHOLD
+
+
+@metrics.timed("formula_ok")
+def formula_ok(user_input: str | NormalizedText, correct: str) -> bool:
+    """
+    So khớp công thức theo văn phạm ô (xem `formula`):
+    - Nhóm lựa chọn am/is/are, do/does, was/were, have/has: viết một hay cả nhóm đều được
+    - Nhận V(s/es)/Vs (hoặc V trần), V-ing/Ving, V2/V-ed, V3; not hoặc dạng rút gọn (won't, doesn't...)
+    - Đúng thứ tự ô, có "?" với câu hỏi; không phân biệt hoa/thường, dấu "+", khoảng trắng
+    Muốn biết sai ở ô nào thì dùng `check_formula`.
+    """
+    return compile_formula(correct).check(user_input).ok
+
+
+@metrics.timed("any_match")
+def any_match(text: str | NormalizedText, patterns):
+    t = normalize(text).text
+    if metrics.enabled:
+        return _any_match_counted(t, patterns)
+    for p in patterns:
+        if re.search(p, t):
+            return True
+    return False
+
+
+def _any_match_counted(t: str, patterns) -> bool:
+    # như any_match, thêm đếm khớp/trượt cho từng mẫu đã thử
+    for p in patterns:
+        hit = re.search(p, t) is not None
+        metrics.count("grader_pattern_total", (("pattern", p), ("result", "hit" if hit else "miss")))
+        if hit:
+            return True
+    return False
@@ -0,0 +1,158 @@
+"""
+Nhận diện thì của một câu bất kỳ ("câu này thuộc thì nào?").
+
+Thay vì gọi `validate_example` cho cả 12 thì × 2 nhóm × 3 dạng, câu được chuẩn hoá
+và tách từ một lần, rồi quét một lượt: mỗi từ được tra bảng để biết là trợ động
+từ (will/have/had/been/be...), phủ định, hay dạng động từ (V-ing, V2, V3). Chuỗi
+trợ động từ thu được quyết định thì; dạng câu suy từ vị trí trợ động từ và "not".
+"""
+from typing import NamedTuple
+
+from . import metrics
+from .lexicon import LEXICON, V, V2, V3, VING
+from .text import NormalizedText, normalize
+
+# Nhãn trợ động từ
+WILL, HAVE, HAD, BE, BEEN, BE_NOW, BE_PAST, DO, DID = (
+    "will", "have", "had", "be", "been", "be_now", "be_past", "do", "did"
+)
+
+AUX = {
+    "will": WILL, "shall": WILL, "ll": WILL,
+    "have": HAVE, "has": HAVE, "ve": HAVE,
+    "had": HAD,
+    "be": BE, "been": BEEN,
+    "am": BE_NOW, "is": BE_NOW, "are": BE_NOW, "m": BE_NOW, "re": BE_NOW, "s": BE_NOW,
+    "was": BE_PAST, "were": BE_PAST,
+    "do": DO, "does": DO, "did": DID,
+}
+# Dạng rút gọn phủ định sau `norm`: "don't" -> "don t", "won't" -> "won t"...
+NEG_AUX = {
+    "don": DO, "doesn": DO, "didn": DID,
+    "isn": BE_NOW, "aren": BE_NOW, "wasn": BE_PAST, "weren": BE_PAST,
+    "haven": HAVE, "hasn": HAVE, "hadn": HAD,
+    "won": WILL, "shan": WILL,
+}
+WH_WORDS = frozenset({"what", "where", "when", "why", "who", "whom", "whose", "which", "how"})
+# Từ đuôi -ing/-ed/-en không phải dạng động từ (kể cả danh từ trùng dạng V-ing: building)
+NOT_VERB_FORMS = frozenset({
+    "thing", "something", "nothing", "anything", "everything", "morning", "evening",
+    "during", "king", "ring", "sing", "bring", "spring", "string", "swing", "wing",
+    "ceiling", "building", "wedding", "red", "bed", "need", "seed", "feed", "speed",
+    "ten", "then", "when", "often", "open", "garden", "kitchen", "children", "chicken",
+    "listen", "happen", "eleven", "seven", "even", "women", "men", "town", "down", "own",
+})
+
+_tags = LEXICON.tags
+
+
+class TenseGuess(NamedTuple):
+    tense_key: str   # "" nếu không nhận diện được
+    group: str       # 'verb' | 'tobe'
+    form: str        # 'Khẳng định' | 'Phủ định' | 'Nghi vấn'
+    confidence: float
+
+
+# Từ có trong từ điển động từ: một lần tra; từ lạ: đoán theo đuôi
+def _is_ving(w: str) -> bool:
+    if w in NOT_VERB_FORMS:
+        return False
+    tags = _tags(w)
+    return bool(tags & VING) if tags else len(w) > 4 and w.endswith("ing")
+
+
+def _is_v3(w: str) -> bool:
+    if w in NOT_VERB_FORMS:
+        return False
+    tags = _tags(w)
+    return bool(tags & V3) if tags else len(w) > 3 and w.endswith(("ed", "en", "wn"))
+
+
+def _is_v2(w: str) -> bool:
+    # dạng trùng nguyên mẫu (read, put, cut) không đủ để kết luận quá khứ
+    if w in NOT_VERB_FORMS:
+        return False
+    tags = _tags(w)
+    return tags & (V2 | V) == V2 if tags else len(w) > 3 and w.endswith("ed")
+
+
+@metrics.timed("classify_tense")
+def classify_tense(sentence: str | NormalizedText) -> TenseGuess:
+    """Đoán thì, nhóm, dạng câu và độ tin cậy (0..1) của một câu (hoặc NormalizedText đã chuẩn hoá sẵn)."""
+    t = normalize(sentence)
+    tokens = t.tokens
+    if not tokens:
+        return TenseGuess("", "verb", "Khẳng định", 0.0)
+
+    # ---- một lượt quét: chuỗi trợ động từ + các dạng động từ phía sau
+    chain: list[str] = []
+    first_aux_at = -1
+    negative = False
+    ving = v3 = v2 = False
+    for i, w in enumerate(tokens):
+        aux = AUX.get(w)
+        if aux is None and w in NEG_AUX and i + 1 < len(tokens) and tokens[i + 1] == "t":
+            aux, negative = NEG_AUX[w], True
+        if aux is not None and not (aux == HAD and chain and chain[-1] in (HAVE, HAD)):
+            # "'s" + been/V3 là "has", không phải "is"
+            if w == "s" and i + 1 < len(tokens) and (tokens[i + 1] == "been" or _is_v3(tokens[i + 1])):
+                aux = HAVE
+            if first_aux_at < 0:
+                first_aux_at = i
+            chain.append(aux)
+            continue
+        if w == "not":
+            negative = True
+        elif _is_ving(w):
+            ving = True
+        else:
+            v3 = v3 or _is_v3(w)
+            v2 = v2 or _is_v2(w)
+
+    question = t.raw.rstrip().endswith("?") or first_aux_at == 0 or (
+        first_aux_at == 1 and tokens[0] in WH_WORDS
+    )
+    form = "Nghi vấn" if question else ("Phủ định" if negative else "Khẳng định")
+
+    # ---- chuỗi trợ động từ -> thì
+    has = set(chain)
+    group = "verb"
+    if WILL in has:
+        if HAVE in has and BEEN in has and ving:
+            tense, conf = "future_perfect_continuous", 0.95
+        elif HAVE in has:
+            tense, conf = "future_perfect", 0.9 if v3 or BEEN in has else 0.7
+        elif BE in has and ving:
+            tense, conf = "future_continuous", 0.9
+        else:
+            tense, conf = "future_simple", 0.85
+    elif HAVE in has and (v3 or BEEN in has):
+        if BEEN in has and ving:
+            tense, conf = "present_perfect_continuous", 0.95
+        else:
+            tense, conf = "present_perfect", 0.9
+    elif HAD in has and (v3 or BEEN in has):
+        if BEEN in has and ving:
+            tense, conf = "past_perfect_continuous", 0.95
+        else:
+            tense, conf = "past_perfect", 0.9
+    elif BE_NOW in has:
+        if ving:
+            tense, conf = "present_continuous", 0.9
+        else:
+            tense, conf, group = "present_simple", 0.85, "tobe"
+    elif BE_PAST in has:
+        if ving:
+            tense, conf = "past_continuous", 0.9
+        else:
+            tense, conf, group = "past_simple", 0.85, "tobe"
+    elif DO in has:
+        tense, conf = "present_simple", 0.9 if form != "Khẳng định" else 0.7
+    elif DID in has or HAD in has:
+        tense, conf = "past_simple", 0.9 if DID in has and form != "Khẳng định" else 0.6
+    elif v2:
+        tense, conf = "past_simple", 0.75
+    else:
+        # không trợ động từ, không dấu hiệu quá khứ: mặc định hiện tại đơn
+        tense, conf = "present_simple", 0.6 if HAVE not in has else 0.5
+    return TenseGuess(tense, group, form, conf)
@@ -0,0 +1,207 @@
+"""
+Nội dung 12 thì: công thức, cách dùng, dấu hiệu nhận biết, đọc từ
+grader/data/tenses.json (đổi đường dẫn bằng GRADER_CONTENT).
+
+File có số phiên bản schema và được kiểm tra khi nạp (`validate`):
+
+    {"schema": 1, "tenses": [{"key": "present_simple", "name": "Hiện tại đơn (...)",
+      "summary": {"<nhóm>": {"Khẳng định" | "Phủ định" | "Nghi vấn": "<công thức>"}},
+      "uses": ["..."], "signals": ["..."]}, ...]}
+
+Lỗi nói rõ chỗ sai ("tenses[3].summary: ..."). Mỗi thì thành một `Tense` bất biến,
+kèm sẵn bảng công thức theo (mã nhóm, dạng). Công thức, cách dùng, dấu hiệu của các
+thì đã có sửa thẳng trong file; thì mới (hay cấu trúc mới như bị động, câu điều
+kiện) còn cần luật câu ví dụ trong `rules._SPECS`, và mọi từ của công thức phải có
+trong văn phạm `formula` (từ "if", "would"... chưa có). Thiếu một trong hai thì file
+bị từ chối khi nạp, thay vì chấm sai âm thầm.
+
+Nạp lại nóng: `current()` xem mtime của file (nhiều nhất mỗi GRADER_CONTENT_RELOAD
+giây, mặc định 2; 0: không xem lại) và nạp lại khi file đổi, không cần khởi động
+lại server, phiên Streamlit vẫn giữ nguyên. Bản mới thay bản cũ bằng một phép gán
+nên luồng đang chấm luôn thấy một bản trọn vẹn; các chỉ mục dựng từ nội dung
+(`assets`, chỉ mục cách dùng/dấu hiệu, bộ nhớ đệm kết quả) gắn với `version` nên
+tự dựng lại. File sửa dở bị lỗi thì vẫn chạy bản cũ, lỗi ghi ở `last_error`.
+
+`content.TENSES`, `content.TENSES_BY_KEY`, `content.TENSE_NAMES` (và cùng tên trong
+`grader`) luôn là bản mới nhất; `from .content import TENSES` chỉ là ảnh chụp lúc import.
+Trên đường nóng dùng thẳng `current().by_key` (thuộc tính module đi qua `__getattr__`,
+chậm hơn vài lần).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from .formula import unknown_words
+from .rules import FORMS, RULES
+
+SCHEMA = 1
+DATA_PATH = os.environ.get("GRADER_CONTENT") or os.path.join(os.path.dirname(__file__), "data", "tenses.json")
+RELOAD_INTERVAL = float(os.environ.get("GRADER_CONTENT_RELOAD") or 2)
+_FIELDS = ("key", "name", "summary", "uses", "signals")
+
+
+class ContentError(ValueError):
+    """File nội dung không đọc được hoặc sai schema."""
+
+
+class Tense(NamedTuple):
+    key: str
+    name: str                                       # tên hiển thị (VN trước, EN trong ngoặc)
+    summary: Mapping[str, Mapping[str, str]]        # nhóm -> dạng -> công thức, theo thứ tự file
+    uses: tuple[str, ...]
+    signals: tuple[str, ...]
+    formulas: Mapping[tuple[str, str], str]         # (mã nhóm, dạng) -> công thức
+
+
+class Content(NamedTuple):
+    version: str                    # băm nội dung file
+    path: str
+    mtime_ns: int
+    tenses: dict[str, Tense]        # tên hiển thị -> Tense
+    by_key: dict[str, Tense]
+    names: dict[str, str]           # key -> tên hiển thị
+
+
+def group_key(group: str) -> str:
+    """Tên nhóm trong bảng tóm tắt -> mã nhóm cho validator ('verb' | 'tobe')."""
+    return "tobe" if "to be" in group.lower() or group == "tobe" else "verb"
+
+
+def _strings(value, where: str, allow_empty: bool = False) -> tuple[str, ...]:
+    if not isinstance(value, list) or not (value or allow_empty):
+        raise ContentError(f"{where}: cần danh sách chuỗi{'' if allow_empty else ' (không rỗng)'}")
+    for i, item in enumerate(value):
+        if not isinstance(item, str) or not item.strip():
+            raise ContentError(f"{where}[{i}]: cần chuỗi không rỗng")
+    return tuple(value)
+
+
+def _tense(raw, where: str) -> Tense:
+    if not isinstance(raw, dict):
+        raise ContentError(f"{where}: cần object")
+    missing = [f for f in _FIELDS if f not in raw]
+    unknown = sorted(set(raw) - set(_FIELDS))
+    if missing or unknown:
+        raise ContentError(f"{where}: thiếu {missing}" if missing else f"{where}: trường lạ {unknown}")
+    key, name, summary = raw["key"], raw["name"], raw["summary"]
+    if not isinstance(key, str) or not key.isidentifier() or not key.islower():
+        raise ContentError(f"{where}.key: cần mã dạng snake_case, có {key!r}")
+    if not isinstance(name, str) or not name.strip():
+        raise ContentError(f"{where}.name: cần chuỗi không rỗng")
+    if not isinstance(summary, dict) or not summary:
+        raise ContentError(f"{where}.summary: cần object nhóm -> dạng -> công thức")
+    formulas = {}
+    for group, by_form in summary.items():
+        at = f"{where}.summary[{group!r}]"
+        if not isinstance(by_form, dict) or not by_form:
+            raise ContentError(f"{at}: cần object dạng -> công thức")
+        for form, formula in by_form.items():
+            if form not in FORMS:
+                raise ContentError(f"{at}: dạng {form!r} không hợp lệ (chỉ {', '.join(FORMS)})")
+            if not isinstance(formula, str) or not formula.strip():
+                raise ContentError(f"{at}[{form!r}]: cần công thức")
+            if (group_key(group), form) in formulas:
+                raise ContentError(f"{at}: trùng nhóm {group_key(group)!r} với một nhóm trước")
+            unknown = unknown_words(formula)
+            if unknown:
+                raise ContentError(f"{at}[{form!r}]: công thức có từ {', '.join(map(repr, unknown))} "
+                                   f"không chấm được (chưa có trong văn phạm `formula`)")
+            if (key, group_key(group), form) not in RULES:
+                raise ContentError(f"{at}[{form!r}]: chưa có luật câu ví dụ cho "
+                                   f"({key!r}, {group_key(group)!r}, {form!r}) trong `rules._SPECS`")
+            formulas[(group_key(group), form)] = formula
+    return Tense(
+        key=key,
+        name=name,
+        summary=MappingProxyType({g: MappingProxyType(dict(f)) for g, f in summary.items()}),
+        uses=_strings(raw["uses"], f"{where}.uses"),
+        signals=_strings(raw["signals"], f"{where}.signals", allow_empty=True),
+        formulas=MappingProxyType(formulas),
+    )
+
+
+def validate(data) -> list[Tense]:
+    """Kiểm tra dữ liệu đã đọc từ JSON theo schema; trả về các Tense theo thứ tự file."""
+    if not isinstance(data, dict):
+        raise ContentError("cần object {\"schema\", \"tenses\"}")
+    if data.get("schema") != SCHEMA:
+        raise ContentError(f"schema {data.get('schema')!r} không hỗ trợ (cần {SCHEMA})")
+    raw = data.get("tenses")
+    if not isinstance(raw, list) or not raw:
+        raise ContentError("tenses: cần danh sách (không rỗng)")
+    tenses = [_tense(t, f"tenses[{i}]") for i, t in enumerate(raw)]
+    for field in ("key", "name"):
+        seen = set()
+        for i, t in enumerate(tenses):
+            if getattr(t, field) in seen:
+                raise ContentError(f"tenses[{i}].{field}: trùng {getattr(t, field)!r}")
+            seen.add(getattr(t, field))
+    return tenses
+
+
+def load_content(path: str = DATA_PATH) -> Content:
+    try:
+        with open(path, "rb") as f:
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            raw = f.read()
+        tenses = validate(json.loads(raw))
+    except (OSError, ValueError) as e:     # ContentError, JSONDecodeError, UnicodeDecodeError
+        raise ContentError(f"{path}: {e}") from e
+    return Content(
+        version=hashlib.sha1(raw).hexdigest()[:12],
+        path=path,
+        mtime_ns=mtime_ns,
+        tenses={t.name: t for t in tenses},
+        by_key={t.key: t for t in tenses},
+        names={t.key: t.name for t in tenses},
+    )
+
+
+_content = load_content()
+_checked = time.monotonic()
+_lock = threading.Lock()
+last_error = ""
+
+
+def current() -> Content:
+    """Nội dung đang dùng; nạp lại nếu file đã đổi (xem đầu module)."""
+    global _checked
+    if RELOAD_INTERVAL <= 0 or time.monotonic() - _checked < RELOAD_INTERVAL:
+        return _content
+    with _lock:
+        if time.monotonic() - _checked >= RELOAD_INTERVAL:
+            _checked = time.monotonic()
+            _reload_if_changed()
+    return _content
+
+
+def reload() -> Content:
+    """Nạp lại ngay nếu file đã đổi, không chờ hết RELOAD_INTERVAL."""
+    with _lock:
+        _reload_if_changed()
+    return _content
+
+
+def _reload_if_changed() -> None:
+    global _content, last_error
+    try:
+        if os.stat(_content.path).st_mtime_ns == _content.mtime_ns:
+            return
+        _content = load_content(_content.path)
+        last_error = ""
+    except (OSError, ContentError) as e:
+        last_error = str(e)
+
+
+def __getattr__(name: str):
+    if name == "TENSES":
+        return current().tenses
+    if name == "TENSES_BY_KEY":
+        return current().by_key
+    if name == "TENSE_NAMES":
+        return current().names
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
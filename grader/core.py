@@ -0,0 +1,12 @@
+"""
+Lõi chấm tối giản cho tiến trình cần khởi động nhanh (worker, CLI, dịch vụ).
+
+Chỉ gồm chuẩn hoá văn bản và các hàm chấm: import module này không kéo theo
+Streamlit, NumPy hay multiprocessing (NumPy chỉ nạp khi `usage_ok` được gọi lần
+đầu). Từ điển động từ và các chỉ mục lấy từ gói dựng sẵn nếu có (xem `bundle`).
+"""
+from .checkers import formula_ok, usage_ok
+from .rules import validate_example
+from .text import NormalizedText, norm, normalize
+
+__all__ = ["NormalizedText", "formula_ok", "norm", "normalize", "usage_ok", "validate_example"]
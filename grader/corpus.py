@@ -0,0 +1,266 @@
+"""
+Sinh câu tổng hợp có nhãn để chạy tải/fuzz các bộ chấm.
+
+Mỗi công thức trong `TENSES[...].summary` (S + have/has + not + V3,
+Will + S + be + V-ing ?...) được phân tích một lần thành các ô (chủ ngữ, trợ
+động từ, not, V/V-s/V-ing/V2/V3), rồi điền bằng chủ ngữ, động từ trong từ điển
+(bất quy tắc lẫn có quy tắc) và dấu hiệu nhận biết của thì đó. Ngoài câu đúng,
+bộ sinh còn tạo câu sai theo các lỗi điển hình:
+
+- wrong_aux: sai trợ động từ (has -> had, will -> would, is -> was...)
+- missing_not: câu phủ định quên "not"
+- v2_for_v3: dùng V2 thay V3 (have went)
+- base_for_ving: dùng V nguyên mẫu thay V-ing (is go)
+- v2_for_base: dùng V2 sau did (did not went)
+
+`generate(seed)` là generator vô hạn (hoặc tới `limit`), tất định theo seed và
+không giữ câu nào trong bộ nhớ, nên có thể đổ hàng triệu dòng vào benchmark
+hoặc `grade_rows` (qua `as_rows`).
+
+Chạy: python -m grader.corpus -n 100000 --seed 1 -o de_thi.jsonl
+"""
+import argparse
+import csv
+import json
+import random
+import re
+import sys
+from functools import lru_cache
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from . import content
+from .content import Tense, group_key
+from .lexicon import past_regular, present_participle, read_irregular, read_regular, third_person
+
+MUTATIONS = ("wrong_aux", "missing_not", "v2_for_v3", "base_for_ving", "v2_for_base")
+ROW_FIELDS = ("tense_key", "group", "form", "sentence", "expected", "mutation")
+
+# Chủ ngữ và ngôi: "1" (I), "3" (ngôi ba số ít), "p" (you/số nhiều)
+SUBJECTS = (
+    ("I", "1"), ("you", "p"), ("he", "3"), ("she", "3"), ("we", "p"), ("they", "p"),
+    ("my brother", "3"), ("Lan", "3"), ("our teacher", "3"), ("the children", "p"),
+    ("Nam and Hoa", "p"), ("my parents", "p"),
+)
+_AGREEMENT = {
+    "do/does": {"1": "do", "3": "does", "p": "do"},
+    "am/is/are": {"1": "am", "3": "is", "p": "are"},
+    "was/were": {"1": "was", "3": "was", "p": "were"},
+    "have/has": {"1": "have", "3": "has", "p": "have"},
+}
+_WRONG_AUX = {
+    "do": "did", "does": "did", "did": "does", "am": "was", "is": "was", "are": "were",
+    "was": "is", "were": "are", "have": "had", "has": "had", "had": "has", "will": "would",
+}
+VERB_TAILS = ("", "", "with my friends", "at school", "in the garden", "quietly")
+TOBE_TAILS = ("happy", "at home", "at the library", "very busy", "in the garden", "late")
+# Dấu hiệu cần thêm vế sau mới thành câu
+SIGNAL_PHRASES = {
+    "for": "for two hours", "since": "since Monday", "until": "until midnight",
+    "while": "while we were talking", "before": "before dinner", "after": "after school",
+    "ago": "two days ago",
+    ("past_perfect", "by the time"): "by the time we arrived",
+    ("future_perfect", "by the time"): "by the time you arrive",
+}
+# Dấu hiệu chỉ hợp với một số dạng câu
+SIGNAL_FORMS = {"yet": ("Phủ định", "Nghi vấn"), "ever": ("Nghi vấn",), "never": ()}
+
+
+class Sample(NamedTuple):
+    tense_key: str
+    group: str        # 'verb' | 'tobe'
+    form: str         # 'Khẳng định' | 'Phủ định' | 'Nghi vấn'
+    sentence: str
+    expected: bool    # câu có đúng với (thì, nhóm, dạng) không
+    mutation: str     # "" với câu đúng, một trong MUTATIONS với câu sai
+
+
+class Verb(NamedTuple):
+    base: str
+    vs: str
+    ving: str
+    v2: str
+    v3: str
+
+
+class Slot(NamedTuple):
+    tense_key: str
+    group: str
+    form: str
+    parts: tuple[str, ...]    # các ô của công thức, đã chữ thường
+    signals: tuple[str, ...]
+
+
+@lru_cache(maxsize=1)
+def verbs() -> tuple[tuple[Verb, ...], tuple[Verb, ...]]:
+    """(động từ bất quy tắc, động từ có quy tắc) với đủ năm dạng."""
+    def forms(base, v2, v3):
+        marked = base.endswith("+")
+        base = base.rstrip("+")
+        return Verb(base, third_person(base), present_participle(base, marked)[0],
+                    v2 or past_regular(base, marked)[0], v3 or past_regular(base, marked)[0])
+
+    irregular = tuple(
+        forms(base, v2.split("/")[0], v3.split("/")[0])
+        for base, v2, v3 in read_irregular() if base != "be"
+    )
+    regular = tuple(forms(base, "", "") for base in read_regular())
+    return irregular, regular
+
+
+def parse_formula(formula: str) -> tuple[str, ...]:
+    """'Will + S + be + V-ing ?' -> ('will', 's', 'be', 'v-ing', '?'); bỏ phần chú thích '(won't)'."""
+    formula = re.sub(r"\s\([^)]*\)", "", formula).replace("?", " ? ")
+    return tuple(part.lower() for chunk in formula.split("+") for part in chunk.split())
+
+
+def _usable_signals(tense: Tense) -> tuple[str, ...]:
+    return tuple(sig for sig in tense.signals if "+" not in sig)
+
+
+def slots() -> tuple[Slot, ...]:
+    return _slots(content.current().version)
+
+
+@lru_cache(maxsize=1)
+def _slots(version: str) -> tuple[Slot, ...]:
+    return tuple(
+        Slot(tense.key, group_key(group), form, parse_formula(formula), _usable_signals(tense))
+        for tense in content.current().tenses.values()
+        for group, formulas in tense.summary.items()
+        for form, formula in formulas.items()
+    )
+
+
+def _signal(rng: random.Random, slot: Slot) -> str:
+    choices = [s for s in slot.signals if slot.form in SIGNAL_FORMS.get(s, (slot.form,))]
+    if not choices or rng.random() < 0.3:
+        return ""
+    sig = rng.choice(choices)
+    sig = SIGNAL_PHRASES.get((slot.tense_key, sig)) or SIGNAL_PHRASES.get(sig, sig)
+    # "last night/week/year" -> "last week"
+    return " ".join(rng.choice(w.split("/")) if "/" in w else w for w in sig.split())
+
+
+def realize(rng: random.Random, slot: Slot) -> tuple[list[tuple[str, str]], Verb]:
+    """Điền các ô của công thức: danh sách (loại ô, từ) và động từ đã chọn."""
+    subject, person = rng.choice(SUBJECTS)
+    verb = rng.choice(rng.choice(verbs()))
+    words: list[tuple[str, str]] = []
+    for part in slot.parts:
+        if part == "s":
+            words.append(("S", subject))
+        elif part == "v":
+            words.append(("V", verb.base))
+        elif part == "v(s/es)":
+            words.append(("V", verb.vs if person == "3" else verb.base))
+        elif part == "v-ing":
+            words.append(("VING", verb.ving))
+        elif part == "v2/v-ed":
+            words.append(("V2", verb.v2))
+        elif part == "v3":
+            words.append(("V3", verb.v3))
+        elif part in _AGREEMENT:
+            words.append(("AUX", _AGREEMENT[part][person]))
+        elif part == "not":
+            words.append(("NOT", part))
+        elif part != "?":
+            words.append(("AUX" if part in _WRONG_AUX else "LIT", part))
+    if slot.group == "tobe":
+        words.append(("TAIL", rng.choice(TOBE_TAILS)))
+    else:
+        words.append(("TAIL", rng.choice(VERB_TAILS)))
+    words.append(("TAIL", _signal(rng, slot)))
+    return words, verb
+
+
+def mutate(words: list[tuple[str, str]], mutation: str, verb: Verb) -> list[tuple[str, str]] | None:
+    """Áp một lỗi lên câu đúng; None nếu lỗi đó không áp được cho công thức này."""
+    out = list(words)
+    if mutation == "missing_not":
+        out = [w for w in words if w[0] != "NOT"]
+    elif mutation == "wrong_aux":
+        i = next((i for i, (kind, _) in enumerate(words) if kind == "AUX"), None)
+        if i is None:
+            return None
+        out[i] = ("AUX", _WRONG_AUX[words[i][1]])
+    else:
+        kind, field = {"v2_for_v3": ("V3", "v2"), "base_for_ving": ("VING", "base"),
+                       "v2_for_base": ("V", "v2")}[mutation]
+        if mutation == "v2_for_base" and ("AUX", "did") not in words and ("LIT", "did") not in words:
+            return None
+        i = next((i for i, (k, _) in enumerate(words) if k == kind), None)
+        if i is None:
+            return None
+        if getattr(verb, field) == words[i][1]:
+            return None   # set/put/cut: V2 trùng V3, không thành lỗi
+        out[i] = (kind, getattr(verb, field))
+    return out if out != words else None
+
+
+def _sentence(words: list[tuple[str, str]], question: bool) -> str:
+    text = " ".join(w for _, w in words if w)
+    return text[:1].upper() + text[1:] + ("?" if question else ".")
+
+
+def generate(seed: int = 0, limit: int | None = None, negative_ratio: float = 0.5) -> Iterator[Sample]:
+    """Sinh lần lượt các câu có nhãn; cùng seed cho cùng một dãy câu."""
+    rng = random.Random(seed)
+    all_slots = slots()
+    n = 0
+    while limit is None or n < limit:
+        slot = rng.choice(all_slots)
+        words, verb = realize(rng, slot)
+        question = "?" in slot.parts
+        mutation = ""
+        if rng.random() < negative_ratio:
+            # chọn đều trong các lỗi áp được cho công thức này
+            candidates = [(m, mutate(words, m, verb)) for m in MUTATIONS]
+            candidates = [c for c in candidates if c[1] is not None]
+            if candidates:
+                mutation, words = rng.choice(candidates)
+        yield Sample(slot.tense_key, slot.group, slot.form, _sentence(words, question), not mutation, mutation)
+        n += 1
+
+
+def as_rows(samples: Iterable[Sample]) -> Iterator[dict]:
+    """Đổi sang dòng dict cho `grade_rows` (cột expected/mutation được giữ nguyên trong kết quả)."""
+    for s in samples:
+        yield {"tense_key": s.tense_key, "group": s.group, "form": s.form, "sentence": s.sentence,
+               "expected": s.expected, "mutation": s.mutation}
+
+
+def write_rows(rows: Iterable[dict], out: IO[str], fmt: str) -> int:
+    n = 0
+    writer = csv.DictWriter(out, fieldnames=ROW_FIELDS) if fmt == "csv" else None
+    if writer:
+        writer.writeheader()
+    for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        n += 1
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m grader.corpus", description="Sinh câu tổng hợp có nhãn.")
+    ap.add_argument("-n", "--count", type=int, default=1000, help="số câu (0: vô hạn)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--negative-ratio", type=float, default=0.5)
+    ap.add_argument("-o", "--output", help="file kết quả (mặc định: stdout)")
+    ap.add_argument("--format", choices=("csv", "jsonl"), default="jsonl")
+    args = ap.parse_args(argv)
+
+    samples = generate(args.seed, args.count or None, args.negative_ratio)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        write_rows(as_rows(samples), out, args.format)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
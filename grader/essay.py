@@ -0,0 +1,204 @@
+"""
+Nhận diện thì của từng câu trong cả đoạn văn / bài luận, theo kiểu dòng chảy.
+
+Văn bản đi vào theo từng khúc (file đọc dần, hay một chuỗi), được tách câu ngay
+khi gặp dấu kết thúc (. ! ? … kèm ngoặc/nháy đóng, rồi khoảng trắng) hoặc dòng
+trống (hết đoạn). Mỗi câu được nhận diện bằng `classify_tense` (thì, nhóm, dạng)
+rồi đối chiếu với luật `validate_example` của đúng thì/dạng đó, và trả ra ngay
+một `TaggedSentence` (vị trí trong văn bản, đoạn thứ mấy, thì, dạng, độ tin cậy).
+
+Chỉ giữ phần câu còn dở: bộ nhớ không tăng theo độ dài văn bản, thời gian tuyến
+tính (mỗi ký tự được quét một lần, trừ đuôi dấu câu/khoảng trắng đang chờ ký tự
+sau). Câu dài quá `text.max_chars` mà chưa gặp dấu kết thúc được cắt ở khoảng trắng
+cuối cùng, nên một "câu" không bao giờ làm bộ đệm phình ra. Dấu chấm sau từ viết
+tắt (Mr., Dr., e.g., chữ cái đầu tên) không tính là hết câu.
+
+Chạy: python -m grader.essay bai_luan.txt [-o ket_qua.jsonl] [--format text]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from itertools import chain
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from . import text
+from .classify import classify_tense
+from .rules import validate_example
+from .text import normalize
+
+# Độ dài tối đa của ô dán đoạn văn trong app (ký tự); CLI đọc dần nên không giới hạn
+MAX_CHARS = int(os.environ.get("GRADER_MAX_ESSAY_CHARS") or 20_000)
+CHUNK_SIZE = 1 << 16
+
+# hết câu: dấu kết thúc (+ ngoặc/nháy đóng) rồi khoảng trắng; hết đoạn: dòng trống
+_END = re.compile(r"""[.!?…]+["'”’)\]]*(?=\s)|\n[ \t]*\n\s*""")
+# đuôi còn dở có thể thành một lần khớp _END khi khúc sau tới
+_TAIL = frozenset(".!?…\"'”’)] \t\r\n")
+_WORD = re.compile(r"\w")
+_ABBREVIATIONS = frozenset({"mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs"})
+
+
+class Sentence(NamedTuple):
+    start: int          # vị trí (ký tự) trong cả văn bản: văn_bản[start:end] == text
+    end: int
+    text: str
+    paragraph: int      # đoạn thứ mấy (tách bởi dòng trống), từ 0
+
+
+class TaggedSentence(NamedTuple):
+    start: int
+    end: int
+    text: str
+    paragraph: int
+    tense_key: str      # "" nếu không nhận diện được
+    group: str
+    form: str
+    confidence: float
+    ok: bool            # khớp luật validate_example của thì/dạng nhận diện được
+    hint: str
+
+
+def _abbreviation(buf: str, start: int, m: re.Match) -> bool:
+    if m.group() != ".":
+        return False
+    i = j = m.start()
+    while j > start and buf[j - 1].isalpha():
+        j -= 1
+    return i - j == 1 or buf[j:i].lower() in _ABBREVIATIONS
+
+
+def _sentence(buf: str, base: int, s: int, e: int, paragraph: int) -> Sentence | None:
+    """Câu buf[s:e] (bỏ khoảng trắng hai đầu); None nếu không có chữ nào."""
+    if _WORD.search(buf, s, e) is None:
+        return None
+    raw = buf[s:e]
+    body = raw.lstrip()
+    s += len(raw) - len(body)
+    body = body.rstrip()
+    return Sentence(base + s, base + s + len(body), body, paragraph)
+
+
+def _tail(buf: str, lo: int) -> int:
+    """Đầu đuôi dấu câu/khoảng trắng còn dở của buf (không lùi quá `lo`)."""
+    tail = len(buf)
+    while tail > lo and buf[tail - 1] in _TAIL:
+        tail -= 1
+    return tail
+
+
+def split_sentences(chunks: Iterable[str] | str, max_chars: int | None = None) -> Iterator[Sentence]:
+    """Tách câu dần theo từng khúc văn bản (xem đầu module).
+
+    Kết quả không phụ thuộc cách chia khúc: lần khớp chạm cuối bộ đệm (dòng trống có
+    thể dài thêm) và lần cắt câu dài mà khúc sau còn có thể đổi đều được hoãn tới
+    khi có thêm chữ hoặc hết văn bản.
+    """
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    limit = max_chars or text.max_chars
+    buf = ""
+    base = start = pos = paragraph = 0      # base: vị trí của buf[0] trong cả văn bản
+    for chunk in chain(chunks, (None,)):    # None: hết văn bản
+        final = chunk is None
+        if chunk:
+            buf += chunk
+        elif not final:
+            continue
+        while True:
+            m = _END.search(buf, pos)
+            if m is not None and m.end() == len(buf) and not final:
+                hold, m = m.start(), None       # chờ khúc sau
+            elif m is None:
+                # lần khớp sau (nếu có) bắt đầu từ đuôi còn dở trở đi
+                hold = len(buf) if final else _tail(buf, max(start, pos))
+            if m is not None and m.start() - start <= limit:
+                pos = m.end()
+                blank = m.group()[0] == "\n"
+                if not blank and _abbreviation(buf, start, m):
+                    continue
+                sentence = _sentence(buf, base, start, m.start() if blank else m.end(), paragraph)
+                if sentence:
+                    yield sentence
+                paragraph += blank
+                start = pos
+            elif m is not None or hold - start > limit:
+                # câu dài quá giới hạn mà chưa hết: cắt ở khoảng trắng cuối cùng
+                cut = buf.rfind(" ", start + 1, start + limit)
+                cut = cut if cut > start else start + limit
+                sentence = _sentence(buf, base, start, cut, paragraph)
+                if sentence:
+                    yield sentence
+                start = pos = cut
+            else:
+                break
+        if final:
+            sentence = _sentence(buf, base, start, len(buf), paragraph)
+            if sentence:
+                yield sentence
+            return
+        # bỏ phần đã tách; lần sau quét lại từ đầu đuôi còn dở
+        tail = _tail(buf, max(start, pos))
+        buf, base, pos, start = buf[start:], base + start, max(pos, tail) - start, 0
+
+
+def tag(sentence: Sentence) -> TaggedSentence:
+    t = normalize(sentence.text)
+    guess = classify_tense(t)
+    ok, hint = False, ""
+    if guess.tense_key:
+        ok, hint = validate_example(guess.tense_key, guess.group, guess.form, t)
+    return TaggedSentence(*sentence, guess.tense_key, guess.group, guess.form, guess.confidence, bool(ok), hint)
+
+
+def tag_text(chunks: Iterable[str] | str, max_chars: int | None = None) -> Iterator[TaggedSentence]:
+    """Từng câu đã gắn thì, trả ra ngay khi tách được (generator)."""
+    for sentence in split_sentences(chunks, max_chars):
+        yield tag(sentence)
+
+
+def read_chunks(stream: IO[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    while chunk := stream.read(size):
+        yield chunk
+
+
+def write_tagged(tagged: Iterable[TaggedSentence], out: IO[str], fmt: str) -> int:
+    n = 0
+    for s in tagged:
+        if fmt == "jsonl":
+            out.write(json.dumps(s._asdict(), ensure_ascii=False) + "\n")
+        else:
+            mark = "" if s.ok else " !"
+            out.write(f"[{s.paragraph}:{s.tense_key or '?'}/{s.form} {s.confidence:.2f}{mark}] {s.text}\n")
+        n += 1
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m grader.essay", description="Nhận diện thì của từng câu trong bài luận.")
+    ap.add_argument("input", help="file văn bản (UTF-8), '-' là stdin")
+    ap.add_argument("-o", "--output", help="file kết quả (mặc định: stdout)")
+    ap.add_argument("--format", choices=("jsonl", "text"), default="jsonl")
+    ap.add_argument("--max-chars", type=int, default=text.max_chars, help="độ dài tối đa một câu (mặc định: %(default)s)")
+    args = ap.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        n = write_tagged(tag_text(read_chunks(src), args.max_chars), out, args.format)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed > 0 else float("inf")
+    print(f"{n} câu trong {elapsed:.2f}s ({rate:,.0f} câu/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""
+Văn phạm công thức: mỗi công thức trong `summary` ("S + have/has + not + V3") được
+dịch một lần thành dãy ô (slot):
+- subject: S
+- aux: trợ động từ, có thể là nhóm lựa chọn ("have/has": viết have, has hay cả
+  have/has đều được, nhưng không được had)
+- not: phủ định (nhận cả dạng rút gọn: won't, doesn't, haven't...)
+- verb: dạng động từ V, V(s/es), V-ing, V2/V-ed, V3 (nhận cả Vs, Ving, V-ed...)
+- và dấu "?" của câu hỏi
+
+Câu trả lời được tách theo cùng cách rồi so với dãy ô trong một lượt: phải đủ ô,
+đúng thứ tự, và có "?" nếu là câu hỏi (chặt hơn bộ chấm cũ chỉ dò từ khoá); riêng
+ô V(s/es) nhận cả V trần như bộ chấm cũ. Từ lạ (O,
+"+", ghi chú...) được bỏ qua; phần trong ngoặc ngoài V(s/es) là chú thích ("will
+not (won't)") nên cũng bỏ. Khi sai, kết quả nói rõ ô nào thiếu, sai, sai vị trí
+hay thừa thay vì chỉ True/False. Công thức đáp án thì không được có từ lạ ngoài O
+(`unknown_words`, `content` kiểm khi nạp file nội dung).
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from . import metrics
+from .text import NormalizedText
+
+# V(s/es) viết có ngoặc hoặc "/" (tránh tách ra chữ "s" trùng với S), chú thích trong ngoặc, dạng rút gọn n't
+_VS = re.compile(r"v\s*\(\s*(?:s\s*/\s*es|es\s*/\s*s|e?s)\s*\)|\bv-?s\s*/\s*es\b")
+_NOTE = re.compile(r"\([^()]*\)")   # không lồng nhau: dừng ở "(" kế tiếp, không quét lại cả chuỗi
+_NT = re.compile(r"\b(\w+?)n[’']t\b")
+# còn lại chỉ giữ chữ/số, "-", "/" (nối nhóm lựa chọn) và "?" (tách riêng)
+_TABLE = str.maketrans({
+    **{chr(c): " " for c in range(128) if not (chr(c).isalnum() or chr(c) in "_-/")},
+    "?": " ? ",
+})
+
+# từ -> (loại ô, dạng chuẩn); từ không có trong bảng được bỏ qua
+_WORDS = {
+    "s": ("subject", "s"), "not": ("not", "not"),
+    **{w: ("verb", canon) for w, canon in (
+        ("v", "v"), ("vs", "vs"), ("ves", "vs"), ("v-s", "vs"), ("v-es", "vs"), ("ving", "ving"), ("v-ing", "ving"),
+        ("v2", "v2"), ("ved", "ved"), ("v-ed", "ved"), ("v3", "v3"),
+    )},
+    **{w: ("aux", w) for w in ("am", "is", "are", "was", "were", "do", "does", "did", "have", "has", "had",
+                               "will", "be", "been")},
+}
+# từ được phép có trong công thức đáp án mà không thành ô (tân ngữ)
+_IGNORED = frozenset({"o"})
+# dạng động từ được nhận khi so: "V2/V-ed" viết V2 hay V-ed đều được; ô V(s/es) nhận cả V trần
+# (chia s/es là việc của câu ví dụ, như bộ chấm cũ), còn ô V thì không nhận V(s/es)
+_SAME_FORM = {"ved": ("v2",), "vs": ("vs", "v")}
+_LABELS = {"s": "S", "v": "V", "vs": "V(s/es)", "ving": "V-ing", "ved": "V-ed", "v2": "V2", "v3": "V3"}
+PROBLEMS = {"missing": "thiếu", "extra": "thừa"}
+
+
+class Slot(NamedTuple):
+    kind: str                   # subject | aux | not | verb
+    words: tuple[str, ...]      # các lựa chọn đã chuẩn hoá, theo thứ tự viết ("have", "has")
+    choices: frozenset[str]     # như words, gộp các dạng tương đương
+
+    @property
+    def label(self) -> str:
+        return "/".join(_LABELS.get(w, w) for w in self.words)
+
+    def accepts(self, other: "Slot") -> bool:
+        """`other` (ô của câu trả lời) có khớp ô này không: mọi lựa chọn đều hợp lệ (từ của các
+        loại ô không trùng nhau nên không cần so loại)."""
+        return other.choices <= self.choices
+
+
+@lru_cache(maxsize=4096)
+def _slot(word: str) -> Slot | None:
+    """Ô của một từ hay một nhóm "a/b" (None nếu có từ lạ: bỏ qua)."""
+    entries = [_WORDS.get(w) for w in word.split("/") if w]
+    if not entries or None in entries or len({kind for kind, _ in entries}) != 1:
+        return None
+    canon = tuple(c for _, c in entries)
+    return Slot(entries[0][0], canon, frozenset(f for c in canon for f in _SAME_FORM.get(c, (c,))))
+
+
+def _expand(m: re.Match) -> str:
+    # "won't" -> will not, "doesn't" -> does not
+    return ("will" if m.group(1) == "wo" else m.group(1)) + " not"
+
+
+def _words(text: str | NormalizedText) -> tuple[list[str], bool | None]:
+    question = None if isinstance(text, NormalizedText) else False
+    raw = str(text).lower()
+    # các trường hợp hiếm mới cần regex
+    if "(" in raw or "/es" in raw:
+        raw = _NOTE.sub(" ", _VS.sub(" vs ", raw))
+    if "'" in raw or "’" in raw:
+        raw = _NT.sub(_expand, raw)
+    words: list[str] = []
+    for tok in raw.translate(_TABLE).split():
+        if tok == "?":
+            if question is not None:
+                question = True
+        elif words and (words[-1].endswith("/") or tok.startswith("/")):
+            words[-1] += tok            # "have / has" -> "have/has"
+        else:
+            words.append(tok)
+    return words, question
+
+
+def parse(text: str | NormalizedText) -> tuple[tuple[Slot, ...], bool | None]:
+    """Tách công thức thành dãy ô và có dấu "?" hay không (None nếu đã chuẩn hoá, mất dấu)."""
+    words, question = _words(text)
+    return tuple(slot for slot in map(_slot, words) if slot is not None), question
+
+
+def unknown_words(formula: str) -> list[str]:
+    """Các từ của một công thức đáp án không dịch được thành ô (ngoài O), theo thứ tự viết.
+
+    Câu trả lời có từ lạ thì bỏ qua cho dễ tính; công thức đáp án thì không được có,
+    vì ô bị bỏ sẽ không bao giờ được chấm ("If + S + V2" thành "S + V2").
+    """
+    return [w for w in _words(formula)[0] if _slot(w) is None and w not in _IGNORED]
+
+
+class FormulaCheck(NamedTuple):
+    ok: bool
+    problem: str = ""       # "" | missing | wrong | order | extra
+    slot: str = ""          # ô của công thức đúng (hoặc của câu trả lời khi thừa)
+    got: str = ""           # học sinh viết gì ở chỗ đó (với "wrong")
+
+    @property
+    def message(self) -> str:
+        if self.ok:
+            return ""
+        if self.problem == "wrong":
+            return f"cần {self.slot}, bạn viết {self.got}"
+        if self.problem == "order":
+            return f"{self.slot} sai vị trí"
+        return f"{PROBLEMS[self.problem]} {self.slot}"
+
+
+_OK = FormulaCheck(True)
+
+
+class FormulaGrammar(NamedTuple):
+    formula: str
+    slots: tuple[Slot, ...]
+    question: bool
+
+    def check(self, user_input: str | NormalizedText) -> FormulaCheck:
+        got, question = parse(user_input)
+        slots = self.slots
+        if len(got) == len(slots) and all(g.choices <= s.choices for g, s in zip(got, slots)):
+            if question is None or question == self.question:
+                return _OK
+            return FormulaCheck(False, "missing" if self.question else "extra", "dấu ?")
+        return self._diagnose(got)
+
+    def _diagnose(self, got: tuple[Slot, ...]) -> FormulaCheck:
+        """Ô đầu tiên lệch giữa công thức và câu trả lời (chỉ chạy khi đã biết là sai)."""
+        slots, i = self.slots, 0
+        for j, slot in enumerate(slots):
+            if i == len(got):
+                return FormulaCheck(False, "missing", slot.label)
+            sym = got[i]
+            if slot.accepts(sym):
+                i += 1
+                continue
+            later_sym = any(slot.accepts(s) for s in got[i + 1:])     # ô này có ở phía sau câu trả lời
+            later_slot = any(s.accepts(sym) for s in slots[j + 1:])   # từ này thuộc một ô phía sau
+            if later_sym and later_slot:
+                return FormulaCheck(False, "order", slot.label)
+            if later_sym:
+                return FormulaCheck(False, "extra", sym.label)
+            if later_slot:
+                return FormulaCheck(False, "missing", slot.label)
+            if sym.kind == slot.kind:
+                return FormulaCheck(False, "wrong", slot.label, sym.label)
+            if any(s.kind == sym.kind for s in slots[j + 1:]):
+                return FormulaCheck(False, "missing", slot.label)
+            return FormulaCheck(False, "extra", sym.label)
+        return FormulaCheck(False, "extra", got[i].label)
+
+
+@lru_cache(maxsize=1024)
+def compile_formula(formula: str) -> FormulaGrammar:
+    """Văn phạm của một công thức đáp án (dịch một lần cho mỗi chuỗi)."""
+    slots, question = parse(formula)
+    return FormulaGrammar(formula, slots, bool(question))
+
+
+metrics.register_cache("formula_grammar", compile_formula)
+
+
+def check_formula(user_input: str | NormalizedText, correct: str) -> FormulaCheck:
+    return compile_formula(correct).check(user_input)
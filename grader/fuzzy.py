@@ -0,0 +1,162 @@
+"""
+So khớp dấu hiệu nhận biết chấp nhận lỗi chính tả (kiểu SymSpell).
+
+Mỗi dấu hiệu trong `signals` của 12 thì được chuẩn hoá rồi sinh sẵn mọi biến thể
+xoá bớt tối đa `max_distance` ký tự; chỉ mục là dict biến thể -> các dấu hiệu.
+Khi tra, câu trả lời cũng được sinh biến thể xoá, tra dict, rồi kiểm lại bằng
+khoảng cách Damerau (OSA) thật. Chi phí chỉ phụ thuộc độ dài câu trả lời, không
+phụ thuộc số dấu hiệu. Số biến thể xoá tăng theo bình phương độ dài, nên câu trả
+lời dài hơn dấu hiệu dài nhất quá `max_distance` ký tự (không thể khớp dấu hiệu
+nào) bị loại ngay, không sinh biến thể.
+
+Ngưỡng sai theo độ dài dấu hiệu: từ 3 ký tự trở xuống phải đúng hẳn (tránh
+"now" ~ "not"), tới 5 ký tự cho sai 1, dài hơn cho sai 2.
+
+Một dấu hiệu có thể thuộc nhiều thì ("recently", "for", "since"), nên tra ngược
+trả về mọi thì của dấu hiệu khớp nhất. Dấu hiệu có "/" được tách thành từng
+phương án ("last night/week/year" -> "last night", "last week", "last year").
+"""
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+from . import bundle, content, metrics
+from .text import NormalizedText, norm
+
+MAX_DISTANCE = 2
+
+
+class SignalMatch(NamedTuple):
+    signal: str                    # dấu hiệu gốc trong TENSES
+    tense_keys: tuple[str, ...]    # các thì có dấu hiệu này
+    distance: int                  # số lỗi (0: đúng hẳn)
+
+
+def allowed_distance(signal: str) -> int:
+    n = len(signal)
+    return 0 if n <= 3 else 1 if n <= 5 else 2
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """Khoảng cách Damerau (chèn/xoá/thay/đảo hai ký tự kề), dừng sớm khi vượt `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _deletes(word: str, depth: int) -> set[str]:
+    """`word` và mọi chuỗi thu được khi xoá tối đa `depth` ký tự."""
+    seen = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - seen
+        seen |= frontier
+    return seen
+
+
+def _alternatives(signal: str) -> list[str]:
+    # "last night/week/year" -> ["last night", "last week", "last year"] (và bản gốc)
+    words = signal.split()
+    out = [signal]
+    for k, w in enumerate(words):
+        if "/" in w:
+            out += [" ".join(words[:k] + [alt] + words[k + 1:]) for alt in w.split("/") if alt]
+    return out
+
+
+class SignalIndex:
+    """Chỉ mục xoá-ký-tự của một tập dấu hiệu (tense_key, signal)."""
+
+    def __init__(self, signals: Iterable[tuple[str, str]], max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        tenses_of: dict[str, list[str]] = {}
+        for tense_key, signal in signals:
+            keys = tenses_of.setdefault(signal, [])
+            if tense_key not in keys:
+                keys.append(tense_key)
+        self.signals = {signal: tuple(keys) for signal, keys in tenses_of.items()}
+        # dạng chuẩn hoá (đã tách phương án) -> các dấu hiệu gốc
+        self.forms: dict[str, list[str]] = {}
+        for signal in self.signals:
+            for alt in _alternatives(signal):
+                form = norm(alt)
+                if form and signal not in self.forms.setdefault(form, []):
+                    self.forms[form].append(signal)
+        self.longest = max(map(len, self.forms), default=0)
+        self.deletes: dict[str, set[str]] = {}
+        for form in self.forms:
+            for variant in _deletes(form, min(max_distance, allowed_distance(form))):
+                self.deletes.setdefault(variant, set()).add(form)
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def _candidates(self, text: str) -> dict[str, int]:
+        """Dạng chuẩn hoá -> khoảng cách, với mọi dấu hiệu trong ngưỡng."""
+        found: dict[str, int] = {}
+        if text in self.forms:
+            found[text] = 0
+        for variant in _deletes(text, self.max_distance):
+            for form in self.deletes.get(variant, ()):
+                if form in found:
+                    continue
+                limit = min(self.max_distance, allowed_distance(form))
+                d = osa_distance(text, form, limit)
+                if d <= limit:
+                    found[form] = d
+        return found
+
+    @metrics.timed("signal_index")
+    def lookup(self, text: str | NormalizedText) -> list[SignalMatch]:
+        """Mọi dấu hiệu khớp trong ngưỡng lỗi, gần nhất trước."""
+        text = norm(text)
+        if len(text) > self.longest + self.max_distance:
+            return []       # xa mọi dấu hiệu quá ngưỡng lỗi (kể cả khớp đúng hẳn)
+        found = self._candidates(text)
+        matches = {}
+        for form, d in found.items():
+            for signal in self.forms[form]:
+                if signal not in matches or d < matches[signal].distance:
+                    matches[signal] = SignalMatch(signal, self.signals[signal], d)
+        return sorted(matches.values(), key=lambda m: (m.distance, m.signal))
+
+    def best(self, text: str | NormalizedText) -> SignalMatch | None:
+        matches = self.lookup(text)
+        return matches[0] if matches else None
+
+    def matches(self, text: str | NormalizedText, signal: str) -> SignalMatch | None:
+        """Khớp với đúng một dấu hiệu cho trước (None nếu quá ngưỡng lỗi)."""
+        return next((m for m in self.lookup(text) if m.signal == signal), None)
+
+    def tenses_for(self, text: str | NormalizedText) -> tuple[str, ...]:
+        """Tra ngược: dấu hiệu học sinh gõ thuộc những thì nào (theo dấu hiệu gần nhất)."""
+        matches = self.lookup(text)
+        if not matches:
+            return ()
+        nearest = matches[0].distance
+        return tuple(dict.fromkeys(k for m in matches if m.distance == nearest for k in m.tense_keys))
+
+
+def build_signal_index(tenses: dict) -> SignalIndex:
+    return SignalIndex((tense.key, sig) for tense in tenses.values() for sig in tense.signals)
+
+
+def signal_index() -> SignalIndex:
+    """Chỉ mục mọi dấu hiệu trong TENSES, dựng một lần cho mỗi phiên bản nội dung."""
+    return _signal_index(content.current().version)
+
+
+@lru_cache(maxsize=1)
+def _signal_index(version: str) -> SignalIndex:
+    index = bundle.load("signal_index", version)
+    return index if index is not None else build_signal_index(content.current().tenses)
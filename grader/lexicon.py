@@ -0,0 +1,166 @@
+"""
+Từ điển động từ: các động từ bất quy tắc và có quy tắc thường gặp, đọc từ
+`data/irregular_verbs.txt` và `data/regular_verbs.txt`.
+
+Mọi dạng (V, V-s/es, V-ing, V2, V3) được sinh một lần khi import và đánh chỉ
+mục trong một dict: dạng bề mặt -> các cặp (nguyên mẫu, nhãn). Nhãn là cờ bit
+(`V | VS | VING | V2 | V3`), nên mỗi từ của câu chỉ tốn một lần tra dict.
+"""
+import os
+import re
+
+from . import bundle
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Nhãn dạng động từ (cờ bit, một dạng bề mặt có thể mang nhiều nhãn: read = V|V2|V3)
+V, VS, VING, V2, V3 = 1, 2, 4, 8, 16
+
+_VOWELS = frozenset("aeiou")
+# Từ một âm tiết kết thúc bằng phụ âm - một nguyên âm - một phụ âm: stop, plan, get
+_CVC = re.compile(r"^(?:qu|[^aeiou])*[aeiou][^aeiouwxy]$")
+
+
+def _double_final(base: str, marked: bool) -> bool:
+    return marked or _CVC.match(base) is not None
+
+
+def third_person(base: str) -> str:
+    if base == "have":
+        return "has"
+    if base.endswith(("s", "x", "z", "ch", "sh", "o")):
+        return base + "es"
+    if base.endswith("y") and base[-2:-1] not in _VOWELS:
+        return base[:-1] + "ies"
+    return base + "s"
+
+
+def _with_suffix(base: str, suffix: str, marked: bool) -> list[str]:
+    """Thêm -ing/-ed vào gốc đã bỏ e/ie/y; trả về mọi cách viết chấp nhận được."""
+    if _double_final(base, marked):
+        if base.endswith("c"):                       # panic -> panicking
+            return [base + "k" + suffix]
+        doubled = base + base[-1] + suffix
+        if marked and base.endswith("l"):            # travelling (Anh) / traveling (Mỹ)
+            return [doubled, base + suffix]
+        return [doubled]
+    return [base + suffix]
+
+
+def present_participle(base: str, marked: bool = False) -> list[str]:
+    if base.endswith("ie"):
+        return [base[:-2] + "ying"]
+    if base.endswith("e") and len(base) > 2 and not base.endswith(("ee", "ye", "oe")):
+        return [base[:-1] + "ing"]
+    return _with_suffix(base, "ing", marked)
+
+
+def past_regular(base: str, marked: bool = False) -> list[str]:
+    if base.endswith("e"):
+        return [base + "d"]
+    if base.endswith("y") and base[-2:-1] not in _VOWELS:
+        return [base[:-1] + "ied"]
+    return _with_suffix(base, "ed", marked)
+
+
+def _read_lines(name: str):
+    with open(os.path.join(DATA_DIR, name), encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line
+
+
+def _base_forms(base: str, marked: bool) -> dict[str, int]:
+    forms = {base: V, third_person(base): VS}
+    for ing in present_participle(base, marked):
+        forms[ing] = VING
+    return forms
+
+
+def read_irregular(name: str = "irregular_verbs.txt") -> list[tuple[str, str, str]]:
+    """Các dòng (nguyên mẫu, V2, V3) của file bất quy tắc; nguyên mẫu giữ dấu "+" nếu có."""
+    return [tuple(line.split()) for line in _read_lines(name)]
+
+
+def read_regular(name: str = "regular_verbs.txt") -> list[str]:
+    return [base for line in _read_lines(name) for base in line.split()]
+
+
+def _entries(irregular, regular):
+    """Sinh (nguyên mẫu, dạng bề mặt, nhãn) cho mọi động từ."""
+    for base, v2, v3 in irregular:
+        marked = base.endswith("+")
+        base = base.rstrip("+")
+        if base == "be":
+            forms = {"be": V, "am": V, "are": V, "is": VS, "being": VING}
+        else:
+            forms = _base_forms(base, marked)
+        for form, tags in forms.items():
+            yield base, form, tags
+        for form in v2.split("/"):
+            yield base, form, V2
+        for form in v3.split("/"):
+            yield base, form, V3
+
+    for base in regular:
+        marked = base.endswith("+")
+        base = base.rstrip("+")
+        for form, tags in _base_forms(base, marked).items():
+            yield base, form, tags
+        for form in past_regular(base, marked):
+            yield base, form, V2 | V3
+
+
+class Lexicon:
+    """
+    Chỉ mục dạng bề mặt -> ((nguyên mẫu, nhãn), ...).
+    `tags(word)` trả về hợp các nhãn (0 nếu không biết từ), dùng cho đường nóng.
+    """
+    __slots__ = ("index", "_tags")
+
+    def __init__(self, entries):
+        merged: dict[str, dict[str, int]] = {}
+        for lemma, form, tags in entries:
+            by_lemma = merged.setdefault(form, {})
+            by_lemma[lemma] = by_lemma.get(lemma, 0) | tags
+        self.index = {form: tuple(by_lemma.items()) for form, by_lemma in merged.items()}
+        self._tags = {form: _union(pairs) for form, pairs in self.index.items()}
+
+    def lookup(self, word: str) -> tuple[tuple[str, int], ...]:
+        return self.index.get(word, ())
+
+    def tags(self, word: str) -> int:
+        return self._tags.get(word, 0)
+
+    def lemmas(self, word: str) -> tuple[str, ...]:
+        return tuple(lemma for lemma, _ in self.lookup(word))
+
+    def __contains__(self, word) -> bool:
+        return word in self._tags
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def _union(pairs) -> int:
+    tags = 0
+    for _, t in pairs:
+        tags |= t
+    return tags
+
+
+def load_lexicon(irregular_file: str = "irregular_verbs.txt",
+                 regular_file: str = "regular_verbs.txt") -> Lexicon:
+    return Lexicon(_entries(read_irregular(irregular_file), read_regular(regular_file)))
+
+
+def _build() -> tuple[Lexicon, list[tuple[str, str, str]]]:
+    return load_lexicon(), [(base.rstrip("+"), v2, v3) for base, v2, v3 in read_irregular()]
+
+
+# Lấy từ gói dựng sẵn nếu khớp file động từ (xem `bundle`), không thì dựng từ file.
+# IRREG là giao diện cũ: bảng (nguyên mẫu, V2, V3); V2_SET/V3_SET: các dạng V2/V3 bất quy tắc
+LEXICON, IRREG = bundle.load("lexicon", bundle.lexicon_inputs()) or _build()
+V2_SET = {form for _, v2, _ in IRREG for form in v2.split("/")}
+V3_SET = {form for _, _, v3 in IRREG for form in v3.split("/")}
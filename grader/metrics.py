@@ -0,0 +1,186 @@
+"""
+Đo đạc (tuỳ chọn) các đường nóng của bộ chấm, xuất dạng văn bản Prometheus.
+
+Ghi lại:
+- grader_checker_seconds{checker}: độ trễ từng bộ chấm (norm, formula_ok,
+  usage_ok, any_match, validate_example, classify_tense, chỉ mục cách dùng/dấu hiệu)
+- grader_rule_seconds{tense_key, group, form}: độ trễ từng luật của `validate_example`
+- grader_rule_outcomes_total{..., outcome}: luật nào qua ("ok") hay trượt ở điều
+  kiện thứ mấy ("fail_check_2")
+- grader_pattern_total{pattern, result}: mỗi mẫu của `any_match` khớp hay trượt
+- grader_cache_*{cache}: tỉ lệ trúng các lru_cache (đọc `cache_info()` lúc xuất,
+  không tốn gì trên đường nóng)
+
+Tắt mặc định; bật bằng `enable()` hoặc biến môi trường GRADER_METRICS=1. Khi tắt,
+mỗi hàm được đo chỉ thêm một lần gọi hàm bọc và một phép kiểm tra cờ
+(xem benchmarks/bench_metrics.py). Bộ đếm không khoá: nhiều luồng cùng ghi có
+thể lệch vài đơn vị, đổi lại không làm chậm bộ chấm.
+"""
+import os
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Callable
+
+enabled = os.environ.get("GRADER_METRICS", "") not in ("", "0")
+
+# cận trên các ô của histogram (giây): 1 µs .. 100 ms
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1)
+
+HELP = {
+    "grader_checker_seconds": "Độ trễ mỗi lần gọi bộ chấm.",
+    "grader_rule_seconds": "Độ trễ mỗi luật (tense_key, group, form) của validate_example.",
+    "grader_rule_outcomes_total": "Kết quả mỗi luật: ok hoặc trượt ở điều kiện thứ mấy.",
+    "grader_pattern_total": "Số lần mỗi mẫu của any_match khớp (hit) hoặc trượt (miss).",
+    "grader_cache_hits_total": "Số lần trúng lru_cache.",
+    "grader_cache_misses_total": "Số lần trượt lru_cache.",
+    "grader_cache_hit_ratio": "Tỉ lệ trúng lru_cache.",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # ô cuối: > BUCKETS[-1]
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Cận trên của ô chứa phân vị q (inf nếu rơi vào ô cuối)."""
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank and n:
+                return bound
+        return 0.0
+
+
+_histograms: dict[tuple[str, Labels], Histogram] = {}
+_counters: dict[tuple[str, Labels], int] = {}
+_caches: dict[str, Callable] = {}
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Xoá mọi số đo (không xoá lru_cache)."""
+    _histograms.clear()
+    _counters.clear()
+
+
+def observe(name: str, labels: Labels, seconds: float) -> None:
+    hist = _histograms.get((name, labels))
+    if hist is None:
+        hist = _histograms[(name, labels)] = Histogram()
+    hist.observe(seconds)
+
+
+def count(name: str, labels: Labels, n: int = 1) -> None:
+    _counters[(name, labels)] = _counters.get((name, labels), 0) + n
+
+
+def timed(checker: str):
+    """Bọc một bộ chấm: khi bật thì ghi độ trễ vào grader_checker_seconds{checker}."""
+    labels = (("checker", checker),)
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe("grader_checker_seconds", labels, perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def register_cache(name: str, fn: Callable) -> None:
+    """Theo dõi một hàm lru_cache hay bộ nhớ đệm có `cache_info()` (đọc khi xuất)."""
+    _caches[name] = fn
+
+
+# ---- xuất
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels) + "}"
+
+
+def _cache_stats() -> list[tuple[str, int, int]]:
+    return [(name, fn.cache_info().hits, fn.cache_info().misses) for name, fn in sorted(_caches.items())]
+
+
+def render() -> str:
+    """Toàn bộ số đo theo định dạng văn bản của Prometheus."""
+    # chép nhanh (dict() là một thao tác C) để luồng khác ghi thêm không làm hỏng vòng lặp
+    histograms, counters = dict(_histograms), dict(_counters)
+    lines = []
+    for name in sorted({n for n, _ in histograms}):
+        lines += [f"# HELP {name} {HELP.get(name, '')}", f"# TYPE {name} histogram"]
+        for (n, labels), hist in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, c in zip(BUCKETS, hist.counts):
+                cumulative += c
+                lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {hist.count}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {hist.sum!r}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+    for name in sorted({n for n, _ in counters}):
+        lines += [f"# HELP {name} {HELP.get(name, '')}", f"# TYPE {name} counter"]
+        lines += [f"{name}{_fmt_labels(labels)} {v}" for (n, labels), v in sorted(counters.items()) if n == name]
+    caches = _cache_stats()
+    if caches:
+        for name, kind in (("grader_cache_hits_total", "counter"), ("grader_cache_misses_total", "counter"),
+                           ("grader_cache_hit_ratio", "gauge")):
+            lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} {kind}"]
+            for cache, hits, misses in caches:
+                value = {"grader_cache_hits_total": hits, "grader_cache_misses_total": misses,
+                         "grader_cache_hit_ratio": hits / (hits + misses) if hits + misses else 0.0}[name]
+                lines.append(f"{name}{_fmt_labels((('cache', cache),))} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def latency_rows() -> list[dict]:
+    """Một dòng mỗi histogram (cho bảng trong trang quản trị); p50/p99 là cận trên của ô."""
+    return [
+        {"metric": name, **dict(labels), "count": h.count, "mean_us": h.sum / h.count * 1e6 if h.count else 0.0,
+         "p50_us": h.quantile(0.5) * 1e6, "p99_us": h.quantile(0.99) * 1e6}
+        for (name, labels), h in sorted(dict(_histograms).items())
+    ]
+
+
+def counter_rows(name: str) -> list[dict]:
+    return [{**dict(labels), "count": v} for (n, labels), v in sorted(dict(_counters).items()) if n == name]
+
+
+def cache_rows() -> list[dict]:
+    return [
+        {"cache": cache, "hits": hits, "misses": misses,
+         "hit_ratio": hits / (hits + misses) if hits + misses else 0.0}
+        for cache, hits, misses in _cache_stats()
+    ]
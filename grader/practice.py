@@ -0,0 +1,284 @@
+"""
+Luyện tập thích ứng: ôn lại ngắt quãng (spaced repetition) trên mọi thẻ của 12 thì.
+
+Mỗi công thức (nhóm × dạng), cách dùng, dấu hiệu và ô ví dụ (nhóm × dạng) trong
+nội dung (`content`) là một thẻ (`Card`); khoá thẻ trùng khoá ô trong app (và
+`item` của kho tiến độ), nên làm bài ở các phần thường cũng được tính vào lịch ôn.
+
+Lịch ôn của một học sinh (`Schedule`) theo SM-2 rút gọn, chấm đúng/sai: đúng thì
+khoảng cách 1 ngày, 6 ngày, rồi nhân hệ số dễ (ease); sai thì quay lại sau
+`RELEARN` giây và giảm hệ số dễ. Thẻ đến hạn được ôn trước, rồi tới thẻ mới theo
+thứ tự ngân hàng thẻ, hết thẻ mới thì ôn trước hạn thẻ gần hạn nhất.
+
+Trạng thái thẻ nằm trong các mảng `array` (không phải một dict mỗi thẻ), khoảng
+22 byte/thẻ; thẻ đã gặp nằm trong một heap nhị phân chỉ số thẻ theo hạn ôn (có
+mảng vị trí để sửa khoá tại chỗ): chọn thẻ kế tiếp O(1), chấm một thẻ O(log n).
+Một tiến trình giữ được lịch của hàng nghìn học sinh (`Schedules`).
+
+Ngân hàng thẻ gắn với phiên bản nội dung: nội dung nạp lại thì lịch được chuyển
+sang ngân hàng mới theo khoá thẻ (thẻ bị xoá thì bỏ, thẻ mới là thẻ chưa học).
+"""
+import threading
+import time
+from array import array
+from functools import lru_cache
+from typing import NamedTuple
+
+from . import content
+from .content import group_key
+
+START_EASE = 250        # hệ số dễ × 100 (SM-2: 2.5)
+MIN_EASE = 130
+MAX_EASE = 350
+RELEARN = 60            # giây: thẻ sai quay lại sau 1 phút
+FIRST, SECOND = 86_400, 6 * 86_400
+MAX_INTERVAL = 365 * 86_400
+_UNSEEN = 0xFFFFFFFF    # pos[] của thẻ chưa vào heap
+
+
+class Card(NamedTuple):
+    key: str            # khoá ô trong app / `item` của kho tiến độ
+    tense_key: str
+    section: str        # formula | use | signal | example (như progress.SECTIONS)
+    prompt: str
+    item: dict          # yêu cầu cho grade_items (chưa có câu trả lời)
+    form: str = ""
+    answer: str = ""    # đáp án mẫu, hiện sau khi chấm
+
+
+class CardBank(NamedTuple):
+    version: str
+    cards: tuple[Card, ...]
+    index: dict[str, int]   # khoá thẻ -> vị trí
+
+
+def tense_cards(tense: content.Tense) -> list[Card]:
+    name, key = tense.name, tense.key
+    cards = [
+        Card(f"formula-{key}-{group}-{form}", key, "formula", f"{name} – {group} – {form}: nhập công thức",
+             {"check": "formula", "tense_key": key, "group": group, "form": form}, form, formula)
+        for group, formulas in tense.summary.items()
+        for form, formula in formulas.items()
+    ]
+    cards += [
+        Card(f"use-{key}-{i}", key, "use", f"{name} – cách dùng {i} (Use {i}):",
+             {"check": "usage", "tense_key": key, "usage": use}, answer=use)
+        for i, use in enumerate(tense.uses, 1)
+    ]
+    cards += [
+        Card(f"sig-{key}-{i}", key, "signal", f"{name} – dấu hiệu nhận biết {i} (Signal {i}):",
+             {"check": "signal", "signal": sig}, answer=sig)
+        for i, sig in enumerate(tense.signals, 1)
+    ]
+    cards += [
+        Card(f"ex-{key}-{group_key(group)}-{form}", key, "example", f"{name} – đặt một câu {form} ({group}):",
+             {"check": "example", "tense_key": key, "group": group_key(group), "form": form}, form)
+        for group, formulas in tense.summary.items()
+        for form in formulas
+    ]
+    return cards
+
+
+@lru_cache(maxsize=4)
+def _bank(version: str) -> CardBank:
+    cards = tuple(card for tense in content.current().by_key.values() for card in tense_cards(tense))
+    return CardBank(version, cards, {card.key: i for i, card in enumerate(cards)})
+
+
+def card_bank() -> CardBank:
+    """Ngân hàng thẻ của nội dung đang dùng (dựng một lần mỗi phiên bản)."""
+    return _bank(content.current().version)
+
+
+class Schedule:
+    """Lịch ôn của một học sinh trên một `CardBank` (không khoá: dùng qua `Schedules` nếu chia sẻ)."""
+
+    __slots__ = ("bank", "due", "interval", "ease", "streak", "lapses", "heap", "pos", "_new")
+
+    def __init__(self, bank: CardBank):
+        n = len(bank.cards)
+        self.bank = bank
+        self.due = array("I", [0]) * n           # giây (unix) tới hạn ôn
+        self.interval = array("I", [0]) * n      # giây; 0: chưa học
+        self.ease = array("H", [START_EASE]) * n
+        self.streak = array("H", [0]) * n        # số lần đúng liên tiếp
+        self.lapses = array("H", [0]) * n        # số lần sai
+        self.heap = array("I")                   # thẻ đã gặp, heap nhỏ nhất theo due
+        self.pos = array("I", [_UNSEEN]) * n     # thẻ -> vị trí trong heap
+        self._new = 0                            # mọi thẻ trước vị trí này đã gặp
+
+    def __len__(self) -> int:
+        return len(self.due)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.buffer_info()[1] * a.itemsize for a in
+                   (self.due, self.interval, self.ease, self.streak, self.lapses, self.heap, self.pos))
+
+    # ---- chọn thẻ
+    def next(self, now: float | None = None) -> int | None:
+        """Thẻ nên ôn tiếp theo: thẻ quá hạn lâu nhất, hoặc thẻ mới, hoặc thẻ gần hạn nhất."""
+        now = time.time() if now is None else now
+        heap = self.heap
+        if heap and self.due[heap[0]] <= now:
+            return heap[0]
+        while self._new < len(self.pos) and self.pos[self._new] != _UNSEEN:
+            self._new += 1
+        if self._new < len(self.pos):
+            return self._new
+        return heap[0] if heap else None
+
+    def seen(self, card: int) -> bool:
+        return self.pos[card] != _UNSEEN
+
+    def stats(self, now: float | None = None) -> tuple[int, int, int]:
+        """(số thẻ mới, số thẻ đến hạn, số thẻ chưa đến hạn); O(n), để hiển thị."""
+        now = time.time() if now is None else now
+        due = sum(1 for card in self.heap if self.due[card] <= now)
+        return len(self.pos) - len(self.heap), due, len(self.heap) - due
+
+    def weakest(self, k: int = 5) -> list[int]:
+        """Các thẻ sai nhiều nhất (chưa từng sai thì không tính)."""
+        return sorted((c for c in self.heap if self.lapses[c]), key=self.lapses.__getitem__, reverse=True)[:k]
+
+    # ---- chấm
+    def review(self, card: int, ok: bool, now: float | None = None) -> None:
+        """Cập nhật thẻ sau một lần chấm, rồi đặt lại vị trí trong heap (O(log n))."""
+        now = int(time.time() if now is None else now)
+        if ok:
+            streak = self.streak[card] = min(self.streak[card] + 1, 0xFFFF)
+            interval = FIRST if streak == 1 else SECOND if streak == 2 else self.interval[card] * self.ease[card] // 100
+            self.ease[card] = min(self.ease[card] + 5, MAX_EASE)
+        else:
+            self.streak[card] = 0
+            self.lapses[card] = min(self.lapses[card] + 1, 0xFFFF)
+            self.ease[card] = max(self.ease[card] - 20, MIN_EASE)
+            interval = RELEARN
+        self.interval[card] = interval = min(interval, MAX_INTERVAL)
+        self.due[card] = now + interval
+        i = self.pos[card]
+        if i == _UNSEEN:
+            self.heap.append(card)
+            self._sift_up(len(self.heap) - 1)
+        else:
+            self._sift_up(self._sift_down(i))
+
+    def review_key(self, key: str, ok: bool, now: float | None = None) -> bool:
+        card = self.bank.index.get(key)
+        if card is None:
+            return False
+        self.review(card, ok, now)
+        return True
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos, due = self.heap, self.pos, self.due
+        card = heap[i]
+        key = due[card]
+        while i:
+            parent = (i - 1) >> 1
+            above = heap[parent]
+            if due[above] <= key:
+                break
+            heap[i] = above
+            pos[above] = i
+            i = parent
+        heap[i] = card
+        pos[card] = i
+
+    def _sift_down(self, i: int) -> int:
+        heap, pos, due = self.heap, self.pos, self.due
+        n = len(heap)
+        card = heap[i]
+        key = due[card]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and due[heap[child + 1]] < due[heap[child]]:
+                child += 1
+            below = heap[child]
+            if due[below] >= key:
+                break
+            heap[i] = below
+            pos[below] = i
+            i = child
+        heap[i] = card
+        pos[card] = i
+        return i
+
+    # ---- đổi nội dung
+    def for_bank(self, bank: CardBank) -> "Schedule":
+        """Lịch này trên ngân hàng thẻ `bank` (chính nó nếu cùng ngân hàng), chuyển theo khoá thẻ."""
+        if bank is self.bank:
+            return self
+        moved = Schedule(bank)
+        for old, card in enumerate(self.bank.cards):
+            new = bank.index.get(card.key)
+            if new is None or not self.seen(old):
+                continue
+            for column in ("due", "interval", "ease", "streak", "lapses"):
+                getattr(moved, column)[new] = getattr(self, column)[old]
+            moved.pos[new] = len(moved.heap)
+            moved.heap.append(new)
+        for i in reversed(range(len(moved.heap) // 2)):
+            moved._sift_down(i)
+        return moved
+
+
+class Schedules:
+    """Lịch ôn của mọi học sinh trong tiến trình, dựng lại từ kho tiến độ (nếu có) khi gặp lần đầu.
+
+    Lịch dùng chung giữa các phiên (mỗi phiên một luồng) nên mọi lần đọc/ghi đều qua
+    các hàm ở đây, dưới khoá; không đọc thẳng mảng/heap của `get()` khi luồng khác đang chấm.
+    """
+
+    def __init__(self, store=None):
+        self.store = store              # ProgressStore | None
+        self._by_student: dict[str, Schedule] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_student)
+
+    def get(self, student: str) -> Schedule:
+        """Lịch của học sinh (đọc trạng thái; ghi thì qua `review`)."""
+        bank = card_bank()
+        with self._lock:
+            schedule = self._by_student.get(student)
+            if schedule is None:
+                # dựng trong khoá: luồng khác không dựng trùng, và `review` của học sinh này chờ
+                # tới khi lịch đã có thay vì bỏ qua một lần chấm chưa kịp vào kho
+                schedule = Schedule(bank)
+                if self.store is not None:
+                    self.store.flush(timeout=1.0)
+                    for item, ok, ts in self.store.history(student):
+                        schedule.review_key(item, ok, ts)
+                self._by_student[student] = schedule
+            elif schedule.bank is not bank:
+                schedule = self._by_student[student] = schedule.for_bank(bank)
+            return schedule
+
+    def next_card(self, student: str, now: float | None = None) -> Card | None:
+        schedule = self.get(student)
+        with self._lock:
+            card = schedule.next(now)
+        return None if card is None else schedule.bank.cards[card]
+
+    def stats(self, student: str, now: float | None = None) -> tuple[int, int, int]:
+        """(số thẻ mới, số thẻ đến hạn, số thẻ chưa đến hạn) của học sinh."""
+        schedule = self.get(student)
+        with self._lock:
+            return schedule.stats(now)
+
+    def weakest(self, student: str, k: int = 5) -> list[tuple[Card, int]]:
+        """Các thẻ học sinh sai nhiều nhất, kèm số lần sai."""
+        schedule = self.get(student)
+        with self._lock:
+            return [(schedule.bank.cards[c], schedule.lapses[c]) for c in schedule.weakest(k)]
+
+    def review(self, student: str, key: str, ok: bool, now: float | None = None) -> None:
+        """Ghi một lần chấm vào lịch của học sinh, nếu lịch đã được nạp (chưa thì lần nạp sẽ đọc từ kho)."""
+        with self._lock:
+            schedule = self._by_student.get(student)
+            if schedule is not None:
+                schedule.review_key(key, ok, now)
@@ -0,0 +1,199 @@
+"""
+Lưu tiến độ của từng học sinh vào SQLite (WAL): mỗi lần bấm "Kiểm tra" ở phần
+công thức, cách dùng, dấu hiệu, ví dụ là một dòng trong bảng `attempts`.
+
+`ProgressStore.record()` chỉ đẩy dòng vào hàng đợi rồi trả về ngay; một luồng
+ghi nền duy nhất lấy hết những gì đang chờ (tối đa `batch_size` dòng) và ghi
+trong một giao dịch. Chỉ có một kết nối ghi nên các phiên không tranh khoá với
+nhau, còn WAL cho phép đọc song song trong lúc ghi; mỗi luồng đọc có kết nối
+riêng, được đóng khi luồng đã kết thúc (Streamlit tạo và bỏ luồng liên tục: dọn ở
+lần mở kết nối đọc kế tiếp) và khi `close()`. `flush()` chờ tới khi mọi dòng đã đưa
+vào được ghi xong.
+
+Đường dẫn mặc định: biến môi trường GRADER_PROGRESS_DB, hoặc ./progress.sqlite3.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+DEFAULT_PATH = os.environ.get("GRADER_PROGRESS_DB", "progress.sqlite3")
+SECTIONS = ("formula", "use", "signal", "example")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id        INTEGER PRIMARY KEY,
+    student   TEXT    NOT NULL,
+    tense_key TEXT    NOT NULL,
+    section   TEXT    NOT NULL,             -- formula | use | signal | example
+    form      TEXT    NOT NULL DEFAULT '',  -- Khẳng định / Phủ định / Nghi vấn ('' với cách dùng, dấu hiệu)
+    item      TEXT    NOT NULL,             -- khoá widget của câu hỏi, vd 'sig-present_simple-1'
+    answer    TEXT    NOT NULL,
+    ok        INTEGER NOT NULL,
+    ts        REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_student_tense_form ON attempts (student, tense_key, form);
+CREATE INDEX IF NOT EXISTS attempts_student_item ON attempts (student, item, id);
+"""
+
+_COLUMNS = "student, tense_key, section, form, item, answer, ok, ts"
+_STOP = object()
+
+
+class Attempt(NamedTuple):
+    student: str
+    tense_key: str
+    section: str
+    form: str
+    item: str
+    answer: str
+    ok: bool
+    ts: float       # time.time()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")   # WAL: chỉ fsync khi checkpoint, mất điện không hỏng file
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class ProgressStore:
+    """Kho tiến độ: ghi qua hàng đợi + luồng nền, đọc bằng truy vấn có chỉ mục."""
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 512):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0          # số dòng đã ghi xong
+        self.errors = 0           # số lô ghi thất bại (lỗi cuối ở last_error)
+        self.last_error: Exception | None = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._local = threading.local()
+        self._readers: dict[threading.Thread, sqlite3.Connection] = {}     # luồng -> kết nối đọc của nó
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._conn = connect(path)
+        self._conn.executescript(SCHEMA)
+        self._thread = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- ghi
+    def record(self, student: str, tense_key: str, section: str, item: str, answer: str, ok: bool,
+               form: str = "") -> None:
+        """Đưa một lần chấm vào hàng đợi (không chờ đĩa); bỏ qua nếu chưa có tên học sinh."""
+        if student and not self._closed:
+            self._queue.put(Attempt(student, tense_key, section, form, item, answer or "", bool(ok), time.time()))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Chờ mọi dòng đã `record` trước đó được ghi; False nếu hết `timeout`."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._conn.close()
+        with self._readers_lock:
+            readers, self._readers = list(self._readers.values()), {}
+        for conn in readers:
+            conn.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch, waiters, stop = [], [], False
+            item = self._queue.get()
+            # lấy thêm mọi thứ đang chờ: khi tải cao, các dòng dồn lại thành lô lớn
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for done in waiters:
+                done.set()
+            if stop:
+                return
+
+    def _write(self, batch: list[Attempt]) -> None:
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(f"INSERT INTO attempts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            self.errors += 1
+            self.last_error = e
+
+    # ---- đọc
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path)
+            conn.execute("PRAGMA query_only=ON")
+            with self._readers_lock:
+                if self._closed:
+                    conn.close()
+                    raise sqlite3.ProgrammingError(f"{self.path}: kho tiến độ đã đóng")
+                for thread in [t for t in self._readers if not t.is_alive()]:
+                    self._readers.pop(thread).close()
+                self._readers[threading.current_thread()] = conn
+            self._local.conn = conn
+        return conn
+
+    def attempts(self, student: str, tense_key: str | None = None, form: str | None = None,
+                 section: str | None = None, limit: int = 100) -> list[Attempt]:
+        """Các lần chấm gần nhất của học sinh (lọc theo thì / dạng / phần), mới nhất trước."""
+        where, args = ["student = ?"], [student]
+        for column, value in (("tense_key", tense_key), ("form", form), ("section", section)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        rows = self._reader().execute(
+            f"SELECT {_COLUMNS} FROM attempts WHERE {' AND '.join(where)} ORDER BY id DESC LIMIT ?",
+            (*args, limit),
+        )
+        return [Attempt(*row[:6], bool(row[6]), row[7]) for row in rows]
+
+    def last_answers(self, student: str, tense_key: str | None = None) -> dict[str, str]:
+        """Khoá widget -> câu trả lời gần nhất, để điền lại các ô sau khi tải lại trang."""
+        sql = "SELECT item, answer, MAX(id) FROM attempts WHERE student = ?"
+        args: tuple = (student,)
+        if tense_key is not None:
+            sql += " AND tense_key = ?"
+            args += (tense_key,)
+        rows = self._reader().execute(sql + " GROUP BY item", args)
+        return {item: answer for item, answer, _ in rows}
+
+    def history(self, student: str) -> list[tuple[str, bool, float]]:
+        """(item, ok, ts) của mọi lần chấm, cũ nhất trước (để dựng lại lịch ôn, xem `practice`)."""
+        rows = self._reader().execute("SELECT item, ok, ts FROM attempts WHERE student = ? ORDER BY id", (student,))
+        return [(item, bool(ok), ts) for item, ok, ts in rows]
+
+    def summary(self, student: str) -> dict[tuple[str, str], tuple[int, int]]:
+        """(tense_key, section) -> (số lần chấm, số lần đúng)."""
+        rows = self._reader().execute(
+            "SELECT tense_key, section, COUNT(*), SUM(ok) FROM attempts WHERE student = ? "
+            "GROUP BY tense_key, section",
+            (student,),
+        )
+        return {(tense_key, section): (n, correct) for tense_key, section, n, correct in rows}
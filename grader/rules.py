@@ -0,0 +1,474 @@
+"""
+Bảng luật nhận dạng thì cho `validate_example`.
+
+Mỗi mục của bảng ứng với một khoá (tense_key, group, form) và gồm một danh sách
+cố định các điều kiện dựng sẵn cùng gợi ý hiển thị. Bảng được dựng một lần khi
+import, nên mỗi câu chỉ tốn một lần tra bảng và vài phép so khớp.
+
+Điều kiện so trên dãy từ đã chuẩn hoá chứ không dùng regex: một điều kiện là một
+dãy phần tử (cụm từ như "have not been", hoặc một phép thử trên từng từ như V-ing)
+phải xuất hiện theo thứ tự. Mỗi phần tử được tìm từ chỗ phần tử trước dừng, chọn
+chỗ sớm nhất (đủ để biết có khớp hay không, không cần quay lui), nên thời gian
+luôn tuyến tính theo số từ, kể cả với câu dán vào dài hàng chục nghìn ký tự
+(regex kiểu `\bhave not\b.*\b\w+ing\b` thì bậc hai). Dạng rút gọn sau chuẩn hoá
+("don't" -> "don t") được viết thẳng thành cụm từ.
+"""
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+from . import metrics
+from .lexicon import LEXICON, V, V2, V3
+from .text import NormalizedText, normalize
+
+FORMS = ("Khẳng định", "Phủ định", "Nghi vấn")
+GROUPS = ("verb", "tobe")
+
+# Các nhóm từ tiện lợi ("|" ngăn các lựa chọn, mỗi lựa chọn là một cụm từ)
+BE_NOW = "am|is|are"
+BE_PAST = "was|were"
+DID = "did"
+HAVE_NOW = "have|has"
+HAD = "had"
+WILL = "will|shall"
+
+Check = Callable[[NormalizedText], object]
+Element = str | Callable[[str], bool]     # cụm từ "a b|c" hoặc phép thử trên một từ
+
+
+class Rule(NamedTuple):
+    checks: tuple[Check, ...]
+    hint: str
+
+
+# ---- nhận diện từng từ: mỗi từ một lần tra từ điển động từ,
+# từ không có trong từ điển thì đoán theo đuôi như trước
+_tags = LEXICON.tags
+# V2 của trợ động từ: câu có was/were/did chưa chắc là quá khứ đơn của động từ thường
+_AUX_V2 = frozenset({"was", "were", "did"})
+
+
+def _parts(pred: Callable[[str], bool]) -> Callable[[str], bool]:
+    """Thử trên từng phần của từ nối bằng "-" (như \\b của regex cũ: "well-known" có "known")."""
+    def test(w: str) -> bool:
+        if "-" not in w:
+            return pred(w)
+        return any(pred(p) for p in w.split("-") if p)
+    return test
+
+
+def _ends(w: str, suffixes: tuple[str, ...]) -> bool:
+    # endswith(tuple) loại nhanh trong C; đa số từ không có đuôi nào
+    return w.endswith(suffixes) and any(len(w) > len(s) and w.endswith(s) for s in suffixes)
+
+
+def _ving(w: str) -> bool:
+    return len(w) > 3 and w.endswith("ing")
+
+
+def _is_v2(w: str) -> bool:
+    tags = _tags(w)
+    return bool(tags & V2) if tags else _ends(w, ("ed",))
+
+
+def _is_v3(w: str) -> bool:
+    tags = _tags(w)
+    return bool(tags & V3) if tags else _ends(w, ("ed", "en", "wn"))
+
+
+V_ING = _parts(_ving)
+V3_FORM = _parts(_is_v3)
+
+
+def _any_v3(words) -> bool:
+    return any(map(_is_v3, words))
+
+
+def has_any_v2_or_ed(t: NormalizedText) -> bool:
+    return any(_is_v2(w) for w in t.words if w not in _AUX_V2)
+
+
+def has_any_v3(t: NormalizedText) -> bool:
+    return _any_v3(t.words)
+
+
+def has_plain_v2(t: NormalizedText) -> bool:
+    """Có dạng chắc chắn là V2 (không trùng nguyên mẫu như read/put), bỏ qua trợ động từ."""
+    for w in t.words:
+        if w in _AUX_V2:
+            continue
+        tags = _tags(w)
+        if tags & V2 and not tags & V:
+            return True
+        if not tags and _ends(w, ("ed",)):
+            return True
+    return False
+
+
+# ---- các bộ dựng điều kiện (chỉ chạy lúc import)
+# Mỗi điều kiện là một hàm duy nhất trên dãy từ, không lồng hàm: cụm từ được tách
+# sẵn thành tuple, và trước khi dò từng vị trí, điều kiện loại ngay câu thiếu từ
+# đầu của một cụm bắt buộc (`frozenset.isdisjoint` chạy trong C, không dựng tập từ).
+Phrases = tuple[tuple[str, ...], ...]
+Step = Phrases | Callable[[str], bool]
+
+
+def _phrases(element: str) -> Phrases:
+    return tuple(tuple(alt.split()) for alt in element.split("|"))
+
+
+def _step(element: Element) -> Step:
+    return element if callable(element) else _phrases(element)
+
+
+def _firsts(phrases: Phrases) -> frozenset[str]:
+    return frozenset(phrase[0] for phrase in phrases)
+
+
+def _find(tokens: tuple[str, ...], step: Step, start: int, anchored: bool) -> int:
+    """Tìm phần tử từ vị trí `start`; trả về vị trí ngay sau chỗ khớp sớm nhất, -1 nếu không có.
+    `anchored`: chỉ được khớp đúng tại `start`."""
+    if callable(step):
+        stop = min(start + 1, len(tokens)) if anchored else len(tokens)
+        for i in range(start, stop):
+            if step(tokens[i]):
+                return i + 1
+        return -1
+    best = -1
+    if anchored:
+        for phrase in step:
+            end = start + len(phrase)
+            if tokens[start:end] == phrase and (best < 0 or end < best):
+                best = end
+        return best
+    for phrase in step:
+        n, first = len(phrase), phrase[0]
+        if first not in tokens:     # tránh ValueError của index (đắt hơn một lượt quét trong C)
+            continue
+        i = start
+        while True:
+            try:
+                i = tokens.index(first, i)    # tìm trong C, không quét lại từ đầu
+            except ValueError:
+                break
+            if best >= 0 and i + n >= best:
+                break
+            if n == 1 or tokens[i:i + n] == phrase:
+                best = i + n
+                break
+            i += 1
+    return best
+
+
+def _seq(*elements: Element, anchored: bool = False) -> Check:
+    """Các phần tử xuất hiện theo thứ tự (phần tử đầu ở đầu câu nếu `anchored`)."""
+    steps = tuple(_step(e) for e in elements)
+    # lọc nhanh: từ đầu của mọi cụm từ phải có trong câu
+    needed = tuple(_firsts(step) for step in steps if not callable(step))
+
+    def check(t: NormalizedText) -> bool:
+        tokens = t.tokens
+        for firsts in needed:
+            if firsts.isdisjoint(tokens):
+                return False
+        i = 0
+        for step in steps:
+            i = _find(tokens, step, i, anchored and i == 0)     # i == 0: phần tử đầu
+            if i < 0:
+                return False
+        return True
+    return check
+
+
+def _has(*elements: Element, negate: bool = False) -> Check:
+    """Có ít nhất một trong các phần tử (không có phần tử nào nếu `negate`)."""
+    phrases = tuple(p for e in elements if not callable(e) for p in _phrases(e))
+    words = frozenset(p[0] for p in phrases if len(p) == 1)     # cụm một từ: chỉ cần có trong câu
+    longer = tuple(p for p in phrases if len(p) > 1)
+    longer_firsts = _firsts(longer)
+    tests = tuple(e for e in elements if callable(e))
+
+    def check(t: NormalizedText) -> bool:
+        tokens = t.tokens
+        if not words.isdisjoint(tokens):
+            return not negate
+        if longer and not longer_firsts.isdisjoint(tokens) and _find(tokens, longer, 0, False) >= 0:
+            return not negate
+        for test in tests:
+            if any(map(test, tokens)):
+                return not negate
+        return negate
+    return check
+
+
+def _starts(element: Element) -> Check:
+    return _seq(element, anchored=True)
+
+
+def _absent(*elements: Element) -> Check:
+    return _has(*elements, negate=True)
+
+
+def _either(*checks: Check) -> Check:
+    return lambda t: any(check(t) for check in checks)
+
+
+def _all(*checks: Check) -> Check:
+    return lambda t: all(check(t) for check in checks)
+
+
+def _negate(check: Check) -> Check:
+    return lambda t: not check(t)
+
+
+# Mỗi thì: đặt các quy tắc "điển hình" (affirm/neg/question).
+# group = None nghĩa là luật dùng chung cho cả "verb" và "tobe".
+_SPECS = {
+    # ---- HIỆN TẠI ĐƠN
+    ("present_simple", "verb", "Khẳng định"): (
+        # Không có will/ have/ has/ had/ was/were/ am/is/are/ did, không V-ing; cho phép động từ V/Vs
+        [_absent(WILL, HAVE_NOW, HAD, BE_PAST, BE_NOW, DID, V_ING)],
+        "Tránh dùng trợ động từ; dùng V/ V(s/es).",
+    ),
+    ("present_simple", "verb", "Phủ định"): (
+        [_has("do not|does not|don t|doesn t")],
+        "Dùng do/does not + V.",
+    ),
+    ("present_simple", "verb", "Nghi vấn"): (
+        [_starts("do|does")],
+        "Bắt đầu bằng Do/Does + S + V?",
+    ),
+    ("present_simple", "tobe", "Khẳng định"): (
+        [_has(BE_NOW)],
+        "Dùng am/is/are.",
+    ),
+    ("present_simple", "tobe", "Phủ định"): (
+        [_has("am not|is not|are not|isn t|aren t")],
+        "Dùng am/is/are + not.",
+    ),
+    ("present_simple", "tobe", "Nghi vấn"): (
+        [_starts(BE_NOW)],
+        "Bắt đầu bằng Am/Is/Are + S?",
+    ),
+
+    # ---- HIỆN TẠI TIẾP DIỄN
+    ("present_continuous", None, "Khẳng định"): (
+        [_has(BE_NOW), _has(V_ING)],
+        "am/is/are + V-ing.",
+    ),
+    ("present_continuous", None, "Phủ định"): (
+        [_seq("am not|is not|are not|isn t|aren t", V_ING)],
+        "am/is/are + not + V-ing.",
+    ),
+    ("present_continuous", None, "Nghi vấn"): (
+        [_seq(BE_NOW, V_ING, anchored=True)],
+        "Bắt đầu bằng Am/Is/Are + S + V-ing?",
+    ),
+
+    # ---- HIỆN TẠI HOÀN THÀNH
+    ("present_perfect", None, "Khẳng định"): (
+        [_has(HAVE_NOW), has_any_v3],
+        "have/has + V3.",
+    ),
+    ("present_perfect", None, "Phủ định"): (
+        [_either(_seq("have not|has not", V3_FORM), _has("haven t|hasn t")), has_any_v3],
+        "have/has + not + V3.",
+    ),
+    ("present_perfect", None, "Nghi vấn"): (
+        [_seq(HAVE_NOW, V3_FORM, anchored=True)],
+        "Bắt đầu bằng Have/Has + S + V3?",
+    ),
+
+    # ---- HIỆN TẠI HOÀN THÀNH TIẾP DIỄN
+    ("present_perfect_continuous", None, "Khẳng định"): (
+        [_has(HAVE_NOW), _has("been"), _has(V_ING)],
+        "have/has been + V-ing.",
+    ),
+    ("present_perfect_continuous", None, "Phủ định"): (
+        [_seq("have not been|has not been|haven t been|hasn t been", V_ING)],
+        "have/has + not + been + V-ing.",
+    ),
+    ("present_perfect_continuous", None, "Nghi vấn"): (
+        [_seq(HAVE_NOW, "been", V_ING, anchored=True)],
+        "Bắt đầu bằng Have/Has + S + been + V-ing?",
+    ),
+
+    # ---- QUÁ KHỨ ĐƠN
+    ("past_simple", "verb", "Khẳng định"): (
+        [has_any_v2_or_ed],
+        "Dùng V2/ Ved.",
+    ),
+    ("past_simple", "verb", "Phủ định"): (
+        [_has("did not|didn t"), _negate(has_plain_v2)],
+        "did not + V (nguyên mẫu).",
+    ),
+    ("past_simple", "verb", "Nghi vấn"): (
+        [_starts(DID)],
+        "Bắt đầu bằng Did + S + V?",
+    ),
+    ("past_simple", "tobe", "Khẳng định"): (
+        [_has(BE_PAST)],
+        "Dùng was/were.",
+    ),
+    ("past_simple", "tobe", "Phủ định"): (
+        [_has("was not|were not|wasn t|weren t")],
+        "was/were + not.",
+    ),
+    ("past_simple", "tobe", "Nghi vấn"): (
+        [_starts(BE_PAST)],
+        "Bắt đầu bằng Was/Were + S?",
+    ),
+
+    # ---- QUÁ KHỨ TIẾP DIỄN
+    ("past_continuous", None, "Khẳng định"): (
+        [_has(BE_PAST), _has(V_ING)],
+        "was/were + V-ing.",
+    ),
+    ("past_continuous", None, "Phủ định"): (
+        [_seq("was not|were not|wasn t|weren t", V_ING)],
+        "was/were + not + V-ing.",
+    ),
+    ("past_continuous", None, "Nghi vấn"): (
+        [_seq(BE_PAST, V_ING, anchored=True)],
+        "Bắt đầu bằng Was/Were + S + V-ing?",
+    ),
+
+    # ---- QUÁ KHỨ HOÀN THÀNH
+    ("past_perfect", None, "Khẳng định"): (
+        [_has(HAD), has_any_v3],
+        "had + V3.",
+    ),
+    ("past_perfect", None, "Phủ định"): (
+        [_either(_seq("had not", V3_FORM), _has("hadn t")), has_any_v3],
+        "had not + V3.",
+    ),
+    ("past_perfect", None, "Nghi vấn"): (
+        [_seq(HAD, V3_FORM, anchored=True)],
+        "Bắt đầu bằng Had + S + V3?",
+    ),
+
+    # ---- QUÁ KHỨ HOÀN THÀNH TIẾP DIỄN
+    ("past_perfect_continuous", None, "Khẳng định"): (
+        [_has(HAD), _has("been"), _has(V_ING)],
+        "had been + V-ing.",
+    ),
+    ("past_perfect_continuous", None, "Phủ định"): (
+        [_seq("had not been|hadn t been", V_ING)],
+        "had not been + V-ing.",
+    ),
+    ("past_perfect_continuous", None, "Nghi vấn"): (
+        [_seq(HAD, "been", V_ING, anchored=True)],
+        "Bắt đầu bằng Had + S + been + V-ing?",
+    ),
+
+    # ---- TƯƠNG LAI ĐƠN
+    ("future_simple", None, "Khẳng định"): (
+        [_has(WILL), _absent("will have", "will be")],
+        "will + V (nguyên mẫu).",
+    ),
+    ("future_simple", None, "Phủ định"): (
+        [_has("will not|won t")],
+        "will not + V.",
+    ),
+    ("future_simple", None, "Nghi vấn"): (
+        [_starts(WILL)],
+        "Bắt đầu bằng Will/Shall + S + V?",
+    ),
+
+    # ---- TƯƠNG LAI TIẾP DIỄN
+    ("future_continuous", None, "Khẳng định"): (
+        [_has("will be"), _has(V_ING)],
+        "will be + V-ing.",
+    ),
+    ("future_continuous", None, "Phủ định"): (
+        [_seq("will not be|won t be", V_ING)],
+        "will not be + V-ing.",
+    ),
+    ("future_continuous", None, "Nghi vấn"): (
+        [_seq(WILL, "be", V_ING, anchored=True)],
+        "Bắt đầu bằng Will + S + be + V-ing?",
+    ),
+
+    # ---- TƯƠNG LAI HOÀN THÀNH
+    ("future_perfect", None, "Khẳng định"): (
+        [_has("will have"), has_any_v3],
+        "will have + V3.",
+    ),
+    ("future_perfect", None, "Phủ định"): (
+        [_either(_seq("will not have|won t have", V3_FORM),
+                 _all(_has("will not have"), has_any_v3))],
+        "will not have + V3.",
+    ),
+    ("future_perfect", None, "Nghi vấn"): (
+        [_seq(WILL, "have", V3_FORM, anchored=True)],
+        "Bắt đầu bằng Will + S + have + V3?",
+    ),
+
+    # ---- TƯƠNG LAI HOÀN THÀNH TIẾP DIỄN
+    ("future_perfect_continuous", None, "Khẳng định"): (
+        [_has("will have been"), _has(V_ING)],
+        "will have been + V-ing.",
+    ),
+    ("future_perfect_continuous", None, "Phủ định"): (
+        [_seq("will not have been|won t have been", V_ING)],
+        "will not have been + V-ing.",
+    ),
+    ("future_perfect_continuous", None, "Nghi vấn"): (
+        [_seq(WILL, "have been", V_ING, anchored=True)],
+        "Bắt đầu bằng Will + S + have been + V-ing?",
+    ),
+}
+
+
+def _compile(specs) -> dict[tuple[str, str, str], Rule]:
+    rules = {}
+    for (tense_key, group, form), (checks, hint) in specs.items():
+        for g in (GROUPS if group is None else (group,)):
+            rules[(tense_key, g, form)] = Rule(tuple(checks), hint)
+    return rules
+
+
+RULES = _compile(_SPECS)
+
+
+def _canonical_key(tense_key: str, group: str, form: str) -> tuple[str, str, str]:
+    # giữ đúng ngữ nghĩa cũ: group khác "verb" coi là "tobe", form lạ coi là "Nghi vấn"
+    group = "verb" if group == "verb" else "tobe"
+    form = form if form in ("Khẳng định", "Phủ định") else "Nghi vấn"
+    return tense_key, group, form
+
+
+@metrics.timed("validate_example")
+def validate_example(tense_key: str, group: str, form: str, sent: str | NormalizedText):
+    """
+    tense_key: mã thì nội bộ (present_simple, past_continuous, ...)
+    group: 'verb' | 'tobe'
+    form: 'Khẳng định' | 'Phủ định' | 'Nghi vấn'
+    sent: câu ví dụ người dùng nhập (hoặc NormalizedText đã chuẩn hoá sẵn)
+    """
+    rule = RULES.get((tense_key, group, form)) or RULES.get(_canonical_key(tense_key, group, form))
+    if rule is None:
+        return False, ""
+
+    t = normalize(sent)
+    if metrics.enabled:
+        return _validate_observed(rule, tense_key, group, form, t)
+    for check in rule.checks:
+        if not check(t):
+            return False, rule.hint
+    return True, rule.hint
+
+
+def _validate_observed(rule: Rule, tense_key: str, group: str, form: str, t: NormalizedText):
+    # như vòng lặp trên, thêm độ trễ của luật và điều kiện đã làm câu trượt
+    if (tense_key, group, form) not in RULES:
+        tense_key, group, form = _canonical_key(tense_key, group, form)
+    start = perf_counter()
+    outcome = "ok"
+    for i, check in enumerate(rule.checks, 1):
+        if not check(t):
+            outcome = f"fail_check_{i}"
+            break
+    labels = (("tense_key", tense_key), ("group", group), ("form", form))
+    metrics.observe("grader_rule_seconds", labels, perf_counter() - start)
+    metrics.count("grader_rule_outcomes_total", labels + (("outcome", outcome),))
+    return outcome == "ok", rule.hint
@@ -0,0 +1,167 @@
+"""
+Dịch vụ HTTP (asyncio, chỉ dùng thư viện chuẩn) để LMS gọi thẳng các bộ chấm,
+không qua giao diện Streamlit.
+
+    POST /formula  {"tense_key", "group"?, "form"?, "formula"}  hoặc  {"formula", "correct"}
+    POST /usage    {"tense_key", "text", "usage"?}              (usage: cách dùng cần khớp)
+    POST /signal   {"text", "tense_key"?, "signal"?}
+    POST /example  {"tense_key", "group", "form", "sentence"}
+    POST /batch    {"items": [{"check": "formula" | "usage" | "signal" | "example", ...}, ...]}
+    GET  /health
+
+Kết quả luôn là JSON có "ok" (công thức sai thì có thêm "problem": ô nào thiếu,
+sai, sai vị trí hay thừa); lỗi dữ liệu, kể cả trường dài quá `--max-chars` ký tự,
+trả 400 {"error": ...} (trong /batch thì là "error" của từng mục). Việc chấm (tốn
+CPU) chạy trong một ProcessPool (`--workers`, mặc định số CPU), vòng lặp sự kiện
+chỉ đọc/ghi socket; /batch được chia thành từng khúc `--chunk-size` mục để giảm
+chi phí gửi qua lại giữa tiến trình. `--workers 0` chấm ngay trên vòng lặp (độ trễ
+thấp nhất khi ít tải).
+
+Chạy: python -m grader.service --port 8765 [--workers 4]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+
+from . import text
+from .assets import load_assets
+from .bulk import CHECKS, grade_item, grade_items
+
+MAX_BODY = 1 << 20          # 1 MiB
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _warm(max_chars: int | None = None) -> None:
+    if max_chars is not None:
+        text.set_max_chars(max_chars)
+    load_assets()
+
+
+class GradingService:
+    def __init__(self, workers: int | None = None, chunk_size: int = 64):
+        self.chunk_size = chunk_size
+        _warm()   # nạp trước khi fork để tiến trình con dùng chung bộ nhớ
+        self.pool: Executor | None = (
+            ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=_warm,
+                                initargs=(text.max_chars,)) if workers != 0 else None
+        )
+
+    async def _run(self, fn, *args):
+        if self.pool is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.pool, partial(fn, *args))
+
+    async def route(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/health":
+            return 200, {"ok": True}
+        check = path.lstrip("/")
+        if check not in CHECKS and check != "batch":
+            return 404, {"error": f"không có endpoint {path}"}
+        if method != "POST":
+            return 405, {"error": "chỉ nhận POST"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as e:
+            return 400, {"error": f"JSON không hợp lệ: {e}"}
+        if check != "batch":
+            result = await self._run(grade_item, check, payload)
+            return (400 if "error" in result else 200), result
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            return 400, {"error": "thiếu danh sách 'items'"}
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        parts = await asyncio.gather(*(self._run(grade_items, chunk) for chunk in chunks))
+        return 200, {"results": [r for part in parts for r in part]}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                # chỉ nhận số thập phân không dấu ("-1", "+5", "1_000" thì int() vẫn đọc được)
+                raw = headers.get("content-length") or "0"
+                length = int(raw) if raw.isascii() and raw.isdigit() else -1
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                # không biết thân yêu cầu dài bao nhiêu: trả lỗi rồi đóng kết nối
+                if length < 0:
+                    status, result, keep_alive = 400, {"error": f"Content-Length không hợp lệ: {raw!r}"}, False
+                elif length > MAX_BODY:
+                    status, result, keep_alive = 413, {"error": "yêu cầu quá lớn"}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, result = await self.route(method, target, body)
+                    except Exception as e:   # lỗi lập trình: vẫn trả lời để client không treo
+                        status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+                data = json.dumps(result, ensure_ascii=False).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"đang chạy tại http://{host}:{port}", file=sys.stderr, flush=True)
+        # dừng êm khi Ctrl+C / SIGTERM để `close()` còn tắt được các tiến trình chấm
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stopped.set)
+        async with server:
+            await stopped.wait()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m grader.service", description="Dịch vụ HTTP chấm bài.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="0: chọn cổng trống")
+    ap.add_argument("--workers", type=int, default=None, help="số tiến trình chấm (0: chấm trên vòng lặp)")
+    ap.add_argument("--chunk-size", type=int, default=64, help="số mục mỗi khúc của /batch")
+    ap.add_argument("--max-chars", type=int, default=text.max_chars,
+                    help="độ dài tối đa của một trường văn bản (mặc định: %(default)s)")
+    args = ap.parse_args(argv)
+    text.set_max_chars(args.max_chars)
+
+    service = GradingService(args.workers, args.chunk_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Chấm "Cách dùng" bằng độ tương đồng TF-IDF trên chỉ mục đảo (NumPy).
+
+Mọi `uses` của 12 thì được tách từ một lần; mỗi cách dùng được đánh chỉ mục dưới
+dạng câu đầy đủ, phần tiếng Việt, phần tiếng Anh trong ngoặc và từng vế cách nhau
+bởi dấu phẩy (học sinh thường chỉ viết một trong hai thứ tiếng, hay một vế như "sự
+thật"). Trọng số (1 + log tf) · idf được chuẩn hoá L2 và lưu theo cột (từ -> các
+văn bản chứa nó), nên chấm một câu trả lời là một tích vô hướng thưa: gom các cột
+của các từ trong câu, sắp theo văn bản (argsort) rồi cộng dồn từng đoạn bằng
+`np.add.reduceat`. Chi phí chỉ phụ thuộc số lần xuất hiện của các từ đó, không
+phải cỡ ngân hàng cách dùng.
+
+Từ không có trong ngân hàng ("thói quen hằng ngày của tôi") không được tính vào độ
+dài của câu trả lời: viết thêm chữ không làm tụt điểm một câu trả lời đúng. Ngược
+lại, từ có trong quá nhiều cách dùng ("hành động") một mình không đủ để khớp.
+
+So khớp theo từ (không theo chuỗi con), nên "is" không còn khớp trong "this".
+"""
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Sequence
+
+import numpy as np
+
+from . import bundle, content, metrics
+from .text import NormalizedText, normalize
+
+# Điểm tối thiểu (cosine 0..1) để coi là đúng
+USAGE_THRESHOLD = 0.5
+# từ có trong từ chừng này phần cách dùng trở lên (và ít nhất _COMMON_MIN cách dùng) là từ chung
+_COMMON_SHARE = 0.4
+_COMMON_MIN = 3
+
+_PARTS = re.compile(r"(.*?)\s*\((.*)\)\s*$")
+_CLAUSES = re.compile(r"\s*,\s*")
+
+
+class UsageMatch(NamedTuple):
+    score: float      # 0..1
+    tense_key: str    # "" nếu không khớp cách dùng nào
+    usage: str
+
+
+def _terms(text) -> list[str]:
+    return [w for w in normalize(text).tokens if w != "/"]
+
+
+def _variants(usage: str) -> list[str]:
+    """Câu đầy đủ + phần trước ngoặc + phần trong ngoặc (nếu có) + từng vế của mỗi phần."""
+    m = _PARTS.match(usage)
+    parts = [m.group(1), m.group(2)] if m and m.group(1) else [usage]
+    clauses = [c for part in parts for c in _CLAUSES.split(part) if c and c != part]
+    return list(dict.fromkeys([usage, *parts, *clauses]))
+
+
+def _group_starts(sorted_ids: np.ndarray) -> np.ndarray:
+    """Vị trí bắt đầu của mỗi nhóm giá trị bằng nhau trong mảng đã sắp."""
+    change = np.empty(len(sorted_ids), dtype=bool)
+    change[0] = True
+    np.not_equal(sorted_ids[1:], sorted_ids[:-1], out=change[1:])
+    return np.flatnonzero(change)
+
+
+class UsageIndex:
+    """Chỉ mục TF-IDF của một ngân hàng cách dùng (tense_key, usage)."""
+
+    def __init__(self, usages: Iterable[tuple[str, str]]):
+        self.usages: list[tuple[str, str]] = list(dict.fromkeys(usages))
+        self.usage_ids = {usage: i for i, (_, usage) in enumerate(self.usages)}
+
+        docs, doc_usage = [], []
+        for i, (_, usage) in enumerate(self.usages):
+            for text in _variants(usage):
+                terms = Counter(_terms(text))
+                if terms:
+                    docs.append(terms)
+                    doc_usage.append(i)
+        self.doc_usage = np.asarray(doc_usage, dtype=np.intp)
+
+        n = len(docs)
+        df = Counter(t for terms in docs for t in terms)
+        self.vocab = {t: j for j, t in enumerate(sorted(df))}
+        self.idf = np.array([math.log((1 + n) / (1 + df[t])) + 1 for t in self.vocab])
+        usage_df = Counter(t for _, usage in self.usages for t in set(_terms(usage)))
+        common = max(_COMMON_MIN, _COMMON_SHARE * len(self.usages))
+
+        # trọng số văn bản theo cột: term_ptr[j]:term_ptr[j+1] là các (văn bản, trọng số) của từ j
+        postings: list[list[tuple[int, float]]] = [[] for _ in self.vocab]
+        for d, terms in enumerate(docs):
+            weights = {t: (1 + math.log(tf)) * self.idf[self.vocab[t]] for t, tf in terms.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            for t, w in weights.items():
+                postings[self.vocab[t]].append((d, w / norm))
+        self.term_ptr = np.cumsum([0] + [len(p) for p in postings])
+        self.post_docs = np.array([d for p in postings for d, _ in p], dtype=np.intp)
+        self.post_weights = np.array([w for p in postings for _, w in p], dtype=np.float64)
+        # bản Python của idf, các đoạn cột và cờ từ chung, để tra từng từ của câu hỏi không phải qua NumPy
+        self._term_info = {
+            t: (float(self.idf[j]), int(self.term_ptr[j]), int(self.term_ptr[j + 1]), usage_df[t] >= common)
+            for t, j in self.vocab.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.usages)
+
+    @metrics.timed("usage_index")
+    def sparse_scores(self, text: str | NormalizedText) -> tuple[np.ndarray, np.ndarray]:
+        """(mã cách dùng, điểm cosine) chỉ cho các cách dùng có chung từ với câu trả lời.
+
+        Độ dài của câu trả lời chỉ tính các từ có trong ngân hàng; câu chỉ gồm từ chung thì không khớp gì.
+        """
+        counts = Counter(_terms(text))
+        spans, q_weights, q_norm2, specific = [], [], 0.0, False
+        for t, tf in counts.items():
+            info = self._term_info.get(t)
+            if info is None:
+                continue
+            w = (1 + math.log(tf)) * info[0]
+            q_norm2 += w * w
+            spans.append(slice(info[1], info[2]))
+            q_weights.append(w)
+            specific = specific or not info[3]
+        if not specific:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        docs = np.concatenate([self.post_docs[s] for s in spans])
+        weights = np.concatenate([self.post_weights[s] * w for s, w in zip(spans, q_weights)])
+        # tích vô hướng thưa: cộng dồn theo văn bản, rồi lấy biến thể khớp nhất của mỗi cách dùng
+        order = docs.argsort(kind="stable")
+        docs, weights = docs[order], weights[order]
+        starts = _group_starts(docs)
+        doc_scores = np.add.reduceat(weights, starts) / math.sqrt(q_norm2)
+        # văn bản của cùng một cách dùng nằm liền nhau nên đã sắp theo cách dùng
+        usage_of = self.doc_usage[docs[starts]]
+        starts = _group_starts(usage_of)
+        return usage_of[starts], np.maximum.reduceat(doc_scores, starts)
+
+    def scores(self, text: str | NormalizedText) -> np.ndarray:
+        """Điểm cosine của câu trả lời với từng cách dùng (lấy biến thể khớp nhất)."""
+        dense = np.zeros(len(self.usages))
+        ids, scores = self.sparse_scores(text)
+        dense[ids] = scores
+        return dense
+
+    def _match(self, ids: np.ndarray, scores: np.ndarray) -> UsageMatch:
+        if not len(ids):
+            return UsageMatch(0.0, "", "")
+        k = int(np.argmax(scores))
+        tense_key, usage = self.usages[ids[k]]
+        return UsageMatch(float(scores[k]), tense_key, usage)
+
+    def best(self, text: str | NormalizedText, tense_key: str | None = None) -> UsageMatch:
+        """Cách dùng khớp nhất trong cả ngân hàng (hoặc chỉ của một thì)."""
+        ids, scores = self.sparse_scores(text)
+        if tense_key is not None:
+            keep = [k for k, i in enumerate(ids.tolist()) if self.usages[i][0] == tense_key]
+            ids, scores = ids[keep], scores[keep]
+        return self._match(ids, scores)
+
+    def match(self, text: str | NormalizedText, candidates: Sequence[str]) -> UsageMatch:
+        """Khớp nhất trong các cách dùng cho trước (phải có trong chỉ mục)."""
+        wanted = {self.usage_ids[c] for c in candidates}
+        ids, scores = self.sparse_scores(text)
+        keep = [k for k, i in enumerate(ids.tolist()) if i in wanted]
+        return self._match(ids[keep], scores[keep])
+
+    def similarity(self, text: str | NormalizedText, usage: str) -> float:
+        return self.match(text, [usage]).score
+
+
+def build_usage_index(tenses: dict) -> UsageIndex:
+    return UsageIndex((tense.key, use) for tense in tenses.values() for use in tense.uses)
+
+
+def usage_index() -> UsageIndex:
+    """Chỉ mục mọi cách dùng trong TENSES, dựng một lần cho mỗi phiên bản nội dung."""
+    return _usage_index(content.current().version)
+
+
+@lru_cache(maxsize=1)
+def _usage_index(version: str) -> UsageIndex:
+    index = bundle.load("usage_index", version)
+    return index if index is not None else build_usage_index(content.current().tenses)
+
+
+def index_for(usages: tuple[str, ...]) -> UsageIndex:
+    """Chỉ mục chứa được `usages`: chỉ mục chung nếu đủ, không thì dựng riêng (có cache)."""
+    return _index_for(usages, content.current().version)
+
+
+@lru_cache(maxsize=64)
+def _index_for(usages: tuple[str, ...], version: str) -> UsageIndex:
+    index = usage_index()
+    if all(u in index.usage_ids for u in usages):
+        return index
+    return UsageIndex(("", u) for u in usages)
+
+
+metrics.register_cache("usage_index_for", _index_for)
@@ -0,0 +1,117 @@
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+from . import metrics
+
+# Độ dài tối đa (ký tự) của một câu trả lời, kiểm tra ở biên (app, file bài nộp, dịch
+# vụ HTTP) trước khi chấm; đổi bằng GRADER_MAX_CHARS hoặc `set_max_chars`.
+max_chars = int(os.environ.get("GRADER_MAX_CHARS") or 1000)
+
+# Sau chuẩn hoá, văn bản chỉ còn các cụm [\w-]+ và "/" cách nhau một khoảng trắng,
+# nên có thể tách trực tiếp trong một lượt thay vì nhiều lần re.sub.
+_TOKEN = re.compile(r"[\w\-]+|/")
+# Nhánh ASCII: mọi ký tự ngoài [a-z0-9_-] thành khoảng trắng, "/" thành " / "
+_ASCII_TABLE = str.maketrans({
+    **{chr(c): " " for c in range(128) if not (chr(c).isalnum() or chr(c) in "_-")},
+    "/": " / ",
+})
+
+
+class NormalizedText:
+    """
+    Văn bản đã chuẩn hoá một lần, dùng lại cho mọi bộ kiểm tra.
+    - raw: chuỗi gốc (giữ dấu câu, như "?" cuối câu hỏi)
+    - text: chuỗi chuẩn hoá (giống `norm`)
+    - tokens: các từ (như text.split())
+    - token_set: tập các từ
+    - words: tập các cụm chữ/số (tách thêm theo "-"), dùng cho `has_word`
+    token_set/words chỉ dựng khi cần lần đầu rồi giữ lại.
+    """
+    __slots__ = ("raw", "text", "tokens", "_token_set", "_words")
+
+    def __init__(self, tokens, raw: str | None = None):
+        self.tokens = tuple(tokens)
+        self.text = " ".join(self.tokens)
+        self.raw = self.text if raw is None else raw
+        self._token_set = None
+        self._words = None
+
+    @property
+    def token_set(self) -> frozenset[str]:
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    @property
+    def words(self) -> frozenset[str]:
+        if self._words is None:
+            self._words = frozenset(
+                part for tok in self.token_set if tok != "/" for part in tok.split("-") if part
+            )
+        return self._words
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"NormalizedText({self.text!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, NormalizedText):
+            return self.text == other.text
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.text)
+
+
+def set_max_chars(n: int) -> None:
+    global max_chars
+    max_chars = n
+
+
+def too_long(s: str) -> bool:
+    return len(s) > max_chars
+
+
+def _tokenize(s: str) -> list[str]:
+    if s.isascii():
+        return s.lower().translate(_ASCII_TABLE).split()
+    return _TOKEN.findall(unicodedata.normalize("NFC", s).lower())
+
+
+def normalize(s) -> NormalizedText:
+    """Chuẩn hoá một lần; nhận cả NormalizedText (trả lại nguyên vẹn)."""
+    if isinstance(s, NormalizedText):
+        return s
+    return NormalizedText(_tokenize(s) if s else (), s or "")
+
+
+@metrics.timed("norm")
+def norm(s: str) -> str:
+    """Chuẩn hoá thân thiện cho công thức: giữ / và -, coi + là khoảng trắng."""
+    if isinstance(s, NormalizedText):
+        return s.text
+    if not s:
+        return ""
+    return " ".join(_tokenize(s))
+
+
+@lru_cache(maxsize=256)
+def _word_pattern(word: str):
+    # (từ chỉ gồm chữ/số -> tra được trong `words`, regex dự phòng)
+    return re.fullmatch(r"\w+", word) is not None, re.compile(rf"\b{re.escape(word)}\b")
+
+
+def has_word(text, word: str) -> bool:
+    plain, pattern = _word_pattern(word)
+    if isinstance(text, NormalizedText):
+        if plain:
+            return word in text.words
+        text = text.text
+    return pattern.search(text) is not None
+
+
+metrics.register_cache("word_pattern", _word_pattern)
@@ -0,0 +1,92 @@
+"""
+Bộ nhớ đệm kết quả chấm dùng chung cho cả tiến trình (mọi phiên Streamlit, mọi
+yêu cầu HTTP trên cùng một tiến trình chấm).
+
+Cả lớp thường nộp cùng vài đáp án ("S + am/is/are", "I am not going"): kết quả
+được nhớ theo khoá (bộ chấm, tense_key, group, form, câu trả lời đã chuẩn hoá),
+nên lần sau chỉ tốn một lần chuẩn hoá và một lần tra dict.
+- LRU giới hạn số mục (`maxsize`), mỗi mục hết hạn sau `ttl` giây
+- có khoá (threading.Lock): Streamlit chạy mỗi phiên trên một luồng riêng; phần
+  chấm chạy ngoài khoá (hai luồng cùng trượt một khoá thì chấm hai lần, kết quả
+  như nhau)
+- gắn với phiên bản nội dung (`content_version`: băm file TENSES và bảng động từ
+  bất quy tắc): nội dung đổi (kể cả nạp lại nóng) thì cả bộ nhớ đệm bị xoá ở lần
+  tra kế tiếp; kết quả chấm xong khi nội dung vừa đổi thì không được nhớ
+- tỉ lệ trúng: `cache_info()`, và grader_cache_*{cache="verdicts"} của `metrics`
+
+Cỡ và hạn dùng đổi bằng GRADER_VERDICT_CACHE (số mục, 0: tắt) và
+GRADER_VERDICT_TTL (giây, 0: không hết hạn).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import _CacheInfo, lru_cache
+from typing import Callable, Hashable
+
+from . import content, metrics
+from .lexicon import IRREG
+
+MAXSIZE = int(os.environ.get("GRADER_VERDICT_CACHE") or 50_000)
+TTL = float(os.environ.get("GRADER_VERDICT_TTL") or 3600)
+
+
+@lru_cache(maxsize=1)
+def _irreg_version() -> str:
+    return hashlib.sha1(json.dumps(IRREG, ensure_ascii=False).encode()).hexdigest()[:12]
+
+
+def content_version() -> str:
+    """Phiên bản nội dung chấm bài: file TENSES (xem `content`) và bảng động từ bất quy tắc."""
+    return f"{content.current().version}-{_irreg_version()}"
+
+
+class VerdictCache:
+    def __init__(self, maxsize: int = MAXSIZE, ttl: float = TTL, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.version = content_version()
+        self.hits = self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], dict]) -> dict:
+        """Kết quả đã nhớ cho `key`, hoặc chấm bằng `compute()` rồi nhớ lại. Trả về bản sao."""
+        if self.maxsize <= 0:
+            return compute()
+        now, version = self.clock(), content_version()
+        with self._lock:
+            if self.version != version:
+                self._data.clear()
+                self.version = version
+            entry = self._data.get(key)
+            if entry is not None and (not self.ttl or now - entry[0] < self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+        verdict = compute()
+        with self._lock:
+            # nội dung được nạp lại trong lúc chấm: kết quả theo bản cũ, không nhớ dưới bản mới
+            if self.version != version or content_version() != version:
+                return dict(verdict)
+            self._data[key] = (now, verdict)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return dict(verdict)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> _CacheInfo:
+        return _CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+verdict_cache = VerdictCache()
+metrics.register_cache("verdicts", verdict_cache)